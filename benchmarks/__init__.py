@@ -0,0 +1,11 @@
+# coding=utf-8
+"""
+Pyccuweather
+The Python Accuweather API
+
+Offline benchmarks. Run a benchmark module from the repository root, e.g.
+
+    python -m benchmarks.bench_lazy
+
+(c) Chris von Csefalvay, 2015.
+"""
@@ -0,0 +1,55 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_columns.py
+Summarising a forecast series by walking forecast objects, against the NumPy column export
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+from benchmarks.common import per_call, table
+from benchmarks.payloads import hourly, daily
+from pyccuweather.objects import HourlyForecasts, DailyForecasts
+
+
+def hourly_objects(forecasts):
+    forecasts = list(forecasts.forecasts.values())
+    return (max(f.temperature.C for f in forecasts),
+            sum(f.rain.mm for f in forecasts),
+            sum(f.wind.speed for f in forecasts) / len(forecasts))
+
+
+def hourly_columns(cols):
+    return cols["temperature"].max(), cols["rain"].sum(), cols["wind_speed"].mean()
+
+
+def daily_objects(forecasts):
+    forecasts = list(forecasts.forecasts.values())
+    return max(f.temp_max.C for f in forecasts), sum(f.day.rain.mm + f.night.rain.mm for f in forecasts)
+
+
+def daily_columns(cols):
+    return cols["temp_max"].max(), (cols["day_rain"] + cols["night_rain"]).sum()
+
+
+def main():
+    cases = [("240h hourly", hourly(240), HourlyForecasts, hourly_objects, hourly_columns),
+             ("45d daily", daily(45), DailyForecasts, daily_objects, daily_columns)]
+    rows = []
+    for name, payload, cls, objects, columns in cases:
+        parsed, cols = cls(payload), cls(payload, lazy=True).to_arrays()
+        t_objects = per_call(lambda: objects(cls(payload)))
+        t_columns = per_call(lambda: columns(cls(payload, lazy=True).to_arrays()))
+        t_walk = per_call(lambda: objects(parsed))
+        t_reduce = per_call(lambda: columns(cols))
+        rows.append([name, t_objects * 1e6, t_columns * 1e6, t_walk * 1e6, t_reduce * 1e6])
+
+    print("Summarising a forecast series: max temperature, total rain, mean wind speed\n")
+    print(table(["payload", "parse+walk us", "to_arrays+reduce us", "walk only us", "reduce only us"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_decode.py
+Decoding representative response bodies with each available JSON decoder
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import json
+
+import requests
+
+from benchmarks.common import per_call, table
+from benchmarks.payloads import hourly, daily, fixture
+from pyccuweather.decoding import DECODERS
+
+
+def response(content: bytes):
+    resp = requests.Response()
+    resp._content = content
+    resp.status_code = 200
+    resp.headers["Content-Type"] = "application/json; charset=utf-8"
+    return resp
+
+
+def main():
+    cases = [("location", fixture("loc_geoposition")),
+             ("12h hourly", fixture("forecast_12h")),
+             ("240h hourly", hourly(240)),
+             ("45d daily", daily(45))]
+    methods = [("resp.json()", lambda content: response(content).json()),
+               ("str + json.loads", lambda content: json.loads(content.decode("utf-8")))]
+    methods += sorted(DECODERS.items())
+
+    rows = []
+    for name, payload in cases:
+        content = json.dumps(payload).encode("utf-8")
+        row = [name, "{0:,d}".format(len(content))]
+        for _, decode in methods:
+            row.append(per_call(lambda: decode(content)) * 1e6)
+        rows.append(row)
+
+    print("Decoding response bodies, us per body\n")
+    print(table(["payload", "bytes"] + [label for label, _ in methods], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_lazy.py
+Parse time and memory of eager versus lazy forecast series, reading only the first few entries
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+from itertools import islice
+
+from benchmarks.common import per_call, retained, table
+from benchmarks.payloads import hourly, daily
+from pyccuweather.objects import HourlyForecasts, DailyForecasts
+
+READ = 6
+
+
+def read_first(series, n: int=READ):
+    for key in islice(series.forecasts, n):
+        series.forecasts[key]
+    return series
+
+
+def main():
+    cases = [("240h hourly", HourlyForecasts, hourly(240)),
+             ("45d daily", DailyForecasts, daily(45))]
+    rows = []
+    for name, cls, payload in cases:
+        for lazy in (False, True):
+            build = lambda: read_first(cls(payload, lazy=lazy))
+            seconds = per_call(build)
+            kept, peak, _ = retained(build)
+            rows.append([name, "lazy" if lazy else "eager", seconds * 1e6, kept / 1024, peak / 1024])
+
+    print("Parse and read the first {0:d} entries\n".format(READ))
+    print(table(["payload", "mode", "us/parse", "retained KiB", "peak KiB"], rows))
+
+
+if __name__ == "__main__":
+    main()
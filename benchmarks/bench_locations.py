@@ -0,0 +1,63 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_locations.py
+Bulk location loads with and without interning of regions, countries, administrative areas and timezones
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import time
+from contextlib import contextmanager
+
+from benchmarks.common import retained, table
+from benchmarks.payloads import locations
+from pyccuweather import objects
+
+SIZES = [10000, 100000]
+
+
+@contextmanager
+def without_interning():
+    original_interned, original_parse = objects.interned, objects._parse_offset_change
+    objects.interned = lambda cls, json: cls(json=json)
+    objects._parse_offset_change = original_parse.__wrapped__
+    try:
+        yield
+    finally:
+        objects.interned, objects._parse_offset_change = original_interned, original_parse
+
+
+def load(payloads):
+    return [objects.Location(json=each) for each in payloads]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    rows = []
+    for n in SIZES:
+        payloads = locations(n)
+        load(payloads[:100])
+        with without_interning():
+            t_plain = timed(lambda: load(payloads))
+            plain, _, _ = retained(lambda: load(payloads))
+        objects.INTERNED.clear()
+        t_interned = timed(lambda: load(payloads))
+        interned, _, _ = retained(lambda: load(payloads))
+        rows.append(["{0:,d}".format(n), t_plain * 1e3, t_interned * 1e3, plain / n, interned / n,
+                     "{0:.0%}".format(1 - interned / plain)])
+
+    print("Loading locations (excluding the raw JSON)\n")
+    print(table(["locations", "plain ms", "interned ms", "plain B/loc", "interned B/loc", "saved"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_memory.py
+Bytes retained per forecast with the slotted value types, against the same types with an instance __dict__
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+from contextlib import contextmanager
+
+from benchmarks.common import retained, table
+from benchmarks.payloads import hourly, daily, fixture
+from pyccuweather import objects
+
+VALUE_TYPES = ["Region", "AdministrativeArea", "Country", "TimeZone",
+               "Temperature", "Precipitation", "Snow", "Wind", "Ceiling"]
+
+
+def unslotted(cls):
+    """
+    Rebuilds a slotted class as a plain class with an instance __dict__, keeping its methods and properties.
+    """
+    namespace = {k: v for k, v in vars(cls).items() if k not in cls.__slots__ and k != "__slots__"}
+    return type(cls.__name__, (object,), namespace)
+
+
+@contextmanager
+def with_dicts():
+    originals = {name: getattr(objects, name) for name in VALUE_TYPES}
+    try:
+        for name, cls in originals.items():
+            setattr(objects, name, unslotted(cls))
+        yield
+    finally:
+        for name, cls in originals.items():
+            setattr(objects, name, cls)
+
+
+def main():
+    cases = [("240h hourly", lambda p: objects.HourlyForecasts(p), hourly(240), 240),
+             ("45d daily", lambda p: objects.DailyForecasts(p), daily(45), 45),
+             ("location", lambda p: objects.Location(json=p), fixture("loc_geoposition"), 1)]
+    rows = []
+    for name, parse, payload, n in cases:
+        # Warm up, so lazily imported modules and caches are not counted.
+        parse(payload)
+        with with_dicts():
+            before, _, before_blocks = retained(lambda: parse(payload))
+        after, _, after_blocks = retained(lambda: parse(payload))
+        rows.append([name, before / n, after / n, before_blocks // n, after_blocks // n,
+                     "{0:.0%}".format(1 - after / before)])
+
+    print("Bytes retained per forecast (excluding the raw JSON)\n")
+    print(table(["payload", "__dict__ B", "__slots__ B", "__dict__ blocks", "__slots__ blocks", "saved"], rows))
+
+
+if __name__ == "__main__":
+    main()
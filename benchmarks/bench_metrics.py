@@ -0,0 +1,39 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_metrics.py
+Overhead of tracing hooks and metrics on replayed Connection calls
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+from benchmarks.bench_replay import API_KEY, LKEY, _Capture
+from benchmarks.common import per_call, table
+from pyccuweather.connector import Connection
+from pyccuweather.metrics import Metrics
+from pyccuweather.replay import ReplayTransport
+from pyccuweather.tracing import Hook
+
+
+def main():
+    capture = _Capture()
+    rows = []
+    for fkeyid, forecast_type in (("forecast_1h", "1h"), ("forecast_12h", "12h")):
+        capture.fkeyid = fkeyid
+        Connection(API_KEY=API_KEY, transport=capture).get_forecast(forecast_type, LKEY)
+
+        timings = []
+        for hooks in ([], [Hook()], [Metrics()]):
+            conn = Connection(API_KEY=API_KEY, transport=ReplayTransport(capture.recording), hooks=hooks)
+            timings.append(per_call(lambda: conn.get_forecast(forecast_type, LKEY)))
+        rows.append([fkeyid] + [t * 1e6 for t in timings])
+
+    print("Replayed get_forecast() calls, us per call\n")
+    print(table(["endpoint", "no hooks", "no-op hook", "metrics"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_parse.py
+Offline parse throughput, allocations and peak memory for every endpoint, from the recorded fixtures
+
+Runs without network access or an API key. Results can be saved as JSON and later runs compared against them, e.g.
+
+    python -m benchmarks.bench_parse --save baseline.json
+    python -m benchmarks.bench_parse --compare baseline.json --tolerance 0.25
+
+which exits with status 1 if any parser got slower by more than the tolerance.
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import argparse
+import json
+import sys
+from functools import partial
+
+from benchmarks.common import per_call, retained, table
+from benchmarks.payloads import FIXTURES
+from pyccuweather.connector import _parse_location, _parse_location_set
+from pyccuweather.decoding import decode
+from pyccuweather.froots import FROOTS
+from pyccuweather.objects import CurrentObs, DailyForecasts, HourlyForecasts, AirQuality, ClimoActuals, ClimoRecords, \
+    ClimoNormals
+
+_search = partial(_parse_location_set, search_string="Southampton")
+
+# Endpoint -> (parser name, parser, number of entries in the parsed object). Endpoints the library does not parse
+# into objects yet are only decoded.
+PARSERS = {
+    "loc_geoposition": ("Location", _parse_location, lambda obj: 1),
+    "loc_ip_address": ("Location", _parse_location, lambda obj: 1),
+    "loc_lkey": ("Location", _parse_location, lambda obj: 1),
+    "loc_postcode": ("Location", _parse_location, lambda obj: 1),
+    "loc_search": ("LocationSet", _search, len),
+    "loc_search_country": ("LocationSet", _search, len),
+    "currentconditions": ("CurrentObs", CurrentObs, lambda obj: len(obj.observations)),
+    "currentconditions_6": ("CurrentObs", CurrentObs, lambda obj: len(obj.observations)),
+    "currentconditions_24": ("CurrentObs", CurrentObs, lambda obj: len(obj.observations)),
+    "airquality_current": ("AirQuality", AirQuality, lambda obj: len(obj.factors)),
+    "airquality_yesterday": ("AirQuality", AirQuality, lambda obj: len(obj.factors)),
+}
+PARSERS.update({u"climo_{0:s}_{1:s}".format(cls.kind, span): (cls.__name__, cls, len)
+                for cls in (ClimoActuals, ClimoRecords, ClimoNormals) for span in ("date", "range")})
+PARSERS.update({fkeyid: ("HourlyForecasts", HourlyForecasts, lambda obj: len(obj.forecasts))
+                for fkeyid in FROOTS if fkeyid.startswith("forecast_") and fkeyid.endswith("h")})
+PARSERS.update({fkeyid: ("DailyForecasts", DailyForecasts, lambda obj: len(obj.forecasts))
+                for fkeyid in FROOTS if fkeyid.startswith("forecast_") and fkeyid.endswith("d")})
+
+
+def body(fkeyid: str):
+    """
+    Reads the recorded response body of an endpoint.
+
+    :param fkeyid: endpoint name, as in froots.FROOTS
+    :return: body as bytes
+    """
+    with open("{0:s}/{1:s}.json".format(FIXTURES, fkeyid), "rb") as f:
+        return f.read()
+
+
+def measure(fkeyid: str):
+    """
+    Benchmarks decoding and parsing the recorded response of an endpoint.
+
+    :param fkeyid: endpoint name, as in froots.FROOTS
+    :return: dict of results; times in microseconds, memory in bytes
+    """
+    content = body(fkeyid)
+    payload = decode(content)
+    name, parser, entries = PARSERS.get(fkeyid, ("-", None, None))
+    result = {"parser": name,
+              "bytes": len(content),
+              "decode_us": per_call(lambda: decode(content)) * 1e6}
+    if parser is None:
+        return result
+
+    # Warm up once, so that caches and imports made on first use do not count towards the memory figures.
+    count = entries(parser(payload))
+    seconds = per_call(lambda: parser(payload))
+    kept, peak, blocks = retained(lambda: parser(payload))
+    result.update({"parse_us": seconds * 1e6,
+                   "objects_per_s": 1 / seconds,
+                   "entries_per_s": count / seconds,
+                   "blocks": blocks,
+                   "retained": kept,
+                   "peak": peak})
+    return result
+
+
+def regressions(results: dict, baseline: dict, tolerance: float):
+    """
+    Compares parse times with a baseline.
+
+    :param results: results of this run, endpoint -> dict from measure()
+    :param baseline: results of an earlier run
+    :param tolerance: allowed slowdown, as a fraction of the baseline time
+    :return: list of (endpoint, baseline us, current us) for the endpoints slower than allowed
+    """
+    slower = []
+    for fkeyid, result in sorted(results.items()):
+        before = baseline.get(fkeyid, {}).get("parse_us")
+        if before and "parse_us" in result and result["parse_us"] > before * (1 + tolerance):
+            slower.append((fkeyid, before, result["parse_us"]))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline parse benchmarks over the recorded fixtures.")
+    parser.add_argument("endpoints", nargs="*", help="endpoints to benchmark (default: all)")
+    parser.add_argument("--save", metavar="FILE", help="save the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare parse times with saved results")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against --compare, as a fraction (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = {fkeyid: measure(fkeyid) for fkeyid in (args.endpoints or sorted(FROOTS))}
+
+    rows = []
+    for fkeyid, r in sorted(results.items()):
+        if "parse_us" in r:
+            rows.append([fkeyid, r["parser"], r["bytes"] / 1024, r["decode_us"], r["parse_us"], r["objects_per_s"],
+                         r["entries_per_s"], r["blocks"], r["retained"] / 1024, r["peak"] / 1024])
+        else:
+            rows.append([fkeyid, r["parser"], r["bytes"] / 1024, r["decode_us"]] + ["-"] * 6)
+    print(table(["endpoint", "parser", "KiB", "us/decode", "us/parse", "objects/s", "entries/s", "blocks",
+                 "retained KiB", "peak KiB"], rows))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for fkeyid, before, after in slower:
+            print("REGRESSION {0:s}: {1:.1f} us -> {2:.1f} us".format(fkeyid, before, after))
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_raw.py
+Memory retained by parsed forecast series, including their JSON, under each raw JSON retention policy
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import json
+
+from benchmarks.common import per_call, retained, table
+from benchmarks.payloads import hourly, daily
+from pyccuweather.decoding import decode
+from pyccuweather.objects import HourlyForecasts, DailyForecasts, RAW_POLICIES
+
+
+def main():
+    cases = [("240h hourly", HourlyForecasts, hourly(240)),
+             ("45d daily", DailyForecasts, daily(45))]
+    rows = []
+    for name, cls, payload in cases:
+        content = json.dumps(payload).encode("utf-8")
+        for policy in RAW_POLICIES:
+            parse = lambda: cls(decode(content), raw=policy)
+            parse()
+            kept, peak, _ = retained(parse)
+            rows.append([name, policy, kept / 1024, peak / 1024, per_call(parse, repeat=3) * 1e6])
+
+    print("Decoding and parsing a forecast series\n")
+    print(table(["payload", "raw", "retained KiB", "peak KiB", "us/parse"], rows))
+
+
+if __name__ == "__main__":
+    main()
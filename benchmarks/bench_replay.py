@@ -0,0 +1,68 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_replay.py
+Full Connection calls, from URL building through object construction, replayed from the recorded fixtures
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+from benchmarks.bench_parse import body, PARSERS
+from benchmarks.common import per_call, table
+from pyccuweather.connector import Connection
+from pyccuweather.decoding import decode
+from pyccuweather.replay import Recording, ReplayTransport
+
+API_KEY = "0123456789abcdef0123456789abcdef"
+LKEY = 330732
+
+
+class _Capture(object):
+    """
+    A transport recording the fixture of the current endpoint as the response to whatever the connection requests.
+    """
+    def __init__(self):
+        self.recording = Recording(":memory:")
+        self.fkeyid = None
+
+    def get(self, url: str, params: dict=None, timeout=None):
+        self.recording.put(url, params, 200, {"Content-Type": "application/json"}, body(self.fkeyid))
+        return ReplayTransport(self.recording).get(url, params)
+
+    def close(self):
+        pass
+
+
+def main():
+    conn = Connection(API_KEY=API_KEY, coalesce=False)
+    calls = [("loc_geoposition", lambda: conn.loc_geoposition(50.905, -1.397)),
+             ("loc_search", lambda: conn.loc_string("Southampton")),
+             ("currentconditions", lambda: conn.get_current_wx(LKEY)),
+             ("forecast_12h", lambda: conn.get_forecast("12h", LKEY)),
+             ("forecast_240h", lambda: conn.get_forecast("240h", LKEY)),
+             ("forecast_45d", lambda: conn.get_forecast("45d", LKEY))]
+
+    capture = conn.transport = _Capture()
+    for fkeyid, call in calls:
+        capture.fkeyid = fkeyid
+        call()
+    conn.transport = ReplayTransport(capture.recording)
+
+    rows = []
+    for fkeyid, call in calls:
+        content = body(fkeyid)
+        parser = PARSERS[fkeyid][1]
+        direct = per_call(lambda: parser(decode(content)))
+        full = per_call(call)
+        rows.append([fkeyid, len(content) / 1024, direct * 1e6, full * 1e6, (full - direct) * 1e6, 1 / full])
+
+    print("Connection calls replayed without network access\n")
+    print(table(["endpoint", "KiB", "us decode+parse", "us/call", "us overhead", "calls/s"], rows))
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
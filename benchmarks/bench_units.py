@@ -0,0 +1,45 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+bench_units.py
+Converting a fleet of forecasts through per-object properties, against one vectorised conversion per column
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import numpy as np
+
+from benchmarks.common import per_call, table
+from benchmarks.payloads import hourly
+from pyccuweather.objects import HourlyForecasts
+from pyccuweather.units import convert
+
+LOCATIONS = 200
+
+
+def main():
+    fleet = [HourlyForecasts(hourly(240)) for _ in range(LOCATIONS)]
+    forecasts = [f for series in fleet for f in series.forecasts.values()]
+    columns = [series.to_arrays() for series in fleet]
+    temperatures = np.concatenate([cols["temperature"] for cols in columns])
+    speeds = np.concatenate([cols["wind_speed"] for cols in columns])
+
+    def properties():
+        return [f.temperature.F for f in forecasts], [f.wind.mph for f in forecasts]
+
+    def vectorised():
+        return convert(temperatures, "C", "F"), convert(speeds, "km/h", "mi/h")
+
+    t_properties = per_call(properties, repeat=3)
+    t_vectorised = per_call(vectorised, repeat=3)
+    print("Converting temperature and wind speed of {0:,d} hourly forecasts\n".format(len(forecasts)))
+    print(table(["method", "ms", "speedup"],
+                [["properties", t_properties * 1e3, "1.0x"],
+                 ["units.convert", t_vectorised * 1e3, "{0:.0f}x".format(t_properties / t_vectorised)]]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+common.py
+Timing and memory measurement helpers for the benchmarks
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import gc
+import timeit
+import tracemalloc
+
+
+def per_call(fn, number: int=None, repeat: int=5):
+    """
+    Times a callable.
+
+    :param fn: callable without arguments
+    :param number: number of calls per timing run; chosen automatically if None
+    :param repeat: number of timing runs
+    :return: best time per call in seconds
+    """
+    timer = timeit.Timer(fn)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def retained(fn):
+    """
+    Measures the memory held by the object a callable returns, and the peak allocation while building it.
+
+    :param fn: callable without arguments
+    :return: tuple of (retained bytes, peak bytes, allocated blocks)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        snapshot_before = tracemalloc.take_snapshot()
+        result = fn()
+        after, peak = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in snapshot_after.compare_to(snapshot_before, "filename"))
+    del result
+    return after - before, peak - before, blocks
+
+
+def table(headers, rows):
+    """
+    Formats benchmark results as a plain text table.
+
+    :param headers: column headers
+    :param rows: rows of values
+    :return: table as a string
+    """
+    cells = [[str(h) for h in headers]] + [[v if isinstance(v, str) else "{0:,.1f}".format(v)
+                                            if isinstance(v, float) else "{0:,}".format(v) for v in row]
+                                           for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    lines = ["  ".join(c.rjust(w) if i else c.ljust(w) for i, (c, w) in enumerate(zip(row, widths))) for row in cells]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
@@ -0,0 +1,103 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+payloads.py
+Representative payloads for the benchmarks, built from the recorded fixtures in tests/fixtures
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import copy
+import json
+import os
+from datetime import datetime, timedelta
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures")
+
+
+def fixture(name: str):
+    """
+    Loads a recorded payload.
+
+    :param name: fixture name
+    :return: decoded JSON
+    """
+    with open(os.path.join(FIXTURES, name + ".json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _shift(date_string: str, delta: timedelta):
+    return (datetime.fromisoformat(date_string) + delta).isoformat()
+
+
+def hourly(hours: int):
+    """
+    Builds an hourly forecast payload of the given length by repeating the recorded 12 hour forecast.
+
+    :param hours: number of hours
+    :return: decoded JSON
+    """
+    base = fixture("forecast_12h")
+    result = []
+    for i in range(hours):
+        each = copy.deepcopy(base[i % len(base)])
+        delta = timedelta(hours=i - i % len(base))
+        each["DateTime"] = _shift(each["DateTime"], delta)
+        each["EpochDateTime"] += int(delta.total_seconds())
+        result.append(each)
+    return result
+
+
+def daily(days: int):
+    """
+    Builds a daily forecast payload of the given length by repeating the recorded 5 day forecast.
+
+    :param days: number of days
+    :return: decoded JSON
+    """
+    base = fixture("forecast_5d")
+    result = copy.deepcopy(base)
+    result["DailyForecasts"] = []
+    for i in range(days):
+        each = copy.deepcopy(base["DailyForecasts"][i % len(base["DailyForecasts"])])
+        delta = timedelta(days=i - i % len(base["DailyForecasts"]))
+        each["Date"] = _shift(each["Date"], delta)
+        each["EpochDate"] += int(delta.total_seconds())
+        result["DailyForecasts"].append(each)
+    result["Headline"]["EndDate"] = result["DailyForecasts"][-1]["Date"]
+    result["Headline"]["EndEpochDate"] = result["DailyForecasts"][-1]["EpochDate"]
+    return result
+
+
+_PLACES = [("EUR", "Europe", "GB", "United Kingdom", "ENG", "England", "BST", "Europe/London", 1.0),
+           ("EUR", "Europe", "GB", "United Kingdom", "SCT", "Scotland", "BST", "Europe/London", 1.0),
+           ("EUR", "Europe", "FR", "France", "IDF", "Ile-de-France", "CEST", "Europe/Paris", 2.0),
+           ("NAM", "North America", "US", "United States", "CA", "California", "PDT", "America/Los_Angeles", -7.0),
+           ("NAM", "North America", "US", "United States", "NY", "New York", "EDT", "America/New_York", -4.0),
+           ("NAM", "North America", "US", "United States", "TX", "Texas", "CDT", "America/Chicago", -5.0)]
+
+
+def locations(n: int):
+    """
+    Builds a gazetteer of location payloads spread over a few countries, as decoded from one response.
+
+    :param n: number of locations
+    :return: list of decoded JSON
+    """
+    base = fixture("loc_geoposition")
+    result = []
+    for i in range(n):
+        region, region_name, country, country_name, admin, admin_name, tz, tz_name, offset = _PLACES[i % len(_PLACES)]
+        each = dict(base, Key=str(100000 + i), LocalizedName="Place {0:d}".format(i),
+                    EnglishName="Place {0:d}".format(i))
+        each["Region"] = {"ID": region, "LocalizedName": region_name, "EnglishName": region_name}
+        each["Country"] = {"ID": country, "LocalizedName": country_name, "EnglishName": country_name}
+        each["AdministrativeArea"] = dict(base["AdministrativeArea"], ID=admin, LocalizedName=admin_name,
+                                          EnglishName=admin_name, CountryID=country)
+        each["TimeZone"] = dict(base["TimeZone"], Code=tz, Name=tz_name, GmtOffset=offset)
+        each["GeoPosition"] = dict(base["GeoPosition"], Latitude=(i % 180) - 90.0, Longitude=(i % 360) - 180.0)
+        result.append(each)
+    return json.loads(json.dumps(result))
@@ -0,0 +1,442 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+aio.py
+Asynchronous connector object and methods
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import asyncio
+import json
+
+import aiohttp
+
+from pyccuweather import errors
+from pyccuweather.batch import async_fan_out
+from pyccuweather.climo import async_stream
+from pyccuweather.connector import Connection, FORECAST_TYPES, CLIMO_KINDS
+from pyccuweather.retry import RETRYABLE_STATUS, parse_retry_after
+from pyccuweather.singleflight import flight_key
+from pyccuweather.tracing import Tracer, Span, describe_model, describe_response
+
+
+class AsyncResponse(object):
+    """
+    A fully read response of an AsyncConnection request. Mirrors the parts of requests.Response that Pyccuweather
+    methods returning a raw response expose.
+    """
+    def __init__(self, url: str, status_code: int, headers, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        """
+        Decodes the response body.
+
+        :return: decoded JSON
+        """
+        return json.loads(self.content)
+
+    def __str__(self):
+        return u"<AsyncResponse [{0:d}]>".format(self.status_code)
+
+    __repr__ = __str__
+
+
+class AsyncConnection(Connection):
+    """
+    Represents an asyncio connection to the Accuweather API.
+
+    Offers the same methods as Connection, but every method returns a coroutine resolving to the same objects.
+    Connections are pooled by aiohttp, and at most `concurrency` requests are in flight at any one time, so thousands
+    of lookups can be gathered on one event loop.
+
+    :param API_KEY: API key
+    :param dev: whether the dev mode api (apidev.accuweather.com) or the production api (api.accuweather.com) is used
+    :param retry: number of retries of failed requests, or a retry.RetryPolicy
+    :param timeout: total request timeout in seconds
+    :param concurrency: maximum number of requests in flight
+    :param limit_per_host: maximum number of open connections per host
+    :param cache: a cache.ResponseCache, or True to use one with default settings
+    :param location_store: a store.LocationStore, or the path of one, answering location lookups across restarts
+    :param geo_index: a spatial.GeoIndex, or a snap radius in km, answering geoposition lookups near known locations
+    :param coalesce: whether concurrent identical requests share a single HTTP request and its parsed result
+    :param rate_limiter: a ratelimit.RateLimiter all requests are subject to
+    :param circuit_breaker: a retry.CircuitBreakers registry, True for per-endpoint breakers with default settings,
+                            or False to disable them
+    :param lazy: whether forecast series build their individual forecasts on first access
+    :param decoder: JSON decoder for response bodies: "auto" for the fastest installed one, "json", "orjson", or a
+                    callable taking bytes
+    :param raw: what parsed objects retain of their JSON, one of objects.RAW_POLICIES: "keep" it, "drop" it, or keep
+                it as "compact" bytes decoded on access. Current conditions always keep theirs, as their observations
+                are the JSON entries themselves. Climatology drops it unless a call asks otherwise, as its objects hold
+                the values of the JSON.
+    :param api_root: scheme and host of the API, overriding the one selected by dev (e.g. a local stub server)
+    :param transport: transport answering the requests in place of aiohttp; it must offer get_async(), as
+                      replay.ReplayTransport does
+    :param metrics: a metrics.Metrics registry recording per-endpoint latencies, payload sizes, errors and lookups,
+                    or True to use a new one
+    :param hooks: iterable of tracing.Hook objects, notified of the spans of every call; see add_hook()
+    :raise errors.MalformattedAPIKeyError: if the API key is not a 32-character string, an error is thrown
+    """
+
+    def __init__(self,
+                 API_KEY: str=None,
+                 dev: bool=True,
+                 retry: int=3,
+                 timeout=None,
+                 concurrency: int=100,
+                 limit_per_host: int=10,
+                 cache=None,
+                 location_store=None,
+                 geo_index=None,
+                 coalesce: bool=True,
+                 rate_limiter=None,
+                 circuit_breaker=True,
+                 lazy: bool=False,
+                 decoder="auto",
+                 raw="keep",
+                 api_root: str=None,
+                 transport=None,
+                 metrics=None,
+                 hooks=None):
+        if transport is not None and not hasattr(transport, "get_async"):
+            raise TypeError("The transport of an AsyncConnection must offer get_async().")
+        super(AsyncConnection, self).__init__(API_KEY=API_KEY,
+                                              dev=dev,
+                                              retry=retry,
+                                              timeout=timeout,
+                                              pool_connections=concurrency,
+                                              pool_maxsize=limit_per_host,
+                                              cache=cache,
+                                              location_store=location_store,
+                                              geo_index=geo_index,
+                                              coalesce=coalesce,
+                                              rate_limiter=rate_limiter,
+                                              circuit_breaker=circuit_breaker,
+                                              lazy=lazy,
+                                              decoder=decoder,
+                                              raw=raw,
+                                              api_root=api_root,
+                                              transport=transport,
+                                              metrics=metrics,
+                                              hooks=hooks)
+        self.concurrency = concurrency
+        self.semaphore = None
+        self._loop = None
+
+    def __str__(self):
+        return u"Async Accuweather connector to {0:s}".format(self.API_ROOT)
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' with an AsyncConnection.")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _open(self, pool_connections: int, pool_maxsize: int, pool_block: bool):
+        """
+        Records the connection pool settings. The aiohttp session itself is created on first use, inside the running
+        event loop.
+
+        :param pool_connections: maximum number of open connections
+        :param pool_maxsize: maximum number of open connections per host
+        :param pool_block: ignored - aiohttp always waits for a free connection
+        :return: void
+        """
+        self._limit = pool_connections
+        self._limit_per_host = pool_maxsize
+        self.session = None
+
+    async def close(self):
+        """
+        Closes the aiohttp session and its pooled connections.
+        :return: void
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self.transport is not None:
+            self.transport.close()
+        if self._owns_location_store:
+            self.location_store.close()
+
+    def _limiter(self):
+        """
+        Returns the semaphore bounding the requests in flight, creating it in the running event loop. Used under
+        another event loop (e.g. a second asyncio.run()), the connection starts over with a new semaphore and session.
+
+        :return: asyncio.Semaphore object
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+            self.session = None
+        return self.semaphore
+
+    def _session(self):
+        """
+        Returns the aiohttp session, creating it if necessary.
+
+        :return: aiohttp.ClientSession object
+        """
+        self._limiter()
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host)
+            self.session = aiohttp.ClientSession(connector=connector,
+                                                 timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self.session
+
+    async def _get(self, url: str, params: dict):
+        """
+        Performs a GET request over the connection's aiohttp session, or its transport if it has one.
+
+        :param url: URL
+        :param params: query parameters
+        :return: AsyncResponse object, or the transport's response
+        """
+        params = {k: str(v) for k, v in params.items()}
+        if self.transport is not None:
+            async with self._limiter():
+                return await self.transport.get_async(url, params=params, timeout=self.timeout)
+        async with self._limiter():
+            async with self._session().get(url, params=params) as resp:
+                content = await resp.read()
+                return AsyncResponse(url=str(resp.url),
+                                     status_code=resp.status,
+                                     headers=resp.headers,
+                                     content=content)
+
+    async def _send(self, fkeyid: str, url: str, params: dict):
+        """
+        Performs a request subject to the rate limiter and the endpoint's circuit breaker, retrying transient failures
+        (connection errors, timeouts, throttling and 5xx responses) with backoff.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param url: URL
+        :param params: query parameters
+        :return: AsyncResponse object
+        :raise errors.APIError: if the request still fails with a retryable HTTP status after the last retry
+        :raise errors.APIConnectionError: if the request still fails to connect after the last retry
+        :raise errors.CircuitOpenError: if the endpoint's circuit breaker is open
+        """
+        breaker = self.circuit_breakers[fkeyid] if self.circuit_breakers is not None else None
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(self.rate_limiter.priority_of(fkeyid))
+            if breaker is not None:
+                breaker.allow()
+
+            retry_after = None
+            try:
+                resp = await self._get(url=url, params=params)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = errors.APIConnectionError()
+                error.__cause__ = e
+            except BaseException:
+                # Neither a success nor a failure of the endpoint - e.g. an interruption - but the call is over.
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                if resp.status_code not in RETRYABLE_STATUS:
+                    if breaker is not None:
+                        breaker.success()
+                    return resp
+                error = errors.APIError(resp.status_code)
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+
+            if breaker is not None:
+                breaker.failure()
+            if attempt >= self.retry.retries:
+                raise error
+            await asyncio.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
+
+    async def _fetch(self, fkeyid: str, params: dict, parser=None, **kwargs):
+        """
+        Retrieves an endpoint and parses the decoded response. Every API method goes through here.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param params: query parameters
+        :param parser: callable turning the decoded JSON into the return value; if None, the response is returned
+        :param kwargs: endpoint formatting arguments
+        :return: parsed object or response
+        """
+        tracer = self.tracer
+        if tracer is None:
+            return await self._retrieve(fkeyid, params, parser, kwargs)
+
+        call = tracer.start("call", endpoint=fkeyid, lkey=kwargs.get("location_key"))
+        try:
+            result = await self._retrieve(fkeyid, params, parser, kwargs, tracer, call)
+        except BaseException as e:
+            tracer.end(call, e)
+            raise
+        tracer.end(call)
+        return result
+
+    async def _off_loop(self, fn, *args):
+        """
+        Calls a step that may touch the location store, whose SQLite queries block, in the loop's default executor.
+        Without a location store, the step runs on the event loop.
+
+        :param fn: callable
+        :param args: arguments of fn
+        :return: the result of fn
+        """
+        if self.location_store is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _retrieve(self, fkeyid: str, params: dict, parser, kwargs: dict, tracer: Tracer=None, call: Span=None):
+        """
+        Does the work of _fetch(), recording each phase as a child span of the call if the connection is traced.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param params: query parameters
+        :param parser: callable turning the decoded JSON into the return value; if None, the response is returned
+        :param kwargs: endpoint formatting arguments
+        :param tracer: tracing.Tracer, or None if the connection is not traced
+        :param call: span of the call, or None if the connection is not traced
+        :return: parsed object or response
+        """
+        key = None
+        if parser is not None:
+            key, payload, source = await self._off_loop(self._lookup, fkeyid, params, kwargs)
+            if call is not None:
+                call.attributes["source"] = source
+            if payload is not None:
+                return parser(payload) if call is None else \
+                    tracer.run("parse", call, parser, payload, describe=describe_model)
+
+        if call is None:
+            url = self._url(fkeyid, **kwargs)
+        else:
+            url = tracer.run("route", call, lambda: self._url(fkeyid, **kwargs), describe=lambda u: {"url": u})
+        executed = False
+
+        async def retrieve():
+            nonlocal executed
+            executed = True
+            resp = await self._send(fkeyid, url, params) if call is None else \
+                await tracer.run_async("http", call, self._send, fkeyid, url, params, describe=describe_response)
+
+            if parser is None:
+                return resp
+
+            payload = self.decode(resp.content) if call is None else \
+                tracer.run("decode", call, self.decode, resp.content)
+            await self._off_loop(self._remember, key, fkeyid, params, kwargs, resp, payload)
+            return parser(payload) if call is None else \
+                tracer.run("parse", call, parser, payload, describe=describe_model)
+
+        if self.single_flight is None:
+            return await retrieve()
+        try:
+            return await self.single_flight.do_async(flight_key(url, params, parser), retrieve)
+        finally:
+            if call is not None and not executed:
+                call.attributes["coalesced"] = True
+
+    def loc_geoposition_many(self, positions, window: int=None):
+        """
+        Resolves many geopositions concurrently.
+
+        :param positions: iterable of (latitude, longitude) tuples; repeated positions are only resolved once
+        :param window: maximum number of scheduled lookups (defaults to twice the concurrency)
+        :return: asynchronous generator of batch.BatchResult objects with Location results, in order of completion
+        """
+
+        return async_fan_out(lambda position: self.loc_geoposition(*position),
+                             positions,
+                             window=window or 2 * self.concurrency)
+
+    def get_current_wx_many(self, lkeys, current: int=0, details: bool=True, window: int=None):
+        """
+        Get current weather conditions for many locations concurrently.
+
+        :param lkeys: iterable of Accuweather location keys; repeated keys are only fetched once
+        :param current: horizon - current weather, 6 hours or 24 hours
+        :param details: should details be provided?
+        :param window: maximum number of scheduled lookups (defaults to twice the concurrency)
+        :return: asynchronous generator of batch.BatchResult objects with CurrentObs results, in order of completion
+        """
+
+        assert current in [0, 6, 24]
+
+        return async_fan_out(lambda lkey: self.get_current_wx(lkey, current=current, details=details),
+                             lkeys,
+                             window=window or 2 * self.concurrency)
+
+    def get_forecast_many(self, forecast_type: str, lkeys, details: bool=True, metric: bool=True, window: int=None,
+                          raw=None):
+        """
+        Get forecasts for many locations concurrently.
+
+        :param forecast_type: forecast type, e.g. 12h or 5d
+        :param lkeys: iterable of Accuweather location keys; repeated keys are only fetched once
+        :param details: should details be provided?
+        :param metric: should metric units be used?
+        :param raw: retention policy for the JSON, overriding the connection's
+        :param window: maximum number of scheduled lookups (defaults to twice the concurrency)
+        :return: asynchronous generator of batch.BatchResult objects with forecast results, in order of completion
+        """
+
+        assert forecast_type in FORECAST_TYPES
+
+        return async_fan_out(lambda lkey: self.get_forecast(forecast_type, lkey,
+                                                            details=details, metric=metric, raw=raw),
+                             lkeys,
+                             window=window or 2 * self.concurrency)
+
+    def get_airquality_many(self, lkeys, current: bool=True, window: int=None, raw=None):
+        """
+        Get air quality for many locations concurrently.
+
+        :param lkeys: iterable of Accuweather location keys; repeated keys are only fetched once
+        :param current: current air quality if True, yesterday's if False
+        :param window: maximum number of scheduled lookups (defaults to twice the concurrency)
+        :param raw: retention policy for the JSON, overriding the connection's
+        :return: asynchronous generator of batch.BatchResult objects with AirQuality results, in order of completion
+        """
+
+        return async_fan_out(lambda lkey: self.get_airquality(lkey, current=current, raw=raw),
+                             lkeys,
+                             window=window or 2 * self.concurrency)
+
+    def stream_climo(self, kind: str, lkey: int, start_date, end_date, window: int=31, max_workers: int=4,
+                     checkpoint=None, raw=None):
+        """
+        Streams a long range of climatology as ClimoDay objects, in date order, as Connection.stream_climo() does.
+
+        :param kind: kind of climatology, one of CLIMO_KINDS
+        :param lkey: location key
+        :param start_date: first date, as a datetime.date or a YYYY/MM/DD string
+        :param end_date: last date, inclusive
+        :param window: maximum number of days per request
+        :param max_workers: maximum number of concurrent requests
+        :param checkpoint: climo.ClimoCheckpoint object, or None
+        :param raw: retention policy for the JSON of the days, one of RAW_POLICIES; "drop" if None
+        :return: asynchronous generator of ClimoDay objects
+        """
+
+        assert kind in CLIMO_KINDS
+
+        return async_stream(self._climo_window(kind, lkey, raw), kind, lkey, start_date, end_date,
+                            days=window, max_workers=max_workers, checkpoint=checkpoint)
@@ -0,0 +1,132 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+airquality.py
+Polling of air quality for many locations, reporting changes of category
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+from collections import namedtuple
+from inspect import iscoroutinefunction
+
+from pyccuweather.objects import POLLUTANTS
+
+
+class AirQualityChange(namedtuple("AirQualityChange", ["lkey", "name", "previous", "factor"])):
+    """
+    A change of an air quality factor's category at a location: the band it was in at the previous poll (None if it
+    was not reported), and the factor now. factor is None if the factor is no longer reported.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return u"<Air quality change at {0}: {1:s} {2} -> {3}>".format(
+            self.lkey, self.name, self.previous, None if self.factor is None else self.factor.band)
+
+    __repr__ = __str__
+
+
+class AirQualityPoller(object):
+    """
+    Refreshes the air quality of many locations concurrently, and reports only the factors whose category changed
+    since the previous poll. For each location, only the bands of its factors are kept between polls.
+
+    Responses are cached by the connection for as long as its cache's TTL for the airquality_ endpoints, so polling
+    more often than that finds no changes.
+
+    :param conn: Connection object; see AsyncAirQualityPoller for an AsyncConnection
+    :param lkeys: iterable of Accuweather location keys
+    :param max_workers: maximum number of concurrent requests
+    :raise TypeError: if the connection is an AsyncConnection
+    """
+
+    asynchronous = False
+
+    def __init__(self, conn, lkeys, max_workers: int=8):
+        if iscoroutinefunction(conn._fetch) is not self.asynchronous:
+            raise TypeError("An AsyncConnection is polled by an AsyncAirQualityPoller, and a Connection by an "
+                            "AirQualityPoller.")
+        self.conn = conn
+        self.lkeys = list(lkeys)
+        self.max_workers = max_workers
+        self.errors = {}
+        self._bands = {}
+
+    def __str__(self):
+        return u"<Air quality poller ({0:d} locations)>".format(len(self.lkeys))
+
+    __repr__ = __str__
+
+    def poll(self):
+        """
+        Refreshes the air quality of every location. On the first poll of a location, every factor reported is a
+        change. Locations whose refresh failed keep their previous state, and their errors are in `errors`.
+
+        :return: generator of AirQualityChange objects, in order of completion of the locations
+        """
+        self.errors = {}
+        for result in self.conn.get_airquality_many(self.lkeys, max_workers=self.max_workers, raw="drop"):
+            for change in self._changes(result):
+                yield change
+
+    def _changes(self, result):
+        """
+        Records the outcome of a location's refresh.
+
+        :param result: batch.BatchResult object with an AirQuality result
+        :return: list of AirQualityChange objects
+        """
+        if not result.ok:
+            self.errors[result.key] = result.error
+            return []
+        bands = result.result.bands()
+        previous = self._bands.get(result.key)
+        self._bands[result.key] = bands
+        if previous == bands:
+            return []
+        if previous is None:
+            previous = (None,) * len(bands)
+        return [AirQualityChange(result.key, name, before, getattr(result.result, attribute))
+                for (name, attribute), before, after in zip(POLLUTANTS.items(), previous, bands) if before != after]
+
+    def bands(self, lkey):
+        """
+        Returns the bands of a location's factors at the last successful poll.
+
+        :param lkey: location key
+        :return: dict of factor name -> band, for the factors reported
+        """
+        return {name: band for name, band in zip(POLLUTANTS, self._bands.get(lkey, ())) if band is not None}
+
+
+class AsyncAirQualityPoller(AirQualityPoller):
+    """
+    Polls the air quality of many locations, as AirQualityPoller does, over an AsyncConnection.
+
+    :param conn: AsyncConnection object
+    :param lkeys: iterable of Accuweather location keys
+    :param window: maximum number of scheduled lookups (defaults to twice the connection's concurrency)
+    :raise TypeError: if the connection is not an AsyncConnection
+    """
+
+    asynchronous = True
+
+    def __init__(self, conn, lkeys, window: int=None):
+        super(AsyncAirQualityPoller, self).__init__(conn, lkeys)
+        self.window = window
+
+    async def poll(self):
+        """
+        Refreshes the air quality of every location. On the first poll of a location, every factor reported is a
+        change. Locations whose refresh failed keep their previous state, and their errors are in `errors`.
+
+        :return: asynchronous generator of AirQualityChange objects, in order of completion of the locations
+        """
+        self.errors = {}
+        async for result in self.conn.get_airquality_many(self.lkeys, window=self.window, raw="drop"):
+            for change in self._changes(result):
+                yield change
@@ -0,0 +1,107 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+batch.py
+Fan-out of API calls over many keys
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import asyncio
+from contextvars import copy_context
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class BatchResult(namedtuple("BatchResult", ["key", "result", "error"])):
+    """
+    The outcome of one call in a batch: the key it was made for, and either its result or the error it raised.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __str__(self):
+        if self.ok:
+            return u"<Batch result for {0}: {1}>".format(self.key, self.result)
+        return u"<Batch error for {0}: {1!r}>".format(self.key, self.error)
+
+    __repr__ = __str__
+
+
+def _unique(keys):
+    return list(OrderedDict.fromkeys(keys))
+
+
+def fan_out(fn, keys, max_workers: int=8):
+    """
+    Calls fn once for every distinct key on a bounded thread pool, yielding results in order of completion.
+    Errors raised by fn are returned as values, so one failing key does not abort the batch. Calls run in a copy of
+    the caller's context, so context variables such as the rate limiting priority class carry over.
+
+    :param fn: callable taking a single key
+    :param keys: iterable of keys; duplicates are called only once
+    :param max_workers: maximum number of concurrent calls
+    :return: generator of BatchResult objects
+    """
+    keys = iter(_unique(keys))
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight = {}
+
+    def submit(n):
+        for key in keys:
+            in_flight[pool.submit(copy_context().run, fn, key)] = key
+            n -= 1
+            if n == 0:
+                break
+
+    try:
+        submit(2 * max_workers)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = in_flight.pop(future)
+                error = future.exception()
+                yield BatchResult(key, None if error is not None else future.result(), error)
+            submit(len(done))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def async_fan_out(coro_fn, keys, window: int=200):
+    """
+    Awaits coro_fn once for every distinct key, with at most `window` calls scheduled at a time, yielding results in
+    order of completion. Errors raised by coro_fn are returned as values.
+
+    :param coro_fn: coroutine function taking a single key
+    :param keys: iterable of keys; duplicates are called only once
+    :param window: maximum number of scheduled calls
+    :return: asynchronous generator of BatchResult objects
+    """
+    keys = iter(_unique(keys))
+    in_flight = {}
+
+    def submit(n):
+        for key in keys:
+            in_flight[asyncio.ensure_future(coro_fn(key))] = key
+            n -= 1
+            if n == 0:
+                break
+
+    try:
+        submit(window)
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key = in_flight.pop(task)
+                error = task.exception()
+                yield BatchResult(key, None if error is not None else task.result(), error)
+            submit(len(done))
+    finally:
+        for task in in_flight:
+            task.cancel()
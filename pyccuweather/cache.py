@@ -0,0 +1,170 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+cache.py
+In-memory response cache with per-endpoint freshness policies
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Default freshness of cached responses in seconds, by endpoint name or endpoint name prefix.
+# Exact endpoint names take precedence over prefixes; endpoints with a TTL of 0 are not cached.
+DEFAULT_TTLS = {"loc_": 7 * 24 * 3600,
+                "currentconditions": 300,
+                "minutecast": 60,
+                "forecast_1h": 600,
+                "forecast_": 3600,
+                "airquality_": 3600,
+                "climo_": 24 * 3600,
+                "alarms_": 300}
+
+
+def cache_key(fkeyid: str, url_kwargs: dict, params: dict, api_root: str=None):
+    """
+    Builds the cache key of a request: the endpoint name and the API root plus its normalised formatting arguments and
+    query parameters. The API key is left out, so connections using different keys share entries; connections to
+    different API roots (e.g. a stub server and production) do not.
+
+    :param fkeyid: endpoint name (key of froots.FROOTS)
+    :param url_kwargs: endpoint formatting arguments
+    :param params: query parameters
+    :param api_root: scheme and host of the API
+    :return: hashable cache key
+    """
+    return (fkeyid,
+            api_root.rstrip("/") if api_root is not None else None,
+            tuple(sorted((k, str(v)) for k, v in url_kwargs.items())),
+            tuple(sorted((k, str(v)) for k, v in params.items() if k != "apikey")))
+
+
+class ResponseCache(object):
+    """
+    A thread-safe, memory-bounded LRU cache of decoded API responses with per-endpoint expiry.
+
+    Cached responses are handed out as they are, not copied: the JSON retained by parsed objects (their raw attribute,
+    with the "keep" policy) is the cached response itself, and must be treated as read-only.
+
+    :param max_bytes: maximum total size of cached responses, measured as the size of the response bodies
+    :param ttls: dict of endpoint name or prefix -> TTL in seconds, overriding DEFAULT_TTLS
+    :param clock: monotonic time source, in seconds
+    """
+
+    def __init__(self, max_bytes: int=64 * 1024 * 1024, ttls: dict=None, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.clock = clock
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._ttl_lookup = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return u"<Response cache: {0:d} entries, {1:d} bytes>".format(len(self._entries), self.size)
+
+    __repr__ = __str__
+
+    def ttl(self, fkeyid: str):
+        """
+        Returns the TTL of an endpoint.
+
+        :param fkeyid: endpoint name
+        :return: TTL in seconds
+        """
+        try:
+            return self._ttl_lookup[fkeyid]
+        except KeyError:
+            pass
+
+        if fkeyid in self.ttls:
+            ttl = self.ttls[fkeyid]
+        else:
+            prefixes = [p for p in self.ttls if fkeyid.startswith(p)]
+            ttl = self.ttls[max(prefixes, key=len)] if prefixes else 0
+        self._ttl_lookup[fkeyid] = ttl
+        return ttl
+
+    def get(self, key):
+        """
+        Retrieves a fresh entry and marks it as most recently used.
+
+        :param key: cache key, see cache_key()
+        :return: decoded response, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, size, payload = entry
+            if expires <= self.clock():
+                del self._entries[key]
+                self.size -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload, size: int):
+        """
+        Stores a decoded response, evicting least recently used entries to stay within max_bytes.
+
+        :param key: cache key, see cache_key()
+        :param payload: decoded response
+        :param size: size of the response body in bytes
+        :return: void
+        """
+        ttl = self.ttl(key[0])
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (self.clock() + ttl, size, payload)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Empties the cache. Counters are kept.
+
+        :return: void
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        :return: dict of counters
+        """
+        return {"entries": len(self._entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations}
@@ -0,0 +1,225 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+climo.py
+Streaming of long climatology ranges in windows, fetched concurrently, with resumable progress
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import asyncio
+import datetime
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+# Format of dates in climatology requests.
+DATE_FORMAT = "%Y/%m/%d"
+
+
+def as_date(value):
+    """
+    Converts a date given as a datetime.date, or a string in the YYYY/MM/DD or YYYY-MM-DD format, to a datetime.date.
+
+    :param value: date
+    :return: datetime.date object
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(value.replace("-", "/"), DATE_FORMAT).date()
+
+
+def windows(start_date, end_date, days: int=31):
+    """
+    Splits a range of dates into consecutive windows.
+
+    :param start_date: first date of the range
+    :param end_date: last date of the range, inclusive
+    :param days: maximum number of days per window
+    :return: list of (first date, last date) pairs of datetime.date objects, inclusive
+    """
+    assert days > 0
+    start, end = as_date(start_date), as_date(end_date)
+    result = []
+    while start <= end:
+        last = min(start + datetime.timedelta(days=days - 1), end)
+        result.append((start, last))
+        start = last + datetime.timedelta(days=1)
+    return result
+
+
+class ClimoCheckpoint(object):
+    """
+    Records, in a JSON file, the last date streamed of each range of climatology, by kind and location, so that an
+    interrupted stream can resume where it stopped. Progress is kept per range: streaming another range of the same
+    kind and location starts afresh. The file is replaced atomically on every update.
+
+    :param path: path of the JSON file; created if it does not exist
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self._done = json.load(f)
+        except FileNotFoundError:
+            self._done = {}
+
+    def __str__(self):
+        return u"<Climatology checkpoint {0:s} ({1:d} streams)>".format(self.path, len(self._done))
+
+    __repr__ = __str__
+
+    @staticmethod
+    def _key(kind: str, lkey, start_date, end_date):
+        return u"{0:s}:{1}:{2:s}-{3:s}".format(kind, lkey, as_date(start_date).strftime(DATE_FORMAT),
+                                               as_date(end_date).strftime(DATE_FORMAT))
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._done, f, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def get(self, kind: str, lkey, start_date, end_date):
+        """
+        Returns the last date streamed of a range.
+
+        :param kind: kind of climatology
+        :param lkey: location key
+        :param start_date: first date of the range
+        :param end_date: last date of the range, inclusive
+        :return: datetime.date object, or None if nothing was streamed yet
+        """
+        done = self._done.get(self._key(kind, lkey, start_date, end_date))
+        return as_date(done) if done is not None else None
+
+    def update(self, kind: str, lkey, start_date, end_date, date):
+        """
+        Records the last date streamed of a range.
+
+        :param kind: kind of climatology
+        :param lkey: location key
+        :param start_date: first date of the range
+        :param end_date: last date of the range, inclusive
+        :param date: last date streamed
+        :return: void
+        """
+        with self._lock:
+            self._done[self._key(kind, lkey, start_date, end_date)] = as_date(date).strftime(DATE_FORMAT)
+            self._save()
+
+    def clear(self, kind: str, lkey, start_date, end_date):
+        """
+        Forgets the progress of a range.
+
+        :param kind: kind of climatology
+        :param lkey: location key
+        :param start_date: first date of the range
+        :param end_date: last date of the range, inclusive
+        :return: void
+        """
+        with self._lock:
+            if self._done.pop(self._key(kind, lkey, start_date, end_date), None) is not None:
+                self._save()
+
+
+def _remaining(kind: str, lkey, start_date, end_date, days: int, checkpoint):
+    """
+    Returns the windows of a range not streamed yet, according to the checkpoint.
+    """
+    start = as_date(start_date)
+    if checkpoint is not None:
+        done = checkpoint.get(kind, lkey, start_date, end_date)
+        if done is not None:
+            start = max(start, done + datetime.timedelta(days=1))
+    return deque(windows(start, end_date, days))
+
+
+def stream(fetch, kind: str, lkey, start_date, end_date, days: int=31, max_workers: int=4, checkpoint=None):
+    """
+    Streams a range of climatology, window by window. Up to max_workers windows are fetched concurrently, ahead of
+    the consumer, but records are yielded in date order. A window is checkpointed once all of its records have been
+    yielded, and windows of the range already checkpointed are not fetched again.
+
+    :param fetch: callable taking the first and last date of a window, returning the list of its records
+    :param kind: kind of climatology, for the checkpoint
+    :param lkey: location key, for the checkpoint
+    :param start_date: first date of the range
+    :param end_date: last date of the range, inclusive
+    :param days: maximum number of days per window
+    :param max_workers: maximum number of windows fetched concurrently
+    :param checkpoint: ClimoCheckpoint object, or None
+    :return: generator of records
+    """
+    pending = _remaining(kind, lkey, start_date, end_date, days, checkpoint)
+    if not pending:
+        return
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight = deque()
+
+    def submit():
+        while pending and len(in_flight) < max_workers:
+            first, last = pending.popleft()
+            in_flight.append((last, pool.submit(copy_context().run, fetch, first, last)))
+
+    try:
+        submit()
+        while in_flight:
+            last, future = in_flight.popleft()
+            records = future.result()
+            submit()
+            for record in records:
+                yield record
+            if checkpoint is not None:
+                checkpoint.update(kind, lkey, start_date, end_date, last)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def async_stream(fetch, kind: str, lkey, start_date, end_date, days: int=31, max_workers: int=4,
+                       checkpoint=None):
+    """
+    Streams a range of climatology, window by window, as stream() does, on the running event loop.
+
+    :param fetch: coroutine function taking the first and last date of a window, returning the list of its records
+    :param kind: kind of climatology, for the checkpoint
+    :param lkey: location key, for the checkpoint
+    :param start_date: first date of the range
+    :param end_date: last date of the range, inclusive
+    :param days: maximum number of days per window
+    :param max_workers: maximum number of windows fetched concurrently
+    :param checkpoint: ClimoCheckpoint object, or None
+    :return: asynchronous generator of records
+    """
+    pending = _remaining(kind, lkey, start_date, end_date, days, checkpoint)
+    in_flight = deque()
+
+    def submit():
+        while pending and len(in_flight) < max_workers:
+            first, last = pending.popleft()
+            in_flight.append((last, asyncio.ensure_future(fetch(first, last))))
+
+    try:
+        submit()
+        while in_flight:
+            last, task = in_flight.popleft()
+            records = await task
+            submit()
+            for record in records:
+                yield record
+            if checkpoint is not None:
+                checkpoint.update(kind, lkey, start_date, end_date, last)
+    finally:
+        for _, task in in_flight:
+            task.cancel()
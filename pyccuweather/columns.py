@@ -0,0 +1,208 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+columns.py
+Columnar (struct of arrays) export of forecast and climatology series to NumPy
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+from operator import itemgetter
+
+import numpy as np
+
+from pyccuweather.units import UNITS, convert
+
+# Marks a column whose unit is read from the "Unit" field next to its value.
+REPORTED = object()
+
+# Column specifications: (column name, path of the value in the forecast JSON, unit, dtype). Values missing from a
+# forecast are NaN.
+HOURLY_COLUMNS = [
+    ("epoch", ("EpochDateTime",), "s", np.int64),
+    ("temperature", ("Temperature", "Value"), REPORTED, np.float64),
+    ("realfeel_temperature", ("RealFeelTemperature", "Value"), REPORTED, np.float64),
+    ("dewpoint", ("DewPoint", "Value"), REPORTED, np.float64),
+    ("wet_bulb_temperature", ("WetBulbTemperature", "Value"), REPORTED, np.float64),
+    ("rh", ("RelativeHumidity",), "%", np.float64),
+    ("rain", ("Rain", "Value"), REPORTED, np.float64),
+    ("snow", ("Snow", "Value"), REPORTED, np.float64),
+    ("ice", ("Ice", "Value"), REPORTED, np.float64),
+    ("total_liquid", ("TotalLiquid", "Value"), REPORTED, np.float64),
+    ("p_precipitation", ("PrecipitationProbability",), "%", np.float64),
+    ("p_rain", ("RainProbability",), "%", np.float64),
+    ("p_snow", ("SnowProbability",), "%", np.float64),
+    ("p_ice", ("IceProbability",), "%", np.float64),
+    ("wind_speed", ("Wind", "Speed", "Value"), REPORTED, np.float64),
+    ("wind_hdg", ("Wind", "Direction", "Degrees"), "deg", np.float64),
+    ("wind_gust_speed", ("WindGust", "Speed", "Value"), REPORTED, np.float64),
+    ("cloud_cover", ("CloudCover",), "%", np.float64),
+    ("ceiling", ("Ceiling", "Value"), REPORTED, np.float64),
+    ("uv_index", ("UVIndex",), None, np.float64),
+]
+
+_HEMIURNAL_COLUMNS = [
+    ("rain", ("Rain", "Value"), REPORTED),
+    ("snow", ("Snow", "Value"), REPORTED),
+    ("ice", ("Ice", "Value"), REPORTED),
+    ("total_liquid", ("TotalLiquid", "Value"), REPORTED),
+    ("h_precipitation", ("HoursOfPrecipitation",), "h"),
+    ("h_rain", ("HoursOfRain",), "h"),
+    ("p_precipitation", ("PrecipitationProbability",), "%"),
+    ("p_rain", ("RainProbability",), "%"),
+    ("p_snow", ("SnowProbability",), "%"),
+    ("p_ice", ("IceProbability",), "%"),
+    ("p_thunderstorm", ("ThunderstormProbability",), "%"),
+    ("wind_speed", ("Wind", "Speed", "Value"), REPORTED),
+    ("wind_hdg", ("Wind", "Direction", "Degrees"), "deg"),
+    ("wind_gust_speed", ("WindGust", "Speed", "Value"), REPORTED),
+    ("cloud_cover", ("CloudCover",), "%"),
+]
+
+DAILY_COLUMNS = [
+    ("epoch", ("EpochDate",), "s", np.int64),
+    ("temp_min", ("Temperature", "Minimum", "Value"), REPORTED, np.float64),
+    ("temp_max", ("Temperature", "Maximum", "Value"), REPORTED, np.float64),
+    ("realfeel_temp_min", ("RealFeelTemperature", "Minimum", "Value"), REPORTED, np.float64),
+    ("realfeel_temp_max", ("RealFeelTemperature", "Maximum", "Value"), REPORTED, np.float64),
+    ("realfeel_shade_temp_min", ("RealFeelTemperatureShade", "Minimum", "Value"), REPORTED, np.float64),
+    ("realfeel_shade_temp_max", ("RealFeelTemperatureShade", "Maximum", "Value"), REPORTED, np.float64),
+    ("hours_of_sun", ("HoursOfSun",), "h", np.float64),
+] + [(half.lower() + "_" + name, (half,) + path, unit, np.float64)
+     for half in ("Day", "Night")
+     for name, path, unit in _HEMIURNAL_COLUMNS]
+
+
+def _metric(*path):
+    return path + ("Metric", "Value")
+
+
+_CLIMO_TEMPERATURES = [
+    ("temp_min", _metric("Temperatures", "Minimum"), REPORTED, np.float64),
+    ("temp_max", _metric("Temperatures", "Maximum"), REPORTED, np.float64),
+]
+
+_CLIMO_DEGREE_DAYS = [
+    ("heating_degree_days", _metric("DegreeDays", "Heating"), REPORTED, np.float64),
+    ("cooling_degree_days", _metric("DegreeDays", "Cooling"), REPORTED, np.float64),
+]
+
+# Climatology columns by kind, in metric units.
+CLIMO_COLUMNS = {
+    "actuals": [("epoch", ("EpochDate",), "s", np.int64)] + _CLIMO_TEMPERATURES + [
+        ("temp_mean", _metric("Temperatures", "Average"), REPORTED, np.float64),
+        ("precipitation", _metric("Precipitation"), REPORTED, np.float64),
+        ("snowfall", _metric("Snowfall"), REPORTED, np.float64),
+        ("snow_depth", _metric("SnowDepth"), REPORTED, np.float64),
+    ] + _CLIMO_DEGREE_DAYS,
+    "records": [("epoch", ("EpochDate",), "s", np.int64)] + _CLIMO_TEMPERATURES + [
+        ("precipitation", _metric("Precipitation"), REPORTED, np.float64),
+        ("snowfall", _metric("Snowfall"), REPORTED, np.float64),
+        ("temp_min_year", ("Temperatures", "Minimum", "Year"), None, np.float64),
+        ("temp_max_year", ("Temperatures", "Maximum", "Year"), None, np.float64),
+        ("precipitation_year", ("Precipitation", "Year"), None, np.float64),
+        ("snowfall_year", ("Snowfall", "Year"), None, np.float64),
+    ],
+    "normals": [("epoch", ("EpochDate",), "s", np.int64)] + _CLIMO_TEMPERATURES + [
+        ("temp_mean", _metric("Temperatures", "Average"), REPORTED, np.float64),
+        ("precipitation", _metric("Precipitation"), REPORTED, np.float64),
+    ] + _CLIMO_DEGREE_DAYS,
+}
+
+
+class ForecastColumns(dict):
+    """
+    A forecast series as a dict of column name -> NumPy array, one element per forecast, in forecast order.
+    Values are in the units the API reported them in, given by `units`.
+
+    :param columns: dict of column name -> array
+    :param units: dict of column name -> unit, or None for dimensionless columns
+    """
+    def __init__(self, columns, units):
+        super(ForecastColumns, self).__init__(columns)
+        self.units = units
+
+    @property
+    def rows(self):
+        """
+        Number of forecasts.
+        """
+        return len(next(iter(self.values()))) if len(self.keys()) else 0
+
+    def convert(self, targets: dict):
+        """
+        Converts columns to other units, each in a single vectorised operation.
+
+        :param targets: dict of column name or dimension ("temperature", "length" or "speed") -> unit; a column name
+                        takes precedence over the column's dimension
+        :return: ForecastColumns with the converted columns; other columns are shared with this one
+        :raise ValueError: if a column cannot be converted to the unit given for it
+        """
+        columns, units = dict(self), dict(self.units)
+        for name, unit in self.units.items():
+            target = targets.get(name)
+            if target is None and unit in UNITS:
+                target = targets.get(UNITS[unit][0])
+            if target is not None and target != unit:
+                columns[name], units[name] = convert(self[name], unit, target), target
+        return ForecastColumns(columns, units)
+
+    def __str__(self):
+        return u"<Forecast columns ({0:d} rows x {1:d} columns)>".format(self.rows, len(self))
+
+    __repr__ = __str__
+
+
+def _lookup(each, path):
+    try:
+        for key in path:
+            each = each[key]
+    except (KeyError, TypeError):
+        return None
+    return each
+
+
+def _column(entries, path, unit, dtype):
+    """
+    Extracts one column from a list of forecast JSON objects.
+
+    :return: tuple of (array, unit)
+    """
+    parent, leaf = path[:-1], path[-1]
+    try:
+        # Fast path - every forecast has the value, so the lookups run in C.
+        parents = entries
+        for key in parent:
+            parents = list(map(itemgetter(key), parents))
+        values = list(map(itemgetter(leaf), parents))
+    except (KeyError, TypeError):
+        parents = [_lookup(each, parent) for each in entries]
+        values = [_lookup(each, (leaf,)) for each in parents]
+    if None in values:
+        if dtype is not np.float64:
+            raise ValueError(u"Missing values for {0}".format(".".join(path)))
+        values = [np.nan if each is None else each for each in values]
+
+    if unit is REPORTED:
+        units = set(each.get("Unit") for each in parents if each is not None) - {None}
+        if len(units) > 1:
+            raise ValueError(u"Mixed units for {0}: {1}".format(".".join(path), ", ".join(sorted(units))))
+        unit = units.pop() if units else None
+    return np.array(values, dtype=dtype), unit
+
+
+def to_columns(entries, spec):
+    """
+    Builds the columns of a forecast series from its JSON, without creating per-forecast objects.
+
+    :param entries: list of forecast JSON objects
+    :param spec: column specifications, e.g. HOURLY_COLUMNS or DAILY_COLUMNS
+    :return: ForecastColumns
+    """
+    columns, units = {}, {}
+    for name, path, unit, dtype in spec:
+        columns[name], units[name] = _column(entries, path, unit, dtype)
+    return ForecastColumns(columns, units)
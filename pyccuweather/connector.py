@@ -10,12 +10,77 @@ Basic connector object and methods
 (c) Chris von Csefalvay, 2015.
 """
 
+import time
+from functools import partial
+
 import requests
+
 from pyccuweather import errors
-from pyccuweather.froots import froot
+from pyccuweather.batch import fan_out
+from pyccuweather.cache import ResponseCache, cache_key
+from pyccuweather.climo import stream, as_date, DATE_FORMAT
+from pyccuweather.decoding import get_decoder
+from pyccuweather.froots import Router
+from pyccuweather.metrics import Metrics
 from pyccuweather.objects import *
+from pyccuweather.retry import RetryPolicy, CircuitBreakers, RETRYABLE_STATUS, parse_retry_after
+from pyccuweather.singleflight import SingleFlight, flight_key
+from pyccuweather.spatial import GeoIndex
+from pyccuweather.store import LocationStore
+from pyccuweather.tracing import Tracer, Span, describe_model, describe_response
+from pyccuweather.transport import SessionPool
 import os
 
+FORECAST_TYPES = ["1h", "12h", "24h", "72h", "120h", "240h",
+                  "1d", "5d", "10d", "15d", "25d", "45d"]
+
+
+def _parse_location(resp):
+    """
+    Parses the response of a single-location resolver.
+
+    :param resp: decoded JSON response
+    :return: Location object
+    """
+    assert len(resp) > 0
+
+    if isinstance(resp, list):
+        return Location(resp[0])
+    elif isinstance(resp, dict):
+        return Location(resp)
+
+
+def _parse_location_set(resp, search_string: str, country_code: str=None):
+    """
+    Parses the response of a location search.
+
+    :param resp: decoded JSON response
+    :param search_string: search string the response was returned for
+    :param country_code: country code the search was limited to, if any
+    :return: LocationSet object
+    :raise NoResultsError: if there are no results
+    """
+    _result = list()
+    if len(resp) > 0:
+        for each in resp:
+            loc = Location(lkey=each["Key"],
+                           lat=each["GeoPosition"]["Latitude"],
+                           lon=each["GeoPosition"]["Longitude"],
+                           localized_name=each["LocalizedName"],
+                           english_name=each["EnglishName"],
+                           region=each["Region"],
+                           country=each["Country"],
+                           administrative_area=each["AdministrativeArea"],
+                           timezone=each["TimeZone"]
+                           )
+            _result.append(loc)
+    else:
+        raise errors.NoResultsError(search_string)
+
+    return (LocationSet(results=_result,
+                        search_expression=search_string,
+                        country=country_code))
+
 
 class Connection(object):
     """
@@ -23,13 +88,58 @@ class Connection(object):
 
     :param API_KEY: API key
     :param dev: whether the dev mode api (apidev.accuweather.com) or the production api (api.accuweather.com) is used
-    :param retry: number of retries of failed operations - TODO: implement
+    :param retry: number of retries of failed requests, or a retry.RetryPolicy
+    :param timeout: request timeout in seconds
+    :param pool_connections: number of per-host connection pools kept alive
+    :param pool_maxsize: maximum number of keep-alive connections per host
+    :param pool_block: whether to block rather than exceed pool_maxsize connections per host
+    :param cache: a cache.ResponseCache, or True to use one with default settings
+    :param location_store: a store.LocationStore, or the path of one, answering location lookups across restarts
+    :param geo_index: a spatial.GeoIndex, or a snap radius in km, answering geoposition lookups near known locations
+    :param coalesce: whether concurrent identical requests share a single HTTP request and its parsed result
+    :param rate_limiter: a ratelimit.RateLimiter all requests are subject to
+    :param circuit_breaker: a retry.CircuitBreakers registry, True for per-endpoint breakers with default settings,
+                            or False to disable them
+    :param lazy: whether forecast series build their individual forecasts on first access
+    :param decoder: JSON decoder for response bodies: "auto" for the fastest installed one, "json", "orjson", or a
+                    callable taking bytes
+    :param raw: what parsed objects retain of their JSON, one of objects.RAW_POLICIES: "keep" it, "drop" it, or keep
+                it as "compact" bytes decoded on access. Current conditions always keep theirs, as their observations
+                are the JSON entries themselves. Climatology drops it unless a call asks otherwise, as its objects hold
+                the values of the JSON.
+    :param api_root: scheme and host of the API, overriding the one selected by dev (e.g. a local stub server)
+    :param transport: transport performing the requests in place of the connection's own session pool, e.g. a
+                      replay.RecordingTransport recording responses or a replay.ReplayTransport replaying them
+    :param metrics: a metrics.Metrics registry recording per-endpoint latencies, payload sizes, errors and lookups,
+                    or True to use a new one
+    :param hooks: iterable of tracing.Hook objects, notified of the spans of every call; see add_hook()
     :raise errors.MalformattedAPIKeyError: if the API key is not a 32-character string, an error is thrown
-    """
 
-    def __init__(self, API_KEY: str=None, dev: bool=True, retry: int=3, timeout=None):
+    A Connection may be shared between threads: each thread gets its own session, but all of them draw on the same
+    pool of keep-alive connections. Use it as a context manager or call close() to release the pooled connections.
+    """
 
-        # TODO: implement retries
+    def __init__(self,
+                 API_KEY: str=None,
+                 dev: bool=True,
+                 retry: int=3,
+                 timeout=None,
+                 pool_connections: int=10,
+                 pool_maxsize: int=10,
+                 pool_block: bool=False,
+                 cache=None,
+                 location_store=None,
+                 geo_index=None,
+                 coalesce: bool=True,
+                 rate_limiter=None,
+                 circuit_breaker=True,
+                 lazy: bool=False,
+                 decoder="auto",
+                 raw="keep",
+                 api_root: str=None,
+                 transport=None,
+                 metrics=None,
+                 hooks=None):
 
         if API_KEY is None:
             try:
@@ -46,14 +156,303 @@ class Connection(object):
         except AssertionError:
             raise errors.MalformattedAPIKeyError()
 
-        self.API_ROOT = "http://apidev.accuweather.com" if dev is True else "http://api.accuweather.com"
+        if api_root is not None:
+            self.API_ROOT = api_root
+        else:
+            self.API_ROOT = "http://apidev.accuweather.com" if dev is True else "http://api.accuweather.com"
         self.API_VERSION = "v1"
-        self.retries = retry
+        self._router = None
+        self.retry = retry if isinstance(retry, RetryPolicy) else RetryPolicy(retries=retry)
+        self.retries = self.retry.retries
+        self.circuit_breakers = CircuitBreakers() if circuit_breaker is True else (circuit_breaker or None)
         self.timeout = timeout
+        self.lazy = lazy
+        self.decode = get_decoder(decoder)
+        assert raw in RAW_POLICIES
+        self.raw = raw
+        # An empty ResponseCache is falsy, so it is told apart from False by identity.
+        self.cache = ResponseCache() if cache is True else (None if cache is False else cache)
+        self._owns_location_store = isinstance(location_store, str)
+        self.location_store = LocationStore(location_store) if self._owns_location_store else location_store
+        self.single_flight = SingleFlight() if coalesce else None
+        self.rate_limiter = rate_limiter
+        self.geo_index = GeoIndex(geo_index) if isinstance(geo_index, (int, float)) else geo_index
+        if self.geo_index is not None and self.location_store is not None:
+            for lat, lon, payload in self.location_store.geopositions():
+                self.geo_index.add(lat, lon, payload)
+        self.transport = transport
+        self.metrics = Metrics() if metrics is True else (metrics or None)
+        hooks = list(hooks or []) + ([self.metrics] if self.metrics is not None else [])
+        self.tracer = Tracer(hooks) if hooks else None
+        self._open(pool_connections=pool_connections,
+                   pool_maxsize=pool_maxsize,
+                   pool_block=pool_block)
 
     def __str__(self):
         return u"Accuweather connector to {0:s}".format(self.API_ROOT)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _open(self, pool_connections: int, pool_maxsize: int, pool_block: bool):
+        """
+        Sets up the HTTP session pool used by the Connection.
+
+        :param pool_connections: number of per-host connection pools kept alive
+        :param pool_maxsize: maximum number of keep-alive connections per host
+        :param pool_block: whether to block rather than exceed pool_maxsize connections per host
+        :return: void
+        """
+        self.session_pool = SessionPool(pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize,
+                                        pool_block=pool_block)
+
+    def close(self):
+        """
+        Closes the pooled HTTP connections held by the Connection.
+        :return: void
+        """
+        self.session_pool.close()
+        if self.transport is not None:
+            self.transport.close()
+        if self._owns_location_store:
+            self.location_store.close()
+
+    def add_hook(self, hook):
+        """
+        Registers a tracing hook. Every call is then recorded as a "call" span, with child spans for its phases:
+        "route" (URL resolution), "http" (the round trip, including retries), "decode" and "parse" (constructing the
+        result objects). Connections without hooks record no spans at all.
+
+        :param hook: tracing.Hook object
+        :return: void
+        """
+        hooks = self.tracer.hooks if self.tracer is not None else []
+        self.tracer = Tracer(hooks + [hook])
+
+    def remove_hook(self, hook):
+        """
+        Unregisters a tracing hook.
+
+        :param hook: tracing.Hook object
+        :return: void
+        """
+        hooks = [each for each in (self.tracer.hooks if self.tracer is not None else []) if each is not hook]
+        self.tracer = Tracer(hooks) if hooks else None
+
+    def _get(self, url: str, params: dict):
+        """
+        Performs a GET request over the connection's transport, or its session pool if it has none.
+
+        :param url: URL
+        :param params: query parameters
+        :return: requests.Response object
+        """
+        transport = self.transport if self.transport is not None else self.session_pool
+        return transport.get(url, params=params, timeout=self.timeout)
+
+    @property
+    def router(self):
+        """
+        The routing table for the connection's API_ROOT and API_VERSION, compiled on first use and again whenever
+        either changes.
+
+        :return: froots.Router object
+        """
+        router = self._router
+        if router is None or router.api_root != self.API_ROOT.rstrip("/") or router.api_version != self.API_VERSION:
+            router = self._router = Router(self.API_ROOT, self.API_VERSION)
+        return router
+
+    def _url(self, fkeyid: str, **kwargs):
+        """
+        Resolves an endpoint name and its formatting arguments to a URL.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param kwargs: endpoint formatting arguments
+        :return: URL
+        """
+        return self.router.url(fkeyid, **kwargs)
+
+    def _fetch(self, fkeyid: str, params: dict, parser=None, **kwargs):
+        """
+        Retrieves an endpoint and parses the decoded response. Every API method goes through here.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param params: query parameters
+        :param parser: callable turning the decoded JSON into the return value; if None, the response is returned
+        :param kwargs: endpoint formatting arguments
+        :return: parsed object or response
+        """
+        tracer = self.tracer
+        if tracer is None:
+            return self._retrieve(fkeyid, params, parser, kwargs)
+
+        call = tracer.start("call", endpoint=fkeyid, lkey=kwargs.get("location_key"))
+        try:
+            result = self._retrieve(fkeyid, params, parser, kwargs, tracer, call)
+        except BaseException as e:
+            tracer.end(call, e)
+            raise
+        tracer.end(call)
+        return result
+
+    def _retrieve(self, fkeyid: str, params: dict, parser, kwargs: dict, tracer: Tracer=None, call: Span=None):
+        """
+        Does the work of _fetch(), recording each phase as a child span of the call if the connection is traced.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param params: query parameters
+        :param parser: callable turning the decoded JSON into the return value; if None, the response is returned
+        :param kwargs: endpoint formatting arguments
+        :param tracer: tracing.Tracer, or None if the connection is not traced
+        :param call: span of the call, or None if the connection is not traced
+        :return: parsed object or response
+        """
+        key = None
+        if parser is not None:
+            key, payload, source = self._lookup(fkeyid, params, kwargs)
+            if call is not None:
+                call.attributes["source"] = source
+            if payload is not None:
+                return parser(payload) if call is None else \
+                    tracer.run("parse", call, parser, payload, describe=describe_model)
+
+        if call is None:
+            url = self._url(fkeyid, **kwargs)
+        else:
+            url = tracer.run("route", call, lambda: self._url(fkeyid, **kwargs), describe=lambda u: {"url": u})
+        executed = False
+
+        def retrieve():
+            nonlocal executed
+            executed = True
+            resp = self._send(fkeyid, url, params) if call is None else \
+                tracer.run("http", call, self._send, fkeyid, url, params, describe=describe_response)
+
+            if parser is None:
+                return resp
+
+            payload = self.decode(resp.content) if call is None else \
+                tracer.run("decode", call, self.decode, resp.content)
+            self._remember(key, fkeyid, params, kwargs, resp, payload)
+            return parser(payload) if call is None else \
+                tracer.run("parse", call, parser, payload, describe=describe_model)
+
+        if self.single_flight is None:
+            return retrieve()
+        try:
+            return self.single_flight.do(flight_key(url, params, parser), retrieve)
+        finally:
+            if call is not None and not executed:
+                call.attributes["coalesced"] = True
+
+    def _send(self, fkeyid: str, url: str, params: dict):
+        """
+        Performs a request subject to the rate limiter and the endpoint's circuit breaker, retrying transient failures
+        (connection errors, timeouts, throttling and 5xx responses) with backoff.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param url: URL
+        :param params: query parameters
+        :return: response
+        :raise errors.APIError: if the request still fails with a retryable HTTP status after the last retry
+        :raise errors.APIConnectionError: if the request still fails to connect after the last retry
+        :raise errors.CircuitOpenError: if the endpoint's circuit breaker is open
+        """
+        breaker = self.circuit_breakers[fkeyid] if self.circuit_breakers is not None else None
+        attempt = 0
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self.rate_limiter.priority_of(fkeyid))
+            if breaker is not None:
+                breaker.allow()
+
+            retry_after = None
+            try:
+                resp = self._get(url=url, params=params)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = errors.APIConnectionError()
+                error.__cause__ = e
+            except BaseException:
+                # Neither a success nor a failure of the endpoint - e.g. an interruption - but the call is over.
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                if resp.status_code not in RETRYABLE_STATUS:
+                    if breaker is not None:
+                        breaker.success()
+                    return resp
+                error = errors.APIError(resp.status_code)
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+
+            if breaker is not None:
+                breaker.failure()
+            if attempt >= self.retry.retries:
+                raise error
+            time.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
+
+    def _lookup(self, fkeyid: str, params: dict, kwargs: dict):
+        """
+        Looks for a response in the response cache and the location store.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param params: query parameters
+        :param kwargs: endpoint formatting arguments
+        :return: tuple of the cache key (None if there is no cache), the decoded response (None if not found) and
+                 where it was found, one of metrics.SOURCES
+        """
+        key, payload, source = None, None, "miss"
+        if self.cache is not None:
+            key = cache_key(fkeyid, kwargs, params, self.API_ROOT)
+            payload = self.cache.get(key)
+            source = "cache"
+
+        if payload is None and self.location_store is not None:
+            payload = self.location_store.lookup(fkeyid, kwargs, params)
+            source = "location_store"
+
+        if payload is None and self.geo_index is not None and fkeyid == "loc_geoposition":
+            lat, lon = params["q"].split(",")
+            payload = self.geo_index.nearest(float(lat), float(lon))
+            source = "geo_index"
+
+        return key, payload, source if payload is not None else "miss"
+
+    def _remember(self, key, fkeyid: str, params: dict, kwargs: dict, resp, payload):
+        """
+        Stores a successful response in the response cache and the location store.
+
+        :param key: cache key returned by _lookup()
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param params: query parameters
+        :param kwargs: endpoint formatting arguments
+        :param resp: response
+        :param payload: decoded response
+        :return: void
+        """
+        if resp.status_code != 200:
+            return
+
+        if key is not None:
+            self.cache.put(key, payload, len(resp.content))
+
+        if self.location_store is not None:
+            self.location_store.record(fkeyid, kwargs, params, payload)
+
+        if self.geo_index is not None and fkeyid.startswith("loc_") and payload:
+            for each in (payload if isinstance(payload, list) else [payload]):
+                self.geo_index.add_location(each)
+            if fkeyid == "loc_geoposition":
+                lat, lon = params["q"].split(",")
+                self.geo_index.add(lat, lon, payload[0] if isinstance(payload, list) else payload)
+
     def wipe_api_key(self):
         """
         Wipes API key from a Connection instance
@@ -87,15 +486,20 @@ class Connection(object):
         payload = {"q": u"{0:.4f},{1:.4f}".format(lat, lon),
                    "apikey": self.API_KEY}
 
-        resp = requests.get(url=froot("loc_geoposition"),
-                            params=payload).json()
+        return self._fetch("loc_geoposition", payload, _parse_location)
+
+    def loc_geoposition_many(self, positions, max_workers: int=8):
+        """
+        Resolves many geopositions concurrently.
 
-        assert len(resp) > 0
+        :param positions: iterable of (latitude, longitude) tuples; repeated positions are only resolved once
+        :param max_workers: maximum number of concurrent requests
+        :return: generator of batch.BatchResult objects with Location results, in order of completion
+        """
 
-        if isinstance(resp, list):
-            return Location(resp[0])
-        elif isinstance(resp, dict):
-            return Location(resp)
+        return fan_out(lambda position: self.loc_geoposition(*position),
+                       positions,
+                       max_workers=max_workers)
 
     def loc_string(self, search_string: str, country_code: str=None):
         """
@@ -112,38 +516,19 @@ class Connection(object):
             except:
                 raise errors.InvalidCountryCodeError(country_code)
 
-            url = froot("loc_search_country", country_code=country_code)
-            payload = {"q": search_string,
-                       "apikey": self.API_KEY}
+            fkeyid = "loc_search_country"
+            kwargs = {"country_code": country_code}
 
         else:
-            url = froot("loc_search")
-            payload = {"q": search_string,
-                       "apikey": self.API_KEY}
-
-        resp = requests.get(url=url,
-                            params=payload, timeout=self.timeout).json()
-
-        _result = list()
-        if len(resp) > 0:
-            for each in resp:
-                loc = Location(lkey=each["Key"],
-                               lat=each["GeoPosition"]["Latitude"],
-                               lon=each["GeoPosition"]["Longitude"],
-                               localized_name=each["LocalizedName"],
-                               english_name=each["EnglishName"],
-                               region=each["Region"],
-                               country=each["Country"],
-                               administrative_area=each["AdministrativeArea"],
-                               timezone=each["TimeZone"]
-                               )
-                _result.append(loc)
-        else:
-            raise errors.NoResultsError(search_string)
+            fkeyid = "loc_search"
+            kwargs = {}
+
+        payload = {"q": search_string,
+                   "apikey": self.API_KEY}
 
-        return (LocationSet(results=_result,
-                            search_expression=search_string,
-                            country=country_code))
+        return self._fetch(fkeyid, payload,
+                           partial(_parse_location_set, search_string=search_string, country_code=country_code),
+                           **kwargs)
 
     def loc_postcode(self, country_code: str, postcode: str):
         """
@@ -159,19 +544,10 @@ class Connection(object):
         except:
             raise errors.InvalidCountryCodeError(country_code)
 
-        url = froot("loc_postcode", country_code=country_code)
         payload = {"q": postcode,
                    "apikey": self.API_KEY}
 
-        resp = requests.get(url=url,
-                            params=payload, timeout=self.timeout).json()
-
-        assert len(resp) > 0
-
-        if isinstance(resp, list):
-            return Location(resp[0])
-        elif isinstance(resp, dict):
-            return Location(resp)
+        return self._fetch("loc_postcode", payload, _parse_location, country_code=country_code)
 
     def loc_ip(self, ip_address:str):
         """
@@ -181,19 +557,10 @@ class Connection(object):
         :return: Location object
         """
 
-        url = froot("loc_ip_address")
         payload = {"q": ip_address,
                    "apikey": self.API_KEY}
 
-        resp = requests.get(url=url,
-                            params=payload, timeout=self.timeout).json()
-
-        assert len(resp) > 0
-
-        if isinstance(resp, list):
-            return Location(resp[0])
-        elif isinstance(resp, dict):
-            return Location(resp)
+        return self._fetch("loc_ip_address", payload, _parse_location)
 
     def loc_lkey(self, lkey:int):
         """
@@ -205,18 +572,9 @@ class Connection(object):
 
         assert isinstance(lkey, int)
 
-        url = froot("loc_lkey", location_key=lkey)
         payload = {"apikey": self.API_KEY}
 
-        resp = requests.get(url=url,
-                            params=payload, timeout=self.timeout).json()
-
-        assert len(resp) > 0
-
-        if isinstance(resp, list):
-            return Location(resp[0])
-        elif isinstance(resp, dict):
-            return Location(resp)
+        return self._fetch("loc_lkey", payload, _parse_location, location_key=lkey)
 
     ########################################################
     # Current conditions                                   #
@@ -236,47 +594,95 @@ class Connection(object):
         assert current in [0, 6, 24]
         assert lkey is not None or location is not None
         if current is 0:
-            url = froot("currentconditions", location_key=lkey)
+            fkeyid = "currentconditions"
         else:
-            url = froot("currentconditions_{current}".format(current=current), location_key=lkey)
+            fkeyid = "currentconditions_{current}".format(current=current)
 
         payload = {"apikey": self.API_KEY,
                    "details": "true" if details is True else "false"}
 
-        resp = requests.get(url=url,
-                            params=payload, timeout=self.timeout)
+        return self._fetch(fkeyid, payload, CurrentObs, location_key=lkey)
 
-        return CurrentObs(resp.json())
+    def get_current_wx_many(self, lkeys, current:int=0, details:bool=True, max_workers:int=8):
+        """
+        Get current weather conditions for many locations concurrently.
+
+        :param lkeys: iterable of Accuweather location keys; repeated keys are only fetched once
+        :param current: horizon - current weather, 6 hours or 24 hours
+        :param details: should details be provided?
+        :param max_workers: maximum number of concurrent requests
+        :return: generator of batch.BatchResult objects with CurrentObs results, in order of completion
+        """
+
+        assert current in [0, 6, 24]
+
+        return fan_out(lambda lkey: self.get_current_wx(lkey, current=current, details=details),
+                       lkeys,
+                       max_workers=max_workers)
 
     ########################################################
     # Forecasts                                            #
     ########################################################
 
-    def get_forecast(self, forecast_type:str, lkey:int, details:bool=True, metric:bool=True):
-        forecast_types = ["1h", "12h", "24h", "72h", "120h", "240h",
-                          "1d", "5d", "10d", "15d", "25d", "45d"]
-        assert forecast_type in forecast_types
+    def get_forecast(self, forecast_type:str, lkey:int, details:bool=True, metric:bool=True, raw=None):
+        """
+        Get a forecast.
+
+        :param forecast_type: forecast type, e.g. 12h or 5d
+        :param lkey: Accuweather location key
+        :param details: should details be provided?
+        :param metric: should metric units be used?
+        :param raw: retention policy for the JSON, overriding the connection's
+        :return: HourlyForecasts or DailyForecasts object
+        """
+        assert forecast_type in FORECAST_TYPES
 
         fkeyid = u"forecast_{0:s}".format(forecast_type)
 
-        url = froot(fkeyid, location_key=lkey)
         payload = {"apikey": self.API_KEY,
                    "details": "true" if details == True else "false",
                    "metric": "true" if metric == True else "false"}
 
-        resp = requests.get(url=url,
-                            params=payload, timeout=self.timeout)
+        if forecast_type[-1] == "h":
+            parser = partial(HourlyForecasts, lazy=self.lazy, raw=raw or self.raw)
+        elif forecast_type[-1] == "d":
+            parser = partial(DailyForecasts, lazy=self.lazy, raw=raw or self.raw)
+
+        return self._fetch(fkeyid, payload, parser, location_key=lkey)
 
-        if forecast_type[-1] is "h":
-            return HourlyForecasts(resp.json())
-        elif forecast_type[-1] is "d":
-            return DailyForecasts(resp.json())
+    def get_forecast_many(self, forecast_type:str, lkeys, details:bool=True, metric:bool=True, max_workers:int=8,
+                          raw=None):
+        """
+        Get forecasts for many locations concurrently.
+
+        :param forecast_type: forecast type, e.g. 12h or 5d
+        :param lkeys: iterable of Accuweather location keys; repeated keys are only fetched once
+        :param details: should details be provided?
+        :param metric: should metric units be used?
+        :param raw: retention policy for the JSON, overriding the connection's
+        :param max_workers: maximum number of concurrent requests
+        :return: generator of batch.BatchResult objects with forecast results, in order of completion
+        """
+
+        assert forecast_type in FORECAST_TYPES
+
+        return fan_out(lambda lkey: self.get_forecast(forecast_type, lkey, details=details, metric=metric, raw=raw),
+                       lkeys,
+                       max_workers=max_workers)
 
     ########################################################
     # Air quality                                          #
     ########################################################
 
-    def get_airquality(self, lkey:int, current:bool=True):
+    def get_airquality(self, lkey: int, current: bool=True, raw=None):
+        """
+        Get air quality for a location.
+
+        :param lkey: Accuweather location key
+        :param current: current air quality if True, yesterday's if False
+        :param raw: retention policy for the JSON, overriding the connection's
+        :return: AirQuality object
+        """
         assert isinstance(lkey, int)
 
         if current:
@@ -284,78 +690,126 @@ class Connection(object):
         else:
             fkeyid = "airquality_yesterday"
 
-        url = froot(fkeyid, location_key=lkey)
         payload = {"apikey": self.API_KEY}
 
-        return requests.get(url=url,
-                            params=payload, timeout=self.timeout)
+        return self._fetch(fkeyid, payload, partial(AirQuality, raw=raw or self.raw), location_key=lkey)
+
+    def get_airquality_many(self, lkeys, current: bool=True, max_workers: int=8, raw=None):
+        """
+        Get air quality for many locations concurrently.
+
+        :param lkeys: iterable of Accuweather location keys; repeated keys are only fetched once
+        :param current: current air quality if True, yesterday's if False
+        :param max_workers: maximum number of concurrent requests
+        :param raw: retention policy for the JSON, overriding the connection's
+        :return: generator of batch.BatchResult objects with AirQuality results, in order of completion
+        """
+        return fan_out(lambda lkey: self.get_airquality(lkey, current=current, raw=raw),
+                       lkeys,
+                       max_workers=max_workers)
 
     ########################################################
     # Climo                                                #
     ########################################################
 
-    def get_actuals(self, lkey:int, start_date:str, end_date:str=None):
-
-        # TODO: Return object
-        # (needs API access)
+    def _climo(self, cls, lkey: int, start_date, end_date, raw):
+        """
+        Retrieves climatology for a date, or a range of dates.
 
+        :param cls: ClimoSeries subclass of the kind of climatology
+        """
         if end_date:
-            fkeyid = "climo_actuals_range"
-            url = froot(fkeyid, location_key=lkey)
+            fkeyid = u"climo_{0:s}_range".format(cls.kind)
+            kwargs = {"location_key": lkey}
             payload = {"apikey": self.API_KEY,
-                       "start": start_date,
-                       "end": end_date}
+                       "start": as_date(start_date).strftime(DATE_FORMAT),
+                       "end": as_date(end_date).strftime(DATE_FORMAT)}
         else:
-            fkeyid = "climo_actuals_date"
-            url = froot(fkeyid,
-                        date=start_date,
-                        location_key=lkey)
+            fkeyid = u"climo_{0:s}_date".format(cls.kind)
+            kwargs = {"date": as_date(start_date).strftime(DATE_FORMAT),
+                      "location_key": lkey}
             payload = {"apikey": self.API_KEY}
 
-        return requests.get(url=url,
-                            params=payload, timeout=self.timeout)
+        return self._fetch(fkeyid, payload, partial(cls, raw=raw or "drop"), **kwargs)
 
-    def get_records(self, lkey, start_date, end_date=None):
+    def get_actuals(self, lkey: int, start_date, end_date=None, raw=None):
+        """
+        Retrieves observed climatology for a date, or a range of dates.
+
+        :param lkey: location key
+        :param start_date: date, as a datetime.date or a YYYY/MM/DD string
+        :param end_date: last date of a range, inclusive, or None for a single date
+        :param raw: retention policy for the JSON, one of RAW_POLICIES; "drop" if None. The columns take a few
+                    kilobytes per year of days, and keeping the JSON as well takes many times that.
+        :return: ClimoActuals object
+        """
+        return self._climo(ClimoActuals, lkey, start_date, end_date, raw)
 
-        # TODO: Return object
-        # (needs API access)
+    def get_records(self, lkey: int, start_date, end_date=None, raw=None):
+        """
+        Retrieves record climatology for a date, or a range of dates.
 
-        if end_date:
-            fkeyid = "climo_records_range"
-            url = froot(fkeyid, location_key=lkey)
-            payload = {"apikey": self.API_KEY,
-                       "start": start_date,
-                       "end": end_date}
-        else:
-            fkeyid = "climo_records_date"
-            url = froot(fkeyid,
-                        date=start_date,
-                        location_key=lkey)
-            payload = {"apikey": self.API_KEY}
+        :param lkey: location key
+        :param start_date: date, as a datetime.date or a YYYY/MM/DD string
+        :param end_date: last date of a range, inclusive, or None for a single date
+        :param raw: retention policy for the JSON, one of RAW_POLICIES; "drop" if None
+        :return: ClimoRecords object
+        """
+        return self._climo(ClimoRecords, lkey, start_date, end_date, raw)
 
-        return requests.get(url=url,
-                            params=payload, timeout=self.timeout)
+    def get_normals(self, lkey: int, start_date, end_date=None, raw=None):
+        """
+        Retrieves normal climatology for a date, or a range of dates.
 
-    def get_normals(self, lkey, start_date, end_date=None):
+        :param lkey: location key
+        :param start_date: date, as a datetime.date or a YYYY/MM/DD string
+        :param end_date: last date of a range, inclusive, or None for a single date
+        :param raw: retention policy for the JSON, one of RAW_POLICIES; "drop" if None
+        :return: ClimoNormals object
+        """
+        return self._climo(ClimoNormals, lkey, start_date, end_date, raw)
 
-        # TODO: Return object
-        # (needs API access)
+    def stream_climo(self, kind: str, lkey: int, start_date, end_date, window: int=31, max_workers: int=4,
+                     checkpoint=None, raw=None):
+        """
+        Streams a long range of climatology as ClimoDay objects, in date order. The range is split into windows of at
+        most `window` days, of which up to max_workers are fetched concurrently. With a checkpoint, a stream of the same
+        range resumes after the last window fully consumed.
+
+        :param kind: kind of climatology, one of CLIMO_KINDS
+        :param lkey: location key
+        :param start_date: first date, as a datetime.date or a YYYY/MM/DD string
+        :param end_date: last date, inclusive
+        :param window: maximum number of days per request
+        :param max_workers: maximum number of concurrent requests
+        :param checkpoint: climo.ClimoCheckpoint object, or None
+        :param raw: retention policy for the JSON of the days, one of RAW_POLICIES; "drop" if None
+        :return: generator of ClimoDay objects
+        """
+        assert kind in CLIMO_KINDS
 
-        if end_date:
-            fkeyid = "climo_normals_range"
-            url = froot(fkeyid, location_key=lkey)
+        return stream(self._climo_window(kind, lkey, raw), kind, lkey, start_date, end_date,
+                      days=window, max_workers=max_workers, checkpoint=checkpoint)
+
+    def _climo_window(self, kind: str, lkey: int, raw):
+        """
+        Returns the function fetching a window of climatology, for stream_climo().
+
+        :return: callable taking the first and last date of a window, returning a list of ClimoDay objects
+        """
+        fkeyid = u"climo_{0:s}_range".format(kind)
+        raw = raw or "drop"
+
+        def parser(resp):
+            return [ClimoDay(day, kind, raw=raw) for day in resp]
+
+        def fetch(first, last):
             payload = {"apikey": self.API_KEY,
-                       "start": start_date,
-                       "end": end_date}
-        else:
-            fkeyid = "climo_normals_date"
-            url = froot(fkeyid,
-                        date=start_date,
-                        location_key=lkey)
-            payload = {"apikey": self.API_KEY}
+                       "start": first.strftime(DATE_FORMAT),
+                       "end": last.strftime(DATE_FORMAT)}
+            return self._fetch(fkeyid, payload, parser, location_key=lkey)
 
-        return requests.get(url=url,
-                            params=payload, timeout=self.timeout)
+        return fetch
 
     ########################################################
     # Alerts                                               #
@@ -368,8 +822,6 @@ class Connection(object):
 
         assert isinstance(forecast_range, int)
         fkeyid = u"alarms_{0:d}d".format(forecast_range)
-        url = froot(fkeyid, location_key=lkey)
         payload = {"apikey": self.API_KEY}
 
-        return requests.get(url=url,
-                            params=payload, timeout=self.timeout)
\ No newline at end of file
+        return self._fetch(fkeyid, payload, location_key=lkey)
\ No newline at end of file
@@ -0,0 +1,63 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+decoding.py
+Decoding of response bodies, with an optional fast JSON decoder, and compact re-encoding
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _stdlib(content):
+    # json.loads detects the UTF encoding of bytes itself, so there is no need to decode them up front.
+    return json.loads(content)
+
+
+DECODERS = {"json": _stdlib}
+if orjson is not None:
+    DECODERS["orjson"] = orjson.loads
+
+
+def get_decoder(decoder="auto"):
+    """
+    Resolves a decoder choice to a decoding function taking the response body as bytes.
+
+    :param decoder: "auto" for the fastest installed decoder, a name from DECODERS ("json", or "orjson" if installed),
+                    or a callable taking bytes and returning the decoded JSON
+    :return: decoding function
+    :raise ValueError: if the decoder is unknown or not installed
+    """
+    if callable(decoder):
+        return decoder
+    if decoder == "auto":
+        return DECODERS.get("orjson", _stdlib)
+    try:
+        return DECODERS[decoder]
+    except KeyError:
+        raise ValueError(u"Unknown or unavailable JSON decoder: {0!r} (available: {1:s})".format(
+            decoder, ", ".join(sorted(DECODERS))))
+
+
+decode = get_decoder()
+
+
+def encode(obj):
+    """
+    Serialises decoded JSON back to compact bytes, with orjson if it is installed.
+
+    :param obj: decoded JSON
+    :return: JSON as UTF-8 bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
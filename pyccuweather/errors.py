@@ -62,7 +62,7 @@ class APIError(BaseException):
         self.status_code = status_code
 
     def __str__(self):
-        return u"The Accuweather API returned an error: {0:s}".format(self.status_code)
+        return u"The Accuweather API returned an error: {0}".format(self.status_code)
 
 
 class NotImplementedOrUnknownMethod(BaseException):
@@ -110,4 +110,42 @@ class NoResultsError(BaseException):
         self.query = query
 
     def __str__(self):
-        return u"Your query for '{0:s}' yielded no results.".format(self.query)
\ No newline at end of file
+        return u"Your query for '{0:s}' yielded no results.".format(self.query)
+
+
+class QuotaExceededError(BaseException):
+    """
+    Raised when a call would exceed the client-side daily call quota.
+    """
+
+    def __init__(self, quota):
+        self.quota = quota
+
+    def __str__(self):
+        return u"The daily quota of {0:d} calls has been used up.".format(self.quota)
+
+
+class CircuitOpenError(BaseException):
+    """
+    Raised when calls to an endpoint fail fast because its circuit breaker is open after repeated failures.
+    """
+
+    def __init__(self, endpoint, retry_in):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+    def __str__(self):
+        return (u"Calls to {0:s} are suspended after repeated failures; "
+                u"retry in {1:.1f} seconds.".format(self.endpoint, self.retry_in))
+
+
+class NotRecordedError(BaseException):
+    """
+    Raised when a replayed request has no recorded response.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+    def __str__(self):
+        return u"No response was recorded for {0:s}.".format(self.key)
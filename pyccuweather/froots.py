@@ -51,28 +51,72 @@ FROOTS = {"loc_geoposition": "locations/v{version:d}/cities/geoposition/search.j
           }
 
 
+class Router(object):
+    """
+    A routing table of endpoint URL templates compiled for one API root and version, so that building a URL is a
+    dictionary lookup plus, for endpoints taking arguments, a single format call.
+
+    :param api_root: scheme and host of the API, e.g. "http://api.accuweather.com"
+    :param api_version: API version, e.g. "v1" or 1
+    """
+
+    def __init__(self, api_root: str, api_version="v1"):
+        self.api_root = api_root.rstrip("/")
+        self.api_version = api_version
+        version = int(str(api_version).lstrip("v"))
+        self._static = {}
+        self._templates = {}
+        for fkeyid, template in FROOTS.items():
+            # Bake in the version - and make sure nothing else in the template is taken for a field.
+            template = self.api_root.replace("{", "{{").replace("}", "}}") + "/" + \
+                template.replace("{version:d}", str(version))
+            if "{" in template.replace("{{", "").replace("}}", ""):
+                self._templates[fkeyid] = template.format
+            else:
+                self._static[fkeyid] = template.format()
+
+    def __str__(self):
+        return u"<Router for {0:s} ({1})>".format(self.api_root, self.api_version)
+
+    __repr__ = __str__
+
+    def __contains__(self, fkeyid):
+        return fkeyid in self._static or fkeyid in self._templates
+
+    def url(self, fkeyid: str, **kwargs):
+        """
+        Builds the URL of an endpoint.
+
+        :param fkeyid: endpoint name (key of FROOTS)
+        :param kwargs: endpoint formatting arguments
+        :return: URL
+        :raise errors.NotImplementedOrUnknownMethod: if the endpoint is unknown
+        """
+        url = self._static.get(fkeyid)
+        if url is not None:
+            return url
+        try:
+            fill = self._templates[fkeyid]
+        except KeyError:
+            raise errors.NotImplementedOrUnknownMethod(fkeyid)
+        return fill(**kwargs)
+
+
+_routers = {}
+
+
 def froot(arg, **kwargs):
     """
     Obtains endpoint corresponding to the primary argument and formats it with the keyword arguments provided.
 
     :param arg: endpoint name
-    :param kwargs: endpoint formatting arguments
-    :return: endpoint URL suffix
+    :param kwargs: endpoint formatting arguments; api_type ("apidev" or "api") and version select the API host and
+                   version, defaulting to apidev and 1
+    :return: endpoint URL
     """
-    try:
-        assert arg in FROOTS.keys()
-    except AssertionError:
-        raise errors.NotImplementedOrUnknownMethod(arg)
-
-    try:
-        assert "api_type" in kwargs.keys()
-    except AssertionError:
-        kwargs["api_type"] = "apidev"
-
-    try:
-        assert "version" in kwargs.keys()
-    except AssertionError:
-        kwargs["version"] = 1
-
-    froot_string = ENDPOINT + FROOTS[arg]
-    return froot_string.format(**kwargs)
+    api_type = kwargs.pop("api_type", "apidev")
+    version = kwargs.pop("version", 1)
+    router = _routers.get((api_type, version))
+    if router is None:
+        router = _routers[(api_type, version)] = Router(ENDPOINT.format(api_type=api_type), version)
+    return router.url(arg, **kwargs)
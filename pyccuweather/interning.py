@@ -0,0 +1,80 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+interning.py
+Sharing of identical immutable sub-entities across objects
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import threading
+from weakref import WeakValueDictionary
+
+
+class InternTable(object):
+    """
+    A registry of shared instances, one per class and key. Instances are held weakly, so an instance no longer used by
+    any object is dropped from the table. Shared instances must be treated as immutable.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return u"<Intern table: {0:d} instances>".format(len(self))
+
+    __repr__ = __str__
+
+    def __len__(self):
+        return sum(len(table) for table in list(self._tables.values()))
+
+    def get(self, cls, key, factory):
+        """
+        Returns the shared instance of a class for a key, creating it if there is none.
+
+        :param cls: class of the instance
+        :param key: hashable key identifying the instance
+        :param factory: callable without arguments creating the instance
+        :return: shared instance
+        """
+        table = self._tables.get(cls)
+        if table is None:
+            with self._lock:
+                table = self._tables.setdefault(cls, WeakValueDictionary())
+
+        instance = table.get(key)
+        if instance is not None:
+            self.hits += 1
+            return instance
+
+        instance = factory()
+        with self._lock:
+            # Another thread may have created the instance in the meantime - keep the first one.
+            instance = table.setdefault(key, instance)
+        self.misses += 1
+        return instance
+
+    def clear(self):
+        """
+        Empties the table.
+
+        :return: void
+        """
+        with self._lock:
+            self._tables.clear()
+
+    def stats(self):
+        """
+        Returns the number of shared instances per class, and the table counters.
+
+        :return: dict of metrics
+        """
+        return {"instances": {cls.__name__: len(table) for cls, table in list(self._tables.items())},
+                "hits": self.hits,
+                "misses": self.misses}
@@ -0,0 +1,292 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+metrics.py
+Per-endpoint latency, payload size, error and lookup metrics, exportable as a dict or in the Prometheus text format
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import asyncio
+import threading
+from bisect import bisect_left
+
+from pyccuweather.tracing import Hook
+
+# Upper bounds of the histogram buckets: latencies in seconds, payload sizes in bytes.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Phases of a call: the HTTP round trip (including retries), decoding the body, and constructing the result objects.
+PHASES = ("http", "decode", "parse")
+
+# Where a lookup found its response; "miss" means it had to be requested from the API.
+SOURCES = ("cache", "location_store", "geo_index", "miss")
+
+INTERRUPTIONS = (KeyboardInterrupt, SystemExit, GeneratorExit, asyncio.CancelledError)
+
+
+class Histogram(object):
+    """
+    A histogram with fixed buckets, counting observations less than or equal to each bucket's upper bound.
+
+    :param buckets: ascending upper bounds of the buckets; a final bucket without upper bound is implied
+    """
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def __str__(self):
+        return u"<Histogram of {0:d} observations>".format(self.count)
+
+    __repr__ = __str__
+
+    def observe(self, value):
+        """
+        Adds an observation.
+
+        :param value: observed value
+        :return: void
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """
+        Returns the cumulative counts per upper bound, as in the Prometheus exposition.
+
+        :return: list of (upper bound, count) pairs, ending with (float("inf"), total count)
+        """
+        result, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self):
+        """
+        Returns the state of the histogram.
+
+        :return: dict of cumulative bucket counts, sum and count
+        """
+        return {"buckets": self.cumulative(), "sum": self.sum, "count": self.count}
+
+
+def _labels(**labels):
+    return "{" + ",".join(u'{0:s}="{1:s}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                          for k, v in labels.items()) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics(Hook):
+    """
+    A registry of Connection metrics, by endpoint (key of froots.FROOTS):
+
+    - latency histograms of each phase of a call (see PHASES),
+    - histograms of response body sizes,
+    - counts of errors raised, by exception class (e.g. NoResultsError, APIError),
+    - counts of lookups by where their response was found (see SOURCES),
+    - counts of calls coalesced with an identical call in flight.
+
+    A Connection only records metrics if it is given a registry; without one, it does no measurements at all. The
+    registry is a tracing hook, filled in from the spans of the connection's calls.
+
+    :param latency_buckets: upper bounds of the latency histogram buckets, in seconds
+    :param size_buckets: upper bounds of the payload size histogram buckets, in bytes
+    :param namespace: prefix of the metric names in the Prometheus exposition
+    """
+
+    def __init__(self, latency_buckets=LATENCY_BUCKETS, size_buckets=SIZE_BUCKETS, namespace: str="pyccuweather"):
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __str__(self):
+        return u"<Metrics registry ({0:d} endpoints)>".format(len(self._endpoints()))
+
+    __repr__ = __str__
+
+    def reset(self):
+        """
+        Discards all recorded metrics.
+
+        :return: void
+        """
+        with self._lock:
+            self._latency = {}
+            self._sizes = {}
+            self._errors = {}
+            self._lookups = {}
+            self._coalesced = {}
+
+    def _endpoints(self):
+        return set(k[0] for k in self._latency) | set(self._sizes) | set(k[0] for k in self._errors) | \
+            set(k[0] for k in self._lookups) | set(self._coalesced)
+
+    def end(self, span):
+        """
+        Records the metrics of a closed span.
+
+        :param span: tracing.Span object
+        :return: void
+        """
+        fkeyid = span.attributes["endpoint"]
+        if span.name == "call":
+            if span.error is not None:
+                self.error(fkeyid, span.error)
+            source = span.attributes.get("source")
+            if source is not None:
+                self.lookup(fkeyid, source)
+            if span.attributes.get("coalesced"):
+                self.coalesced(fkeyid)
+        elif span.name in PHASES:
+            self.observe(fkeyid, span.name, span.duration)
+            if span.name == "http" and span.error is None:
+                self.payload(fkeyid, span.attributes["bytes"])
+
+    def observe(self, fkeyid: str, phase: str, seconds: float):
+        """
+        Records the duration of a phase of a call.
+
+        :param fkeyid: endpoint name
+        :param phase: phase, one of PHASES
+        :param seconds: duration in seconds
+        :return: void
+        """
+        with self._lock:
+            histogram = self._latency.get((fkeyid, phase))
+            if histogram is None:
+                histogram = self._latency[(fkeyid, phase)] = Histogram(self.latency_buckets)
+            histogram.observe(seconds)
+
+    def payload(self, fkeyid: str, size: int):
+        """
+        Records the size of a response body.
+
+        :param fkeyid: endpoint name
+        :param size: size in bytes
+        :return: void
+        """
+        with self._lock:
+            histogram = self._sizes.get(fkeyid)
+            if histogram is None:
+                histogram = self._sizes[fkeyid] = Histogram(self.size_buckets)
+            histogram.observe(size)
+
+    def error(self, fkeyid: str, error):
+        """
+        Counts an error raised by a call. Interruptions (KeyboardInterrupt, SystemExit, GeneratorExit and the
+        cancellation of a coroutine) are not errors, and are not counted.
+
+        :param fkeyid: endpoint name
+        :param error: the exception, or its class
+        :return: void
+        """
+        cls = error if isinstance(error, type) else type(error)
+        if issubclass(cls, INTERRUPTIONS):
+            return
+        key = (fkeyid, cls.__name__)
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def lookup(self, fkeyid: str, source: str):
+        """
+        Counts a lookup by where its response was found.
+
+        :param fkeyid: endpoint name
+        :param source: one of SOURCES
+        :return: void
+        """
+        with self._lock:
+            self._lookups[(fkeyid, source)] = self._lookups.get((fkeyid, source), 0) + 1
+
+    def coalesced(self, fkeyid: str):
+        """
+        Counts a call that shared the outcome of an identical call in flight.
+
+        :param fkeyid: endpoint name
+        :return: void
+        """
+        with self._lock:
+            self._coalesced[fkeyid] = self._coalesced.get(fkeyid, 0) + 1
+
+    def snapshot(self):
+        """
+        Returns all metrics as plain data.
+
+        :return: dict of endpoint name -> dict with "latency" (phase -> histogram snapshot), "payload_bytes"
+                 (histogram snapshot or None), "errors" (exception class name -> count), "lookups" (source -> count)
+                 and "coalesced" (count)
+        """
+        with self._lock:
+            result = {fkeyid: {"latency": {}, "payload_bytes": None, "errors": {}, "lookups": {}, "coalesced": 0}
+                      for fkeyid in self._endpoints()}
+            for (fkeyid, phase), histogram in self._latency.items():
+                result[fkeyid]["latency"][phase] = histogram.snapshot()
+            for fkeyid, histogram in self._sizes.items():
+                result[fkeyid]["payload_bytes"] = histogram.snapshot()
+            for (fkeyid, name), count in self._errors.items():
+                result[fkeyid]["errors"][name] = count
+            for (fkeyid, source), count in self._lookups.items():
+                result[fkeyid]["lookups"][source] = count
+            for fkeyid, count in self._coalesced.items():
+                result[fkeyid]["coalesced"] = count
+        return result
+
+    def prometheus(self):
+        """
+        Renders all metrics in the Prometheus text exposition format.
+
+        :return: exposition as a string
+        """
+        snapshot = self.snapshot()
+        ns = self.namespace
+        lines = []
+
+        def histograms(name, help_text, series):
+            lines.append(u"# HELP {0:s} {1:s}".format(name, help_text))
+            lines.append(u"# TYPE {0:s} histogram".format(name))
+            for labels, histogram in series:
+                for bound, count in histogram["buckets"]:
+                    lines.append(u"{0:s}_bucket{1:s} {2:d}".format(name, _labels(**dict(labels, le=_number(bound))),
+                                                                   count))
+                lines.append(u"{0:s}_sum{1:s} {2:s}".format(name, _labels(**labels), _number(histogram["sum"])))
+                lines.append(u"{0:s}_count{1:s} {2:d}".format(name, _labels(**labels), histogram["count"]))
+
+        def counters(name, help_text, series):
+            lines.append(u"# HELP {0:s} {1:s}".format(name, help_text))
+            lines.append(u"# TYPE {0:s} counter".format(name))
+            for labels, count in series:
+                lines.append(u"{0:s}{1:s} {2:d}".format(name, _labels(**labels), count))
+
+        endpoints = sorted(snapshot.items())
+        histograms(ns + "_phase_duration_seconds", "Duration of each phase of a call.",
+                   [({"endpoint": fkeyid, "phase": phase}, histogram)
+                    for fkeyid, each in endpoints for phase, histogram in sorted(each["latency"].items())])
+        histograms(ns + "_response_bytes", "Size of response bodies.",
+                   [({"endpoint": fkeyid}, each["payload_bytes"])
+                    for fkeyid, each in endpoints if each["payload_bytes"] is not None])
+        counters(ns + "_errors_total", "Errors raised by calls, by exception class.",
+                 [({"endpoint": fkeyid, "error": name}, count)
+                  for fkeyid, each in endpoints for name, count in sorted(each["errors"].items())])
+        counters(ns + "_lookups_total", "Lookups, by where the response was found.",
+                 [({"endpoint": fkeyid, "source": source}, count)
+                  for fkeyid, each in endpoints for source, count in sorted(each["lookups"].items())])
+        counters(ns + "_coalesced_total", "Calls sharing the outcome of an identical call in flight.",
+                 [({"endpoint": fkeyid}, each["coalesced"]) for fkeyid, each in endpoints if each["coalesced"]])
+        return u"\n".join(lines) + u"\n"
@@ -10,16 +10,145 @@ http://www.github.com/chrisvoncsefalvay/pyccuweather/
 """
 
 
+import datetime
+import threading
 from collections import OrderedDict
+from collections.abc import Mapping
+import zlib
+from functools import lru_cache
 from time import strptime
 from uuid import uuid4
 
+import numpy as np
+
+from pyccuweather.climo import as_date
+from pyccuweather.columns import to_columns, ForecastColumns, CLIMO_COLUMNS, DAILY_COLUMNS, HOURLY_COLUMNS
+from pyccuweather.decoding import decode, encode
+from pyccuweather.interning import InternTable
+from pyccuweather.timeindex import TimeIndexed, EpochIndex
+from pyccuweather.units import convert
+
+# Shared Region, Country, AdministrativeArea and TimeZone instances, see interned().
+INTERNED = InternTable()
+
+
+def interned(cls, json):
+    """
+    Returns the shared instance of a Region, Country, AdministrativeArea or TimeZone for its JSON, so identical
+    sub-entities of many locations are held once. Shared instances must not be modified.
+
+    :param cls: one of Region, Country, AdministrativeArea or TimeZone
+    :param json: JSON of the sub-entity
+    :return: shared instance
+    """
+    return INTERNED.get(cls, tuple(json.get(k) for k in cls._key), lambda: cls(json=json))
+
+
+# Policies for the JSON parsed objects retain in their raw attribute: keep it as decoded, drop it, or keep it serialised
+# and compressed, and decode it again on access.
+RAW_POLICIES = ("keep", "drop", "compact")
+
+
+class CompactJSON(object):
+    """
+    JSON held serialised and compressed, decoded on access. Objects parsed from parts of one document share its bytes
+    and hold the path of their part.
+
+    :param data: zlib compressed JSON
+    :param path: keys and indices leading from the document to the part
+    """
+    __slots__ = ("data", "path")
+
+    def __init__(self, data: bytes, path=()):
+        self.data = data
+        self.path = path
+
+    def child(self, *path):
+        """
+        Refers to a part of the document.
+
+        :param path: keys and indices leading to the part, relative to this one
+        :return: CompactJSON
+        """
+        return CompactJSON(self.data, self.path + path)
+
+    def decode(self):
+        """
+        Decodes the JSON.
+
+        :return: decoded JSON
+        """
+        json = decode(zlib.decompress(self.data))
+        for key in self.path:
+            json = json[key]
+        return json
+
+    def __len__(self):
+        return len(self.data)
+
+    def __str__(self):
+        return u"<Compact JSON ({0:d} bytes)>".format(len(self.data))
+
+    __repr__ = __str__
+
+
+def retain(json, raw="keep"):
+    """
+    Applies a retention policy to the JSON an object is parsed from.
+
+    :param json: decoded JSON
+    :param raw: one of RAW_POLICIES, or a CompactJSON the object's JSON is part of
+    :return: what the object retains: the JSON, None or a CompactJSON
+    :raise ValueError: if the policy is unknown
+    """
+    if raw == "keep":
+        return json
+    if raw == "drop":
+        return None
+    if raw == "compact":
+        return CompactJSON(zlib.compress(encode(json), 1))
+    if isinstance(raw, CompactJSON):
+        return raw
+    raise ValueError(u"Unknown raw JSON retention policy: {0!r}".format(raw))
+
+
+def _part(raw, retained, *path):
+    """
+    Returns the retention policy for an object parsed from a part of another object's JSON.
+    """
+    return retained.child(*path) if isinstance(retained, CompactJSON) else raw
+
+
+class RawJSON(object):
+    """
+    Base for objects retaining the JSON they were parsed from, in the raw attribute, according to a retention policy
+    (see RAW_POLICIES). raw is None if the JSON was dropped. Kept JSON may be shared with the connection's response
+    cache, so it must not be modified.
+    """
+    __slots__ = ()
+
+    _raw = None
+
+    @property
+    def raw(self):
+        if isinstance(self._raw, CompactJSON):
+            return self._raw.decode()
+        return self._raw
+
+
+@lru_cache(maxsize=4096)
+def _parse_offset_change(value):
+    return strptime(value, "%Y-%m-%dT%H:%M:%SZ") if value is not None else None
+
 
 class Region(object):
     """
     An object representing an Accuweather Region.
     For a list of Accuweather regions: http://apidev.accuweather.com/developers/regions
     """
+    __slots__ = ("id", "localized_name", "english_name", "__weakref__")
+    _key = ("ID", "LocalizedName", "EnglishName")
+
     def __init__(self, json=None, identifier=None, localized_name=None, english_name=None):
 
         assert json or (localized_name and english_name and identifier)
@@ -42,6 +171,9 @@ class AdministrativeArea(object):
     Represents a primary administrative area.
     Countries are explained in the Accuweather documentation at http://apidev.accuweather.com/developers/administrativeareas
     """
+    __slots__ = ("id", "localized_name", "english_name", "level", "localized_type", "english_type", "__weakref__")
+    _key = ("ID", "LocalizedName", "EnglishName", "Level", "LocalizedType", "EnglishType")
+
     def __init__(self,
                  json=None,
                  identifier=None,
@@ -76,6 +208,9 @@ class Country(object):
     Represents a Country.
     Countries are explained in the Accuweather documentation at http://apidev.accuweather.com/developers/countries
     """
+    __slots__ = ("id", "localized_name", "english_name", "__weakref__")
+    _key = ("ID", "LocalizedName", "EnglishName")
+
     def __init__(self, json=None, identifier=None, localized_name=None, english_name=None):
         assert json or (localized_name and english_name and identifier)
 
@@ -97,6 +232,9 @@ class TimeZone(object):
     Represents a timezone.
     Timezones are explained in the Accuweather documentation at http://apidev.accuweather.com/developers/timeZones
     """
+    __slots__ = ("code", "name", "gmt_offset", "is_daylight_saving", "next_offset_change", "__weakref__")
+    _key = ("Code", "Name", "GmtOffset", "IsDaylightSaving", "NextOffsetChange")
+
     def __init__(self,
                  json=None,
                  code=None,
@@ -115,14 +253,14 @@ class TimeZone(object):
             code = json["Code"]
             name = json["Name"]
             gmt_offset = json["GmtOffset"]
-            is_daylight_saving = True if json["IsDaylightSaving"] is 'true' else False
+            is_daylight_saving = json["IsDaylightSaving"] in (True, "true")
             next_offset_change = json["NextOffsetChange"]
 
         self.code = code
         self.name = name
         self.gmt_offset = gmt_offset
         self.is_daylight_saving = is_daylight_saving
-        self.next_offset_change = strptime(next_offset_change, "%Y-%m-%dT%H:%M:%SZ")
+        self.next_offset_change = _parse_offset_change(next_offset_change)
 
 
 class Location(object):
@@ -158,10 +296,11 @@ class Location(object):
         self.lon = lon
         self.localized_name = localized_name
         self.english_name = english_name
-        self.region = Region(json=region)
-        self.country = Country(json=country)
-        self.administrative_area = AdministrativeArea(json=administrative_area)
-        self.timezone = TimeZone(json=timezone)
+        self.region = region if isinstance(region, Region) else interned(Region, region)
+        self.country = country if isinstance(country, Country) else interned(Country, country)
+        self.administrative_area = administrative_area if isinstance(administrative_area, AdministrativeArea) \
+            else interned(AdministrativeArea, administrative_area)
+        self.timezone = timezone if isinstance(timezone, TimeZone) else interned(TimeZone, timezone)
 
     def __str__(self):
         return u"<Location key: {0} ({1})>".format(self.lkey, self.english_name)
@@ -204,6 +343,8 @@ class Temperature(object):
     """
     Represents a temperature value.
     """
+    __slots__ = ("value", "units")
+
     def __init__(self, value, units="C"):
         assert units in ["C", "F"]
 
@@ -217,10 +358,7 @@ class Temperature(object):
 
         :return: Temperature in degrees Fahrenheit.
         """
-        if self.units == "F":
-            return self.value
-        else:
-            return (self.value * 1.8) + 32
+        return convert(self.value, self.units, "F")
 
     @property
     def C(self):
@@ -229,10 +367,7 @@ class Temperature(object):
 
         :return: Temperature in degrees Celsius.
         """
-        if self.units == "C":
-            return self.value
-        else:
-            return (self.value - 32) * (5 / 9)
+        return convert(self.value, self.units, "C")
 
     def __str__(self):
         return u"<Temperature: {0:.1f} C / {1:.1f} F>".format(self.C, self.F)
@@ -244,6 +379,8 @@ class Precipitation(object):
     """
     Represents a precipitation value.
     """
+    __slots__ = ("value", "units")
+
     def __init__(self, value, units="mm"):
         assert units in ["mm", "in"]
 
@@ -257,10 +394,7 @@ class Precipitation(object):
 
         :return: precipitation in mm
         """
-        if self.units == "mm":
-            return self.value
-        else:
-            return self.value * 25.4
+        return convert(self.value, self.units, "mm")
 
     @property
     def inch(self):
@@ -269,10 +403,7 @@ class Precipitation(object):
 
         :return: precipitation in in
         """
-        if self.units == "in":
-            return self.value
-        else:
-            return self.value / 25.4
+        return convert(self.value, self.units, "in")
 
     def __str__(self):
         return u"<Precipitation: {0:.1f} mm / {1:.1f} in>".format(self.mm, self.inch)
@@ -281,6 +412,11 @@ class Precipitation(object):
 
 
 class Snow(object):
+    """
+    Represents a snowfall value.
+    """
+    __slots__ = ("value", "units")
+
     def __init__(self, value, units="cm"):
         assert units in ["cm", "in"]
 
@@ -289,16 +425,21 @@ class Snow(object):
 
     @property
     def mm(self):
-        if self.units == "cm":
-            return 10 * self.value
-        else:
-            return self.value * 25.4
+        """
+        Represents snowfall in mm.
+
+        :return: snowfall in mm
+        """
+        return convert(self.value, self.units, "mm")
 
+    @property
     def inch(self):
-        if self.units == "in":
-            return self.value
-        else:
-            return self.value / 2.54
+        """
+        Represents snowfall in inches.
+
+        :return: snowfall in in
+        """
+        return convert(self.value, self.units, "in")
 
     def __str__(self):
         return u"<Snow: {0:.1f} mm / {1:.1f} in>".format(self.mm, self.inch)
@@ -307,6 +448,11 @@ class Snow(object):
 
 
 class Wind(object):
+    """
+    Represents a wind speed and heading.
+    """
+    __slots__ = ("speed", "units", "hdg")
+
     def __init__(self, json, hdg=None):
 
         self.speed = json["Speed"]["Value"]
@@ -316,17 +462,23 @@ class Wind(object):
         else:
             self.hdg = json["Direction"]["Degrees"]
 
+    @property
     def kmh(self):
-        if self.units == "km/h":
-            return self.speed
-        else:
-            return self.speed * 1.60934
+        """
+        Represents wind speed in km/h.
+
+        :return: wind speed in km/h
+        """
+        return convert(self.speed, self.units, "km/h")
 
+    @property
     def mph(self):
-        if self.units == "mi/h":
-            return self.speed
-        else:
-            return self.speed / 1.60934
+        """
+        Represents wind speed in mph.
+
+        :return: wind speed in mi/h
+        """
+        return convert(self.speed, self.units, "mi/h")
 
     def __str__(self):
         return u"<Wind: {0} {1:.1f} kmh / {2:.1f} mph>".format(self.hdg, self.kmh, self.mph)
@@ -335,60 +487,131 @@ class Wind(object):
 
 
 class AirQualityFactor(object):
+    """
+    Represents one factor of air quality: the overall index, or a pollutant.
+    """
+    __slots__ = ("name", "value", "category", "band", "type", "date", "epoch_date")
+
     def __init__(self, aqf_dict):
         self.name = aqf_dict["Name"]
         self.value = aqf_dict["Value"]
         self.category = aqf_dict["Category"]
         self.band = aqf_dict["CategoryValue"]
-
+        self.type = aqf_dict.get("Type")
+        self.date = aqf_dict.get("Date")
+        self.epoch_date = aqf_dict.get("EpochDate")
 
     def __str__(self):
-        return u"<Air quality factor {0:s}: {1:.2f} ({2:s})>".format(self.name, self.value, self.band)
+        return u"<Air quality factor {0:s}: {1:.2f} ({2:s})>".format(self.name, self.value, self.category)
 
     __repr__ = __str__
 
 
-class AirQuality(object):
-    def __init__(self, aqf_dict):
-        for each in aqf_dict:
-            aqi = AirQualityFactor(each)
-            exec("self.%s = aqi" % each["Name"].lower())
+# Factors of air quality, as named by the API, and the attributes of AirQuality holding them.
+POLLUTANTS = OrderedDict([("AirQuality", "airquality"),
+                          ("Ozone", "ozone"),
+                          ("PM2_5", "pm2_5"),
+                          ("PM10", "pm10"),
+                          ("NO2", "no2"),
+                          ("SO2", "so2"),
+                          ("CO", "co")])
+
+
+class AirQuality(RawJSON):
+    """
+    Represents air quality: the overall index (airquality) and each pollutant (ozone, pm2_5, pm10, no2, so2 and co),
+    as AirQualityFactor objects. Factors the API did not report are None; factors not in POLLUTANTS are only kept in
+    the JSON.
+
+    :param json: decoded air quality response
+    :param raw: retention policy for the JSON, one of RAW_POLICIES
+    """
+    __slots__ = tuple(POLLUTANTS.values()) + ("_raw",)
+
+    def __init__(self, json, raw="keep"):
+        for attribute in POLLUTANTS.values():
+            setattr(self, attribute, None)
+        for each in json:
+            attribute = POLLUTANTS.get(each["Name"])
+            if attribute is not None:
+                setattr(self, attribute, AirQualityFactor(each))
+        self._raw = retain(json, raw)
+
+    @property
+    def factors(self):
+        """
+        The factors reported.
+
+        :return: OrderedDict of factor name -> AirQualityFactor, in the order of POLLUTANTS
+        """
+        return OrderedDict((name, getattr(self, attribute)) for name, attribute in POLLUTANTS.items()
+                           if getattr(self, attribute) is not None)
+
+    def bands(self):
+        """
+        Returns the category bands of the factors, compactly.
+
+        :return: tuple of bands (CategoryValue), in the order of POLLUTANTS; None for factors not reported
+        """
+        return tuple(None if getattr(self, attribute) is None else getattr(self, attribute).band
+                     for attribute in POLLUTANTS.values())
+
+    def __str__(self):
+        if self.airquality is None:
+            return u"<Air quality ({0:d} factors)>".format(len(self.factors))
+        return u"<Air quality: {0:s}>".format(self.airquality.category)
+
+    __repr__ = __str__
 
 
 class Ceiling(object):
+    """
+    Represents a cloud ceiling.
+    """
+    __slots__ = ("value", "units")
+
     def __init__(self, json):
+        assert json["Unit"] in ["m", "km", "ft"]
+
         self.value = json["Value"]
         self.units = json["Unit"]
 
     @property
     def km(self):
-        if self.units == "km":
-            return self.value
-        else:
-            return self.value * 0.0003048
+        """
+        Represents the ceiling in km.
+
+        :return: ceiling in km
+        """
+        return convert(self.value, self.units, "km")
 
     @property
     def m(self):
-        if self.units == "km":
-            return self.value * 1000
-        else:
-            return self.value * 0.3048
+        """
+        Represents the ceiling in m.
+
+        :return: ceiling in m
+        """
+        return convert(self.value, self.units, "m")
 
     @property
     def ft(self):
-        if self.units == "ft":
-            return self.value
-        else:
-            return self.value * 3280.8399
+        """
+        Represents the ceiling in ft.
+
+        :return: ceiling in ft
+        """
+        return convert(self.value, self.units, "ft")
 
     def __str__(self):
-        return u"<Ceiling at {0:s}m (approximately FL {1:s})>".format(self.m, int(round(self.ft / 100, -1)))
+        return u"<Ceiling at {0:.0f}m (approximately FL {1:d})>".format(self.m, int(round(self.ft / 100, -1)))
 
     __repr__ = __str__
 
-class Hemiurnal(object):
-    def __init__(self, json):
-        self.id = uuid4()
+
+class Hemiurnal(RawJSON):
+    def __init__(self, json, raw="keep"):
+        self._id = None
         # Verbals
         self.synopsis = json["LongPhrase"]
         self.phrase = json["ShortPhrase"]
@@ -417,19 +640,323 @@ class Hemiurnal(object):
             self.wind_gust = Wind(json["WindGust"])
         else:
             self.wind_gust = None
-        self.raw = json
+        self._raw = retain(json, raw)
+
+    @property
+    def id(self):
+        """
+        Unique identifier of the hemiurnal, generated on first access.
+
+        :return: UUID
+        """
+        if self._id is None:
+            self._id = uuid4()
+        return self._id
 
     def __str__(self):
-        return u"<Hemiurnal observation {0:s}>".format(self.id)
+        return u"<Hemiurnal observation {0}>".format(self.id)
+
+def _metric(json):
+    """
+    Returns the metric value of a quantity given in both unit systems, or the quantity itself if it only has one.
+    """
+    return json["Metric"] if "Metric" in json else json
+
 
 class DegreeDay(object):
+    """
+    Represents heating and cooling degree days.
+    """
+    __slots__ = ("cooling", "heating")
+
     def __init__(self, aqf_dict):
-        self.cooling = Temperature(value=aqf_dict["Cooling"]["Value"], units=aqf_dict["Cooling"]["Unit"])
-        self.warming = Temperature(value=aqf_dict["Warming"]["Value"], units=aqf_dict["Warming"]["Unit"])
+        cooling = _metric(aqf_dict["Cooling"])
+        heating = _metric(aqf_dict["Heating"] if "Heating" in aqf_dict else aqf_dict["Warming"])
+        self.cooling = Temperature(value=cooling["Value"], units=cooling["Unit"])
+        self.heating = Temperature(value=heating["Value"], units=heating["Unit"])
 
+    @property
+    def warming(self):
+        """
+        Heating degree days, under their former name.
+        """
+        return self.heating
 
-class DailyForecast(object):
-    def __init__(self, json):
+    def __str__(self):
+        return u"<Degree days: {0:.1f} heating / {1:.1f} cooling>".format(self.heating.value, self.cooling.value)
+
+    __repr__ = __str__
+
+
+# Kinds of climatology: observed values, records and normals.
+CLIMO_KINDS = ("actuals", "records", "normals")
+
+
+class ClimoDay(RawJSON):
+    """
+    Represents one day of climatology: the actual, record or normal values for a date, in metric units. Values the
+    API does not report for the kind of climatology (e.g. mean temperature for records) are None.
+
+    :param json: JSON of the day
+    :param kind: kind of climatology, one of CLIMO_KINDS
+    :param raw: retention policy for the JSON, one of RAW_POLICIES
+    """
+    __slots__ = ("kind", "date", "epoch_date", "temp_min", "temp_max", "temp_mean", "precipitation", "snowfall",
+                 "snow_depth", "degree_days", "years", "_raw")
+
+    def __init__(self, json, kind: str="actuals", raw="keep"):
+        assert kind in CLIMO_KINDS
+        self.kind = kind
+        self.date = json["Date"]
+        self.epoch_date = json["EpochDate"]
+
+        temperatures = json.get("Temperatures", {})
+        self.temp_min = self._temperature(temperatures.get("Minimum"))
+        self.temp_max = self._temperature(temperatures.get("Maximum"))
+        self.temp_mean = self._temperature(temperatures.get("Average"))
+        self.precipitation = self._quantity(Precipitation, json.get("Precipitation"))
+        self.snowfall = self._quantity(Snow, json.get("Snowfall"))
+        self.snow_depth = self._quantity(Snow, json.get("SnowDepth"))
+        self.degree_days = DegreeDay(json["DegreeDays"]) if "DegreeDays" in json else None
+        # Records are annotated with the year they were set in.
+        self.years = {name: each["Year"] for name, each in (("temp_min", temperatures.get("Minimum")),
+                                                             ("temp_max", temperatures.get("Maximum")),
+                                                             ("precipitation", json.get("Precipitation")),
+                                                             ("snowfall", json.get("Snowfall")))
+                      if each is not None and each.get("Year") is not None} if kind == "records" else None
+        self._raw = retain(json, raw)
+
+    @staticmethod
+    def _temperature(json):
+        if json is None:
+            return None
+        value = _metric(json)
+        return Temperature(value=value["Value"], units=value["Unit"])
+
+    @staticmethod
+    def _quantity(cls, json):
+        if json is None:
+            return None
+        value = _metric(json)
+        return cls(value=value["Value"], units=value["Unit"])
+
+    def __str__(self):
+        return u"<Climatology ({0:s}) for {1:s}>".format(self.kind, self.date)
+
+    __repr__ = __str__
+
+
+# Nan-aware reductions for ClimoSeries.aggregate().
+_AGGREGATES = {"mean": np.nanmean, "min": np.nanmin, "max": np.nanmax, "sum": np.nansum}
+
+# datetime.date.toordinal() of 1970-01-01.
+_EPOCH_ORDINAL = 719163
+
+
+class ClimoSeries(RawJSON):
+    """
+    Base for climatology series: one row per day, kept in NumPy columns (see columns.CLIMO_COLUMNS) rather than as
+    objects, so a year of daily data takes a few kilobytes. Rows are in date order, and looked up by date in O(1).
+
+    The columns hold every value the series offers, so its JSON is dropped by default. Keeping it, for the raw
+    attribute, takes many times the memory of the columns.
+
+    :param json: decoded climatology response: a day, or a list of days
+    :param raw: retention policy for the JSON, one of RAW_POLICIES
+    """
+    kind = None
+
+    def __init__(self, json, raw="drop"):
+        self._raw = retain(json, raw)
+        days = json if isinstance(json, list) else [json]
+        columns = to_columns(days, CLIMO_COLUMNS[self.kind])
+        ordinals = np.array([datetime.date.fromisoformat(each["Date"][0:10]).toordinal() for each in days],
+                            dtype=np.int32)
+        if np.any(ordinals[1:] < ordinals[:-1]):
+            order = np.argsort(ordinals, kind="stable")
+            ordinals = ordinals[order]
+            columns = ForecastColumns({k: v[order] for k, v in columns.items()}, columns.units)
+        self.columns = columns
+        self.ordinals = ordinals
+        self._first = int(ordinals[0]) if len(ordinals) else 0
+        # A contiguous series maps dates to rows arithmetically; one with gaps needs a table.
+        contiguous = len(ordinals) == 0 or int(ordinals[-1]) - self._first == len(ordinals) - 1
+        self._rows = None if contiguous else {int(o): i for i, o in enumerate(ordinals)}
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def __contains__(self, date):
+        try:
+            self.row(date)
+        except KeyError:
+            return False
+        return True
+
+    def __str__(self):
+        if not len(self):
+            return u"<Climatology {0:s} (empty)>".format(self.kind)
+        return u"<Climatology {0:s} from {1} to {2}>".format(self.kind, self.start_date, self.end_date)
+
+    __repr__ = __str__
+
+    @property
+    def start_date(self):
+        return datetime.date.fromordinal(int(self.ordinals[0])) if len(self) else None
+
+    @property
+    def end_date(self):
+        return datetime.date.fromordinal(int(self.ordinals[-1])) if len(self) else None
+
+    @property
+    def dates(self):
+        """
+        Dates of the rows, as a NumPy datetime64[D] array.
+        """
+        return (self.ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+    def row(self, date):
+        """
+        Finds the row of a date.
+
+        :param date: datetime.date, or YYYY/MM/DD or YYYY-MM-DD string
+        :return: row number
+        :raise KeyError: if the series has no row for the date
+        """
+        ordinal = as_date(date).toordinal()
+        if self._rows is not None:
+            return self._rows[ordinal]
+        i = ordinal - self._first
+        if not 0 <= i < len(self.ordinals):
+            raise KeyError(date)
+        return i
+
+    def __getitem__(self, date):
+        """
+        Returns the values of a date.
+
+        :param date: datetime.date, or YYYY/MM/DD or YYYY-MM-DD string
+        :return: dict of column name -> value
+        :raise KeyError: if the series has no row for the date
+        """
+        i = self.row(date)
+        return {name: column[i].item() for name, column in self.columns.items()}
+
+    def _slice(self, start=None, end=None):
+        """
+        Returns the rows from start to end, both inclusive, as a slice.
+        """
+        lo = np.searchsorted(self.ordinals, as_date(start).toordinal()) if start is not None else 0
+        hi = np.searchsorted(self.ordinals, as_date(end).toordinal(), side="right") if end is not None \
+            else len(self.ordinals)
+        return slice(lo, hi)
+
+    def between(self, start=None, end=None):
+        """
+        Returns the columns of the days from start to end, both inclusive. The arrays are views of the series'.
+
+        :param start: first date, or None for no lower bound
+        :param end: last date, or None for no upper bound
+        :return: columns.ForecastColumns
+        """
+        rows = self._slice(start, end)
+        return ForecastColumns({k: v[rows] for k, v in self.columns.items()}, self.columns.units)
+
+    def aggregate(self, column: str, how: str="mean", start=None, end=None):
+        """
+        Aggregates a column over the days from start to end, both inclusive, ignoring missing values.
+
+        :param column: column name, e.g. "temp_max" or "precipitation"
+        :param how: one of "mean", "min", "max" and "sum"
+        :param start: first date, or None for no lower bound
+        :param end: last date, or None for no upper bound
+        :return: aggregate as a float; NaN if there are no values, except for sums, which are 0
+        """
+        values = self.columns[column][self._slice(start, end)]
+        if how != "sum" and not np.any(~np.isnan(values)):
+            return float("nan")
+        return float(_AGGREGATES[how](values))
+
+    def monthly(self, column: str, how: str="mean"):
+        """
+        Aggregates a column by calendar month, ignoring missing values.
+
+        :param column: column name
+        :param how: one of "mean", "min", "max" and "sum"
+        :return: OrderedDict of "YYYY-MM" -> aggregate, in date order
+        """
+        result = OrderedDict()
+        if not len(self):
+            return result
+        months = self.dates.astype("datetime64[M]")
+        starts = np.flatnonzero(np.concatenate(([True], months[1:] != months[:-1])))
+        values = self.columns[column]
+        present = ~np.isnan(values)
+        if how == "min":
+            aggregates = np.fmin.reduceat(values, starts)
+        elif how == "max":
+            aggregates = np.fmax.reduceat(values, starts)
+        else:
+            sums = np.add.reduceat(np.where(present, values, 0), starts)
+            if how == "sum":
+                aggregates = sums
+            else:
+                assert how == "mean"
+                counts = np.add.reduceat(present, starts)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    aggregates = np.where(counts > 0, sums / counts, np.nan)
+        for month, value in zip(months[starts], aggregates):
+            result[str(month)] = float(value)
+        return result
+
+    def degree_days(self, date):
+        """
+        Returns the degree days of a date.
+
+        :param date: datetime.date, or YYYY/MM/DD or YYYY-MM-DD string
+        :return: DegreeDay object
+        :raise KeyError: if the series has no row for the date, or no degree days
+        """
+        i = self.row(date)
+        return DegreeDay({"Heating": {"Value": self.columns["heating_degree_days"][i].item(),
+                                      "Unit": self.columns.units["heating_degree_days"]},
+                          "Cooling": {"Value": self.columns["cooling_degree_days"][i].item(),
+                                      "Unit": self.columns.units["cooling_degree_days"]}})
+
+    def to_arrays(self):
+        """
+        Returns the columns of the series.
+
+        :return: columns.ForecastColumns, with one row per day
+        """
+        return self.columns
+
+
+class ClimoActuals(ClimoSeries):
+    """
+    Represents observed daily climatology: temperatures, precipitation, snow and degree days.
+    """
+    kind = "actuals"
+
+
+class ClimoRecords(ClimoSeries):
+    """
+    Represents record daily climatology, with the years the records were set in (the *_year columns). Records have
+    no mean temperature or degree days.
+    """
+    kind = "records"
+
+
+class ClimoNormals(ClimoSeries):
+    """
+    Represents normal daily climatology: temperatures, precipitation and degree days.
+    """
+    kind = "normals"
+
+
+class DailyForecast(RawJSON):
+    def __init__(self, json, raw="keep"):
+        self._raw = retain(json, raw)
         # Dates
         self.epoch_date = json["EpochDate"]
         self.date = json["Date"]
@@ -449,17 +976,16 @@ class DailyForecast(object):
         # Sunshine hours
         self.hours_of_sun = json["HoursOfSun"]
         # Hemiurnals
-        self.day = Hemiurnal(json["Day"])
-        self.night = Hemiurnal(json["Night"])
-        self.raw = json
+        self.day = Hemiurnal(json["Day"], raw=_part(raw, self._raw, "Day"))
+        self.night = Hemiurnal(json["Night"], raw=_part(raw, self._raw, "Night"))
 
     def __str__(self):
         return u"<Daily forecast for {0:s}>".format(self.date)
 
     __repr__ = __str__
 
-class HourlyForecast(object):
-    def __init__(self, json):
+class HourlyForecast(RawJSON):
+    def __init__(self, json, raw="keep"):
 
         # Dates and times
         self.epoch_datetime = json["EpochDateTime"]
@@ -508,7 +1034,7 @@ class HourlyForecast(object):
         # Accuweather
         self.link = json["Link"]
         self.mobile_link = json["MobileLink"]
-        self.raw = json
+        self._raw = retain(json, raw)
 
     def __str__(self):
         return u"<Hourly forecast for {0:s}>".format(self.datetime)
@@ -516,9 +1042,69 @@ class HourlyForecast(object):
     __repr__ = __str__
 
 
+class LazyForecasts(Mapping):
+    """
+    An ordered, read-only mapping of forecasts that builds each forecast from its JSON on first access. Safe to share
+    between threads.
 
-class DailyForecasts(object):
-    def __init__(self, json):
+    :param keys: keys of the forecasts, in order
+    :param sources: JSON of the forecasts, in the same order
+    :param factory: callable building a forecast from its JSON and its position
+    :param release: whether to let go of each forecast's JSON once it is built
+    """
+    def __init__(self, keys, sources, factory, release: bool=False):
+        self._index = OrderedDict((k, i) for i, k in enumerate(keys))
+        self._sources = list(sources) if release else sources
+        self._factory = factory
+        self._release = release
+        self._built = [None] * len(sources)
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        i = self._index[key]
+        forecast = self._built[i]
+        if forecast is None:
+            # Series are shared between threads by coalescing, so a forecast is built, and its JSON released, once.
+            with self._lock:
+                forecast = self._built[i]
+                if forecast is None:
+                    forecast = self._built[i] = self._factory(self._sources[i], i)
+                    if self._release:
+                        self._sources[i] = None
+        return forecast
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    @property
+    def materialized(self):
+        """
+        Number of forecasts built so far.
+        """
+        return sum(1 for each in self._built if each is not None)
+
+    def __str__(self):
+        return u"<Lazy forecasts ({0:d} of {1:d} built)>".format(self.materialized, len(self))
+
+    __repr__ = __str__
+
+
+class DailyForecasts(TimeIndexed, RawJSON):
+    """
+    Represents a daily forecast series.
+
+    :param json: decoded forecast response
+    :param lazy: if True, forecasts is a LazyForecasts mapping building each DailyForecast on first access
+    :param raw: retention policy for the JSON of the series and its forecasts, one of RAW_POLICIES
+    """
+    def __init__(self, json, lazy: bool=False, raw="keep"):
+        self._raw = retain(json, raw)
         self.effective_date = json["Headline"]["EffectiveDate"]
         self.effective_epoch_date = json["Headline"]["EffectiveEpochDate"]
         self.end_date = json["Headline"]["EndDate"]
@@ -528,35 +1114,99 @@ class DailyForecasts(object):
         self.link = json["Headline"]["Link"]
         self.mobile_link = json["Headline"]["MobileLink"]
 
-        self.forecasts = OrderedDict()
-        for each in json["DailyForecasts"]:
-            k = each["Date"][0:10]
-            v = DailyForecast(each)
-            self.forecasts[k] = v
-        self.raw = json
+        def factory(each, i):
+            return DailyForecast(each, raw=_part(raw, self._raw, "DailyForecasts", i))
+
+        if lazy:
+            self.forecasts = LazyForecasts([each["Date"][0:10] for each in json["DailyForecasts"]],
+                                           json["DailyForecasts"],
+                                           factory,
+                                           release=self._raw is not json)
+        else:
+            self.forecasts = OrderedDict()
+            for i, each in enumerate(json["DailyForecasts"]):
+                k = each["Date"][0:10]
+                v = factory(each, i)
+                self.forecasts[k] = v
+        if self._raw is not json:
+            self._index = EpochIndex(*self._time_index(json))
+
+    def to_arrays(self):
+        """
+        Exports the series as NumPy columns, built directly from the JSON. The forecast objects do not carry every
+        column, so a series parsed with raw="drop" cannot be exported.
+
+        :return: columns.ForecastColumns, with one row per day
+        :raise ValueError: if the JSON of the series was dropped
+        """
+        if self._raw is None:
+            raise ValueError(u"The JSON of this series was dropped - parse it with raw='keep' or raw='compact'.")
+        return to_columns(self.raw["DailyForecasts"], DAILY_COLUMNS)
+
+    def _time_index(self, json):
+        entries = json["DailyForecasts"]
+        return [each["EpochDate"] for each in entries], [each["Date"][0:10] for each in entries]
+
+    def _entries(self):
+        return self.forecasts
 
     def __str__(self):
         return "<Daily forecasts from %s to %s>" % (self.effective_date, self.end_date)
 
     __repr__ = __str__
 
-class HourlyForecasts(object):
-    def __init__(self, json):
-        self.forecasts = OrderedDict()
-        for each in json:
-            k = each["DateTime"]
-            v = HourlyForecast(each)
-            self.forecasts[k] = v
-        self.raw = json
+class HourlyForecasts(TimeIndexed, RawJSON):
+    """
+    Represents an hourly forecast series.
+
+    :param json: decoded forecast response
+    :param lazy: if True, forecasts is a LazyForecasts mapping building each HourlyForecast on first access
+    :param raw: retention policy for the JSON of the series and its forecasts, one of RAW_POLICIES
+    """
+    def __init__(self, json, lazy: bool=False, raw="keep"):
+        self._raw = retain(json, raw)
+
+        def factory(each, i):
+            return HourlyForecast(each, raw=_part(raw, self._raw, i))
+
+        if lazy:
+            self.forecasts = LazyForecasts([each["DateTime"] for each in json], json, factory,
+                                           release=self._raw is not json)
+        else:
+            self.forecasts = OrderedDict()
+            for i, each in enumerate(json):
+                k = each["DateTime"]
+                v = factory(each, i)
+                self.forecasts[k] = v
+        if self._raw is not json:
+            self._index = EpochIndex(*self._time_index(json))
+
+    def to_arrays(self):
+        """
+        Exports the series as NumPy columns, built directly from the JSON. The forecast objects do not carry every
+        column, so a series parsed with raw="drop" cannot be exported.
+
+        :return: columns.ForecastColumns, with one row per hour
+        :raise ValueError: if the JSON of the series was dropped
+        """
+        if self._raw is None:
+            raise ValueError(u"The JSON of this series was dropped - parse it with raw='keep' or raw='compact'.")
+        return to_columns(self.raw, HOURLY_COLUMNS)
+
+    def _time_index(self, json):
+        return [each["EpochDateTime"] for each in json], [each["DateTime"] for each in json]
+
+    def _entries(self):
+        return self.forecasts
 
     def __str__(self):
-        return "<Hourly forecasts from %s>" % self.forecasts[0]
+        return "<Hourly forecasts from %s>" % next(iter(self.forecasts), None)
 
     __repr__ = __str__
 
 
-class Observation(object):
-    def __init__(self, json):
+class Observation(RawJSON):
+    def __init__(self, json, raw="keep"):
         # Date and time
         self.date_time = json["LocalObservationDateTime"]
         self.epoch_time = json["EpochTime"]
@@ -565,7 +1215,7 @@ class Observation(object):
                                        units=json["Temperature"]["Metric"]["Unit"])
         self.link = json["Link"]
         self.mobile_link = json["MobileLink"]
-        self.raw = json
+        self._raw = retain(json, raw)
 
     def __str__(self):
         return "<Synoptic observation at %s>" % self.date_time
@@ -573,16 +1223,27 @@ class Observation(object):
     __repr__ = __str__
 
 
+class CurrentObs(TimeIndexed, RawJSON):
+    """
+    Represents current conditions. The observations are the JSON entries themselves, so the JSON is always kept: there
+    is no retention policy for current conditions.
 
-class CurrentObs(object):
+    :param json: decoded current conditions response
+    """
     def __init__(self, json):
         self.observations = OrderedDict()
         for each in json:
             k = each["LocalObservationDateTime"]
             v = each
             self.observations[k] = v
-        self.raw = json
+        self._raw = json
+
+    def _time_index(self, json):
+        return [each["EpochTime"] for each in json], [each["LocalObservationDateTime"] for each in json]
+
+    def _entries(self):
+        return self.observations
 
     def __str__(self):
-        return "<Current observations from %s>" % self.observations[0]
+        return "<Current observations from %s>" % next(iter(self.observations), None)
     __repr__ = __str__
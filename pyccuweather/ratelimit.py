@@ -0,0 +1,279 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+ratelimit.py
+Client-side rate limiting and quota accounting
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pyccuweather import errors
+
+# Priority classes - lower values pre-empt higher ones.
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", NORMAL: "normal", BACKGROUND: "background"}
+
+# Default priority class by endpoint name or endpoint name prefix; exact names take precedence over prefixes and
+# endpoints not listed are NORMAL.
+DEFAULT_PRIORITIES = {"loc_": INTERACTIVE,
+                      "currentconditions": INTERACTIVE,
+                      "minutecast": INTERACTIVE,
+                      "alarms_": INTERACTIVE,
+                      "forecast_1h": INTERACTIVE,
+                      "forecast_240h": BACKGROUND,
+                      "forecast_25d": BACKGROUND,
+                      "forecast_45d": BACKGROUND,
+                      "climo_": BACKGROUND}
+
+_priority = ContextVar("pyccuweather_priority", default=None)
+
+
+@contextmanager
+def priority(cls: int):
+    """
+    Runs the calls made within the block, in the current thread or task, in the given priority class.
+
+    :param cls: priority class (INTERACTIVE, NORMAL or BACKGROUND)
+    """
+    assert cls in PRIORITY_NAMES
+    token = _priority.set(cls)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimiter(object):
+    """
+    A token bucket rate limiter with a rolling daily quota and priority classes.
+
+    Calls take one token each; tokens are replenished at `rate` per second up to `burst`. While a call of a higher
+    priority class is waiting for a token, calls of lower classes are held back. The daily quota counts calls over a
+    rolling 24 hour window, and the last `quota_reserve` share of it is kept for INTERACTIVE calls. Once the quota is
+    used up, calls fail with errors.QuotaExceededError rather than wait. Calls are counted in one minute buckets, so a
+    call counts against the quota for up to a minute longer than 24 hours, but never for less.
+
+    :param rate: tokens replenished per second
+    :param burst: maximum number of tokens
+    :param daily_quota: maximum number of calls in any 24 hour window, or None for no quota
+    :param quota_reserve: share of the daily quota only INTERACTIVE calls may use
+    :param priorities: dict of endpoint name or prefix -> priority class, overriding DEFAULT_PRIORITIES
+    :param clock: monotonic time source, in seconds
+    :param sleep: sleep function used by blocking acquire()
+    """
+
+    WINDOW = 24 * 3600
+    BUCKET = 60
+
+    def __init__(self,
+                 rate: float,
+                 burst: int=None,
+                 daily_quota: int=None,
+                 quota_reserve: float=0.0,
+                 priorities: dict=None,
+                 clock=time.monotonic,
+                 sleep=time.sleep):
+        assert rate > 0
+        assert 0 <= quota_reserve < 1
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.daily_quota = daily_quota
+        self.quota_reserve = quota_reserve
+        self.priorities = dict(DEFAULT_PRIORITIES)
+        if priorities:
+            self.priorities.update(priorities)
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(self.burst)
+        self.granted = {cls: 0 for cls in PRIORITY_NAMES}
+        self.delayed = {cls: 0 for cls in PRIORITY_NAMES}
+        self.rejected = 0
+        self.wait_time = 0.0
+        self._updated = clock()
+        self._waiting = {cls: 0 for cls in PRIORITY_NAMES}
+        self._calls = deque()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return u"<Rate limiter: {0:.1f}/s, burst {1:d}>".format(self.rate, self.burst)
+
+    __repr__ = __str__
+
+    def priority_of(self, fkeyid: str):
+        """
+        Returns the priority class of a call: the class set by priority() if any, otherwise the endpoint's class.
+
+        :param fkeyid: endpoint name
+        :return: priority class
+        """
+        cls = _priority.get()
+        if cls is not None:
+            return cls
+        if fkeyid in self.priorities:
+            return self.priorities[fkeyid]
+        prefixes = [p for p in self.priorities if fkeyid.startswith(p)]
+        return self.priorities[max(prefixes, key=len)] if prefixes else NORMAL
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _expire(self, now):
+        # A bucket expires once its last possible call is out of the window.
+        while self._calls and self._calls[0][0] + self.BUCKET <= now - self.WINDOW:
+            self._used -= self._calls.popleft()[1]
+
+    def _quota_left(self, cls: int):
+        if self.daily_quota is None:
+            return None
+        limit = self.daily_quota if cls == INTERACTIVE else int(self.daily_quota * (1 - self.quota_reserve))
+        return limit - self._used
+
+    def _count(self, now):
+        bucket = now - now % self.BUCKET
+        if self._calls and self._calls[-1][0] == bucket:
+            self._calls[-1][1] += 1
+        else:
+            self._calls.append([bucket, 1])
+        self._used += 1
+
+    def _try(self, cls: int):
+        """
+        Takes a token if one is available to the priority class. Must be called holding the lock.
+
+        :return: 0 if a token was taken, otherwise the number of seconds to wait before trying again
+        """
+        now = self.clock()
+        self._refill(now)
+        self._expire(now)
+
+        quota_left = self._quota_left(cls)
+        if quota_left is not None and quota_left <= 0:
+            self.rejected += 1
+            raise errors.QuotaExceededError(self.daily_quota)
+
+        pre_empted = any(self._waiting[c] for c in PRIORITY_NAMES if c < cls)
+        # Allow for rounding errors in the refill, or a waiter could be told to sleep for a vanishing interval forever.
+        if self.tokens >= 1 - 1e-9 and not pre_empted:
+            self.tokens = max(0.0, self.tokens - 1)
+            self.granted[cls] += 1
+            if self.daily_quota is not None:
+                self._count(now)
+            return 0.0
+
+        return max((1 - self.tokens) / self.rate, 1 / self.rate if pre_empted else 0.0)
+
+    def try_acquire(self, cls: int=NORMAL):
+        """
+        Takes a token without waiting.
+
+        :param cls: priority class
+        :return: 0 if a token was taken, otherwise the number of seconds to wait before trying again
+        :raise errors.QuotaExceededError: if the daily quota is used up
+        """
+        with self._lock:
+            return self._try(cls)
+
+    def _begin(self, cls: int):
+        with self._lock:
+            delay = self._try(cls)
+            if delay:
+                self._waiting[cls] += 1
+                self.delayed[cls] += 1
+            return delay
+
+    def _retry(self, cls: int, waited: float):
+        with self._lock:
+            self.wait_time += waited
+            try:
+                delay = self._try(cls)
+            except BaseException:
+                self._waiting[cls] -= 1
+                raise
+            if not delay:
+                self._waiting[cls] -= 1
+            return delay
+
+    def _abandon(self, cls: int):
+        with self._lock:
+            self._waiting[cls] -= 1
+
+    def acquire(self, cls: int=NORMAL):
+        """
+        Takes a token, waiting for one if necessary.
+
+        :param cls: priority class
+        :return: void
+        :raise errors.QuotaExceededError: if the daily quota is used up
+        """
+        delay = self._begin(cls)
+        while delay:
+            try:
+                self.sleep(delay)
+            except BaseException:
+                self._abandon(cls)
+                raise
+            delay = self._retry(cls, delay)
+
+    async def acquire_async(self, cls: int=NORMAL):
+        """
+        Takes a token, waiting on the event loop for one if necessary.
+
+        :param cls: priority class
+        :return: void
+        :raise errors.QuotaExceededError: if the daily quota is used up
+        """
+        delay = self._begin(cls)
+        while delay:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                self._abandon(cls)
+                raise
+            delay = self._retry(cls, delay)
+
+    def remaining(self):
+        """
+        Returns the number of calls left in the rolling daily quota.
+
+        :return: number of calls, or None if there is no quota
+        """
+        with self._lock:
+            self._expire(self.clock())
+            return self._quota_left(INTERACTIVE)
+
+    def stats(self):
+        """
+        Returns the limiter's state and counters.
+
+        :return: dict of metrics
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self._expire(now)
+            return {"tokens": self.tokens,
+                    "rate": self.rate,
+                    "burst": self.burst,
+                    "daily_quota": self.daily_quota,
+                    "used_today": self._used,
+                    "remaining_today": self._quota_left(INTERACTIVE),
+                    "granted": {PRIORITY_NAMES[c]: n for c, n in self.granted.items()},
+                    "delayed": {PRIORITY_NAMES[c]: n for c, n in self.delayed.items()},
+                    "waiting": {PRIORITY_NAMES[c]: n for c, n in self._waiting.items()},
+                    "rejected": self.rejected,
+                    "wait_time": self.wait_time}
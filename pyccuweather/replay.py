@@ -0,0 +1,271 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+replay.py
+Recording of API responses to disk, and replaying them without network access
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlsplit, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from pyccuweather import errors
+from pyccuweather.retry import RETRYABLE_STATUS
+from pyccuweather.transport import SessionPool
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    recorded REAL NOT NULL
+);
+"""
+
+# Headers describing the transfer rather than the response; bodies are stored decoded, so they do not apply on replay.
+_TRANSFER_HEADERS = frozenset(["connection", "content-encoding", "content-length", "date", "keep-alive",
+                               "transfer-encoding"])
+
+
+def recording_key(url: str, params: dict):
+    """
+    Builds the key a response is recorded under: the URL path plus the sorted query parameters. The host and the API
+    key are left out, so recordings replay against any API root and with any API key.
+
+    :param url: URL
+    :param params: query parameters
+    :return: key
+    """
+    query = urlencode(sorted((k, str(v)) for k, v in (params or {}).items() if k != "apikey"))
+    return urlsplit(url).path + ("?" + query if query else "")
+
+
+class Recording(object):
+    """
+    A persistent SQLite store of recorded responses, keyed by recording_key(). Bodies are stored zlib-compressed. On
+    construction, the whole recording is loaded into memory, so replaying never touches the disk; new responses are
+    written through.
+
+    :param path: path of the SQLite database; ":memory:" for a transient recording
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._responses = {key: (status, json.loads(headers), zlib.decompress(body))
+                           for key, status, headers, body
+                           in self._db.execute("SELECT key, status, headers, body FROM responses")}
+
+    def __len__(self):
+        return len(self._responses)
+
+    def __contains__(self, key):
+        return key in self._responses
+
+    def __str__(self):
+        return u"<Recording {0:s} ({1:d} responses)>".format(self.path, len(self))
+
+    __repr__ = __str__
+
+    def get(self, url: str, params: dict=None):
+        """
+        Looks up a recorded response.
+
+        :param url: URL
+        :param params: query parameters
+        :return: tuple of (status, headers, body as bytes), or None if the request was not recorded
+        """
+        return self._responses.get(recording_key(url, params))
+
+    def put(self, url: str, params: dict, status: int, headers, content: bytes):
+        """
+        Records a response, replacing any recorded earlier for the same request.
+
+        :param url: URL
+        :param params: query parameters
+        :param status: HTTP status code
+        :param headers: response headers
+        :param content: response body
+        :return: void
+        """
+        key = recording_key(url, params)
+        headers = {k: v for k, v in headers.items() if k.lower() not in _TRANSFER_HEADERS}
+        with self._lock:
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                                 (key, status, json.dumps(headers), zlib.compress(content), time.time()))
+            self._responses[key] = (status, headers, content)
+
+    def close(self):
+        """
+        Closes the database.
+
+        :return: void
+        """
+        with self._lock:
+            self._db.close()
+
+
+def _recording(recording):
+    return (Recording(recording), True) if isinstance(recording, str) else (recording, False)
+
+
+class RecordingTransport(object):
+    """
+    A transport performing requests over HTTP and recording their responses. Transient failures (throttling and 5xx
+    responses) are not recorded, so that replays do not repeat them.
+
+    :param recording: a Recording, or the path of one
+    :param transport: transport performing the requests; a new transport.SessionPool if None
+    """
+
+    def __init__(self, recording, transport=None):
+        self.recording, self._owns_recording = _recording(recording)
+        self.transport = transport if transport is not None else SessionPool()
+
+    def __str__(self):
+        return u"<Recording transport to {0}>".format(self.recording)
+
+    __repr__ = __str__
+
+    def get(self, url: str, params: dict=None, timeout=None):
+        """
+        Performs a GET request and records the response.
+
+        :param url: URL
+        :param params: query parameters
+        :param timeout: timeout in seconds
+        :return: requests.Response object
+        """
+        resp = self.transport.get(url, params=params, timeout=timeout)
+        if resp.status_code not in RETRYABLE_STATUS:
+            self.recording.put(url, params, resp.status_code, resp.headers, resp.content)
+        return resp
+
+    def close(self):
+        """
+        Closes the underlying transport, and the recording if it was opened from a path.
+
+        :return: void
+        """
+        self.transport.close()
+        if self._owns_recording:
+            self.recording.close()
+
+
+class ReplayTransport(object):
+    """
+    A transport answering requests from a Recording, without network access. Optionally, latency and failures are
+    injected, so that load tests see realistic timings and exercise the retry and circuit breaker logic.
+
+    :param recording: a Recording, or the path of one
+    :param latency: delay added to every request, in seconds, or a callable without arguments returning it
+    :param error_rate: fraction of requests answered with error_status instead of the recorded response
+    :param error_status: HTTP status of injected failures
+    :param seed: seed of the random numbers deciding which requests fail
+    """
+
+    def __init__(self, recording, latency=0.0, error_rate: float=0.0, error_status: int=503, seed=None):
+        assert 0 <= error_rate <= 1
+        self.recording, self._owns_recording = _recording(recording)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hits = 0
+        self.injected = 0
+        self._random = random.Random(seed)
+
+    def __str__(self):
+        return u"<Replay transport from {0}>".format(self.recording)
+
+    __repr__ = __str__
+
+    def _delay(self):
+        return self.latency() if callable(self.latency) else self.latency
+
+    def _respond(self, url: str, params: dict):
+        """
+        Builds the response to a request: the recorded one, or an injected failure.
+        """
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.injected += 1
+            status, headers, content = self.error_status, {"Content-Type": "application/json"}, \
+                b'{"Message": "Injected failure"}'
+        else:
+            recorded = self.recording.get(url, params)
+            if recorded is None:
+                raise errors.NotRecordedError(recording_key(url, params))
+            self.hits += 1
+            status, headers, content = recorded
+
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers = CaseInsensitiveDict(headers)
+        resp._content = content
+        resp.url = url
+        return resp
+
+    def get(self, url: str, params: dict=None, timeout=None):
+        """
+        Answers a GET request from the recording.
+
+        :param url: URL
+        :param params: query parameters
+        :param timeout: ignored
+        :return: requests.Response object
+        :raise errors.NotRecordedError: if the request was not recorded
+        """
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._respond(url, params)
+
+    async def get_async(self, url: str, params: dict=None, timeout=None):
+        """
+        Answers a GET request from the recording, for an AsyncConnection.
+
+        :param url: URL
+        :param params: query parameters
+        :param timeout: ignored
+        :return: requests.Response object
+        :raise errors.NotRecordedError: if the request was not recorded
+        """
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(url, params)
+
+    def stats(self):
+        """
+        Returns the number of requests answered from the recording, and of injected failures.
+
+        :return: dict of metrics
+        """
+        return {"responses": len(self.recording), "hits": self.hits, "injected": self.injected}
+
+    def close(self):
+        """
+        Closes the recording if it was opened from a path.
+
+        :return: void
+        """
+        if self._owns_recording:
+            self.recording.close()
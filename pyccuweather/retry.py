@@ -0,0 +1,234 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+retry.py
+Retries with backoff, and per-endpoint circuit breakers
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from pyccuweather import errors
+
+# HTTP status codes worth retrying: throttling and transient server-side failures.
+RETRYABLE_STATUS = frozenset([429, 500, 502, 503, 504])
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+def parse_retry_after(value, now=None):
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+    :param value: header value
+    :param now: current time as an aware datetime, defaults to the current UTC time
+    :return: delay in seconds, or None if the header is absent or malformed
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class RetryPolicy(object):
+    """
+    Exponential backoff with full jitter for retrying idempotent requests.
+
+    The n-th retry (counting from 0) waits a random time between 0 and min(max_backoff, backoff * 2 ** n) seconds.
+    A Retry-After header sent by the server is honoured instead, up to max_retry_after seconds.
+
+    :param retries: maximum number of retries after the first attempt
+    :param backoff: base delay in seconds
+    :param max_backoff: maximum delay in seconds
+    :param max_retry_after: maximum delay honoured from a Retry-After header, in seconds
+    :param jitter: whether to randomise delays
+    :param random: random number source returning floats in [0, 1)
+    """
+
+    def __init__(self,
+                 retries: int=3,
+                 backoff: float=0.5,
+                 max_backoff: float=30.0,
+                 max_retry_after: float=120.0,
+                 jitter: bool=True,
+                 random=random.random):
+        assert retries >= 0
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.jitter = jitter
+        self.random = random
+
+    def __str__(self):
+        return u"<Retry policy: {0:d} retries, {1:.2f}s backoff>".format(self.retries, self.backoff)
+
+    __repr__ = __str__
+
+    def delay(self, attempt: int, retry_after: float=None):
+        """
+        Returns the time to wait before a retry.
+
+        :param attempt: number of the retry, counting from 0
+        :param retry_after: delay requested by the server in seconds, if any
+        :return: delay in seconds
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        ceiling = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return ceiling * self.random() if self.jitter else ceiling
+
+
+class CircuitBreaker(object):
+    """
+    A circuit breaker for one endpoint.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls fail fast with errors.CircuitOpenError.
+    Once `reset_timeout` seconds have passed, a single probe call is let through (half-open): if it succeeds the
+    circuit closes, if it fails the circuit opens again.
+
+    :param name: endpoint name
+    :param failure_threshold: number of consecutive failures opening the circuit
+    :param reset_timeout: seconds before an open circuit lets a probe through
+    :param clock: monotonic time source, in seconds
+    """
+
+    def __init__(self, name: str, failure_threshold: int=5, reset_timeout: float=30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return u"<Circuit breaker for {0:s}: {1:s}>".format(self.name, self.state)
+
+    __repr__ = __str__
+
+    def allow(self):
+        """
+        Admits a call, or fails fast if the circuit is open.
+
+        :return: void
+        :raise errors.CircuitOpenError: if the circuit is open, or half-open with a probe already in flight
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN:
+                remaining = self.opened_at + self.reset_timeout - self.clock()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise errors.CircuitOpenError(self.name, remaining)
+                self.state = HALF_OPEN
+            if self._probing:
+                self.rejected += 1
+                raise errors.CircuitOpenError(self.name, 0.0)
+            self._probing = True
+
+    def success(self):
+        """
+        Records a successful call, closing the circuit.
+
+        :return: void
+        """
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def failure(self):
+        """
+        Records a failed call, opening the circuit if the threshold is reached or a probe failed.
+
+        :return: void
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = self.clock()
+            self._probing = False
+
+    def release(self):
+        """
+        Ends a call that neither succeeded nor failed, e.g. because it was interrupted or raised an error unrelated to
+        the endpoint's health. A half-open circuit then lets another probe through.
+
+        :return: void
+        """
+        with self._lock:
+            self._probing = False
+
+    def snapshot(self):
+        """
+        Returns the state of the circuit.
+
+        :return: dict
+        """
+        with self._lock:
+            return {"state": self.state,
+                    "failures": self.failures,
+                    "rejected": self.rejected}
+
+
+class CircuitBreakers(object):
+    """
+    A registry of circuit breakers, one per endpoint, created on first use.
+
+    :param failure_threshold: number of consecutive failures opening a circuit
+    :param reset_timeout: seconds before an open circuit lets a probe through
+    :param clock: monotonic time source, in seconds
+    """
+
+    def __init__(self, failure_threshold: int=5, reset_timeout: float=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str):
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    breaker = self._breakers[name] = CircuitBreaker(name,
+                                                                    failure_threshold=self.failure_threshold,
+                                                                    reset_timeout=self.reset_timeout,
+                                                                    clock=self.clock)
+        return breaker
+
+    def states(self):
+        """
+        Returns the state of every circuit.
+
+        :return: dict of endpoint name -> circuit state
+        """
+        return {name: breaker.snapshot() for name, breaker in list(self._breakers.items())}
@@ -0,0 +1,144 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+singleflight.py
+Coalescing of concurrent identical calls
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import asyncio
+import threading
+from functools import partial
+
+
+def flight_key(url: str, params: dict, parser=None):
+    """
+    Builds the key identifying identical requests: the resolved URL plus its query parameters, and the parser of the
+    response, as calls parsing the same response differently cannot share a result. Parsers made by functools.partial
+    are the same if their function and keyword arguments are, so e.g. two forecasts with the same raw policy coalesce.
+
+    :param url: URL
+    :param params: query parameters
+    :param parser: callable turning the decoded JSON into the result, or None
+    :return: hashable key
+    """
+    if isinstance(parser, partial):
+        parser = parser.func, parser.args, tuple(sorted(parser.keywords.items()))
+    return url, tuple(sorted((k, str(v)) for k, v in params.items())), parser
+
+
+# Outcome of an asynchronous call whose caller was cancelled before it completed.
+_ABANDONED = object()
+
+
+class _Flight(object):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Makes concurrent callers of the same key share a single execution: the first caller runs the call, and everyone
+    arriving while it is in flight waits for it and receives the same result (or the same error).
+    Works for threads through do() and for coroutines on an event loop through do_async().
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._async_flights = {}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return u"<Single-flight group: {0:d} executed, {1:d} coalesced>".format(self.executed, self.coalesced)
+
+    __repr__ = __str__
+
+    def do(self, key, fn):
+        """
+        Calls fn, unless a call for the same key is already in flight, in which case its outcome is shared.
+
+        :param key: hashable key
+        :param fn: callable without arguments
+        :return: the result of fn
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.executed += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def do_async(self, key, coro_fn):
+        """
+        Awaits coro_fn, unless a call for the same key is already in flight on the event loop, in which case its
+        outcome is shared. If the caller running the call is cancelled, the next waiter runs it instead.
+
+        :param key: hashable key
+        :param coro_fn: coroutine function without arguments
+        :return: the result of coro_fn
+        """
+        future = self._async_flights.get(key)
+        while future is not None:
+            self.coalesced += 1
+            result = await asyncio.shield(future)
+            if result is not _ABANDONED:
+                return result
+            future = self._async_flights.get(key)
+
+        future = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        self.executed += 1
+        try:
+            result = await coro_fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # Only this caller was cancelled: its waiters retry, one of them running the call.
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the error as retrieved - the caller gets it regardless of whether anyone else was waiting.
+            future.exception()
+            raise
+        finally:
+            del self._async_flights[key]
+
+    def stats(self):
+        """
+        Returns the single-flight counters.
+
+        :return: dict of counters
+        """
+        return {"in_flight": len(self._flights) + len(self._async_flights),
+                "executed": self.executed,
+                "coalesced": self.coalesced}
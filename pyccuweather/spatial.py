@@ -0,0 +1,135 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+spatial.py
+Nearest-neighbour index over resolved locations
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import threading
+from math import radians, sin, cos, asin, sqrt, floor, ceil
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float):
+    """
+    Great circle distance between two points.
+
+    :return: distance in km
+    """
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+class GeoIndex(object):
+    """
+    A grid index of known points, each mapped to the location it resolved to, answering geoposition lookups within a
+    snap radius without an API call.
+
+    Points are bucketed into grid cells one snap radius high, and at most as wide in longitude, so a lookup only
+    examines the surrounding cells. Columns of cells wrap around at the antimeridian.
+    Both the coordinates of resolved locations and the query points that resolved to them are indexed.
+
+    :param radius_km: snap radius in km - a query resolves to the location of the nearest known point within it
+    """
+
+    def __init__(self, radius_km: float=1.0):
+        assert radius_km > 0
+        self.radius_km = radius_km
+        self.cell = radius_km / KM_PER_DEGREE
+        # Whole number of columns around the globe, so the last column borders the first.
+        self._columns = int(ceil(360 / self.cell))
+        self._column_width = 360.0 / self._columns
+        self.hits = 0
+        self.misses = 0
+        self._cells = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def __str__(self):
+        return u"<Geo index: {0:d} points, {1:.2f} km snap radius>".format(self._size, self.radius_km)
+
+    __repr__ = __str__
+
+    def _cell_of(self, lat: float, lon: float):
+        return int(floor(lat / self.cell)), int(floor((lon + 180) / self._column_width)) % self._columns
+
+    def add(self, lat: float, lon: float, payload: dict):
+        """
+        Adds a point resolving to a location.
+
+        :param lat: latitude
+        :param lon: longitude
+        :param payload: location JSON
+        :return: void
+        """
+        lat, lon = float(lat), float(lon)
+        with self._lock:
+            points = self._cells.setdefault(self._cell_of(lat, lon), {})
+            if (lat, lon) not in points:
+                self._size += 1
+            points[(lat, lon)] = payload
+
+    def add_location(self, payload: dict):
+        """
+        Adds a location by its own coordinates.
+
+        :param payload: location JSON
+        :return: void
+        """
+        position = payload.get("GeoPosition")
+        if position:
+            self.add(position["Latitude"], position["Longitude"], payload)
+
+    def nearest(self, lat: float, lon: float):
+        """
+        Finds the location of the nearest known point within the snap radius.
+
+        :param lat: latitude
+        :param lon: longitude
+        :return: location JSON, or None if no point is within the snap radius
+        """
+        lat, lon = float(lat), float(lon)
+        row, col = self._cell_of(lat, lon)
+        # Cells are narrower in km away from the equator, so more of them are needed to cover the radius.
+        span = ceil(1 / max(cos(radians(min(abs(lat) + self.cell, 90.0))), 1e-6))
+        columns = {c % self._columns for c in range(col - span, col + span + 1)}
+
+        best, best_distance = None, self.radius_km
+        with self._lock:
+            for r in (row - 1, row, row + 1):
+                for c in columns:
+                    points = self._cells.get((r, c))
+                    if not points:
+                        continue
+                    for (plat, plon), payload in points.items():
+                        distance = haversine(lat, lon, plat, plon)
+                        if distance <= best_distance:
+                            best, best_distance = payload, distance
+
+        if best is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return best
+
+    def stats(self):
+        """
+        Returns the index counters.
+
+        :return: dict of counters
+        """
+        return {"points": self._size,
+                "hits": self.hits,
+                "misses": self.misses}
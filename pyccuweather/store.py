@@ -0,0 +1,236 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+store.py
+Persistent on-disk store of resolved locations
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS locations (
+    lkey TEXT PRIMARY KEY,
+    lat REAL,
+    lon REAL,
+    payload TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS locations_latlon ON locations (lat, lon);
+CREATE TABLE IF NOT EXISTS location_queries (
+    kind TEXT NOT NULL,
+    query TEXT NOT NULL,
+    lkey TEXT NOT NULL,
+    PRIMARY KEY (kind, query)
+);
+"""
+
+
+class LocationStore(object):
+    """
+    A persistent SQLite store (in WAL mode) of resolved locations, surviving restarts.
+
+    Locations are stored by location key, and the postcode, IP address and geoposition queries that resolved to them
+    are indexed, the latter by latitude and longitude rounded to `precision` decimals. On construction, the whole store
+    is warm-loaded into memory, so lookups never touch the disk; new resolutions are written through.
+
+    :param path: path of the SQLite database; ":memory:" for a transient store
+    :param precision: number of decimals latitudes and longitudes are rounded to
+    :param warm: whether to load the store into memory on construction
+    """
+
+    def __init__(self, path: str, precision: int=3, warm: bool=True):
+        self.path = path
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._locations = None
+        self._queries = None
+        if warm:
+            self.warm()
+
+    def __len__(self):
+        if self._locations is not None:
+            return len(self._locations)
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM locations").fetchone()[0]
+
+    def __str__(self):
+        return u"<Location store {0:s} ({1:d} locations)>".format(self.path, len(self))
+
+    __repr__ = __str__
+
+    def warm(self):
+        """
+        Loads every stored location and query into memory.
+
+        :return: number of locations loaded
+        """
+        with self._lock:
+            locations = {lkey: json.loads(payload)
+                         for lkey, payload in self._db.execute("SELECT lkey, payload FROM locations")}
+            queries = {(kind, query): lkey
+                       for kind, query, lkey in self._db.execute("SELECT kind, query, lkey FROM location_queries")}
+            self._locations, self._queries = locations, queries
+        return len(locations)
+
+    def close(self):
+        """
+        Closes the database.
+
+        :return: void
+        """
+        with self._lock:
+            self._db.close()
+
+    def _round(self, lat, lon):
+        return u"{0:.{2:d}f},{1:.{2:d}f}".format(float(lat), float(lon), self.precision)
+
+    def _query(self, fkeyid: str, url_kwargs: dict, params: dict):
+        """
+        Maps a location resolver request to the (kind, query) pair it is indexed under.
+        """
+        if fkeyid == "loc_postcode":
+            return "postcode", u"{0:s}:{1}".format(url_kwargs["country_code"].upper(), params["q"])
+        if fkeyid == "loc_ip_address":
+            return "ip", str(params["q"])
+        if fkeyid == "loc_geoposition":
+            lat, lon = str(params["q"]).split(",")
+            return "geo", self._round(lat, lon)
+        return None
+
+    def get(self, lkey):
+        """
+        Retrieves a stored location by location key.
+
+        :param lkey: Accuweather location key
+        :return: location JSON, or None if the location is not stored
+        """
+        lkey = str(lkey)
+        if self._locations is not None:
+            return self._locations.get(lkey)
+        with self._lock:
+            row = self._db.execute("SELECT payload FROM locations WHERE lkey = ?", (lkey,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _resolve(self, kind: str, query: str):
+        if self._queries is not None:
+            lkey = self._queries.get((kind, query))
+        else:
+            with self._lock:
+                row = self._db.execute("SELECT lkey FROM location_queries WHERE kind = ? AND query = ?",
+                                       (kind, query)).fetchone()
+            lkey = row[0] if row else None
+        return None if lkey is None else self.get(lkey)
+
+    def geopositions(self):
+        """
+        Lists the coordinates of stored locations, and the geoposition queries resolving to them.
+
+        :return: list of (latitude, longitude, location JSON) tuples
+        """
+        if self._locations is None:
+            self.warm()
+
+        points = []
+        for payload in self._locations.values():
+            position = payload.get("GeoPosition")
+            if position:
+                points.append((position["Latitude"], position["Longitude"], payload))
+        for (kind, query), lkey in self._queries.items():
+            if kind == "geo" and lkey in self._locations:
+                lat, lon = query.split(",")
+                points.append((float(lat), float(lon), self._locations[lkey]))
+        return points
+
+    def lookup(self, fkeyid: str, url_kwargs: dict, params: dict):
+        """
+        Answers a location resolver request from the store.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param url_kwargs: endpoint formatting arguments
+        :param params: query parameters
+        :return: location JSON, or None if the request cannot be answered
+        """
+        if fkeyid == "loc_lkey":
+            payload = self.get(url_kwargs["location_key"])
+        else:
+            query = self._query(fkeyid, url_kwargs, params)
+            if query is None:
+                return None
+            payload = self._resolve(*query)
+
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return payload
+
+    def put(self, payload: dict, queries=()):
+        """
+        Stores a location, and the queries resolving to it.
+
+        :param payload: location JSON
+        :param queries: iterable of (kind, query) pairs resolving to the location
+        :return: void
+        """
+        lkey = str(payload["Key"])
+        position = payload.get("GeoPosition") or {}
+        queries = list(queries)
+        with self._lock:
+            with self._db:
+                self._db.execute("INSERT OR REPLACE INTO locations VALUES (?, ?, ?, ?, ?)",
+                                 (lkey, position.get("Latitude"), position.get("Longitude"),
+                                  json.dumps(payload), time.time()))
+                self._db.executemany("INSERT OR REPLACE INTO location_queries VALUES (?, ?, ?)",
+                                     [(kind, query, lkey) for kind, query in queries])
+            if self._locations is not None:
+                self._locations[lkey] = payload
+                for query in queries:
+                    self._queries[query] = lkey
+
+    def record(self, fkeyid: str, url_kwargs: dict, params: dict, payload):
+        """
+        Stores the response of a location resolver request.
+
+        :param fkeyid: endpoint name (key of froots.FROOTS)
+        :param url_kwargs: endpoint formatting arguments
+        :param params: query parameters
+        :param payload: decoded response
+        :return: void
+        """
+        if not fkeyid.startswith("loc_"):
+            return
+        if isinstance(payload, list):
+            if fkeyid in ("loc_search", "loc_search_country"):
+                for each in payload:
+                    self.put(each)
+                return
+            payload = payload[0] if payload else None
+        if not isinstance(payload, dict) or "Key" not in payload:
+            return
+
+        query = self._query(fkeyid, url_kwargs, params)
+        self.put(payload, [query] if query is not None else ())
+
+    def stats(self):
+        """
+        Returns the store counters.
+
+        :return: dict of counters
+        """
+        return {"locations": len(self),
+                "hits": self.hits,
+                "misses": self.misses}
@@ -0,0 +1,182 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+timeindex.py
+Timestamp parsing, and epoch-based lookups over forecast and observation series
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import numbers
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def parse_iso(value: str):
+    """
+    Parses an ISO 8601 timestamp, as found in the DateTime, Date and LocalObservationDateTime fields. Results are
+    cached, so a series' recurring timestamps are only parsed once.
+
+    :param value: timestamp, e.g. "2015-06-01T09:00:00+01:00"
+    :return: timezone-aware datetime; timestamps without an offset are taken to be UTC
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def to_epoch(t):
+    """
+    Converts a point in time to seconds since the epoch.
+
+    :param t: seconds since the epoch, a datetime (naive datetimes are taken to be UTC) or an ISO 8601 timestamp
+    :return: seconds since the epoch
+    """
+    if isinstance(t, numbers.Real):
+        return t
+    if isinstance(t, str):
+        t = parse_iso(t)
+    if isinstance(t, datetime):
+        return (t if t.tzinfo is not None else t.replace(tzinfo=timezone.utc)).timestamp()
+    raise TypeError(u"Cannot interpret {0!r} as a point in time".format(t))
+
+
+class EpochIndex(object):
+    """
+    A sorted index of keys by epoch time, answering point and range lookups in O(log n).
+
+    :param epochs: times of the entries, in seconds since the epoch
+    :param keys: keys of the entries, in the same order as epochs
+    """
+    def __init__(self, epochs, keys):
+        epochs, keys = list(epochs), list(keys)
+        assert len(epochs) == len(keys)
+        if any(a > b for a, b in zip(epochs, epochs[1:])):
+            order = sorted(range(len(epochs)), key=epochs.__getitem__)
+            epochs, keys = [epochs[i] for i in order], [keys[i] for i in order]
+        self.epochs = epochs
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __str__(self):
+        if not self.epochs:
+            return u"<Epoch index (empty)>"
+        return u"<Epoch index of {0:d} entries from {1} to {2}>".format(len(self), self.epochs[0], self.epochs[-1])
+
+    __repr__ = __str__
+
+    def at_or_before(self, t):
+        """
+        Finds the last entry at or before a point in time, i.e. the entry valid at that time.
+
+        :param t: point in time, see to_epoch()
+        :return: key, or None if every entry is later
+        """
+        i = bisect_right(self.epochs, to_epoch(t))
+        return self.keys[i - 1] if i else None
+
+    def nearest(self, t):
+        """
+        Finds the entry closest to a point in time; ties go to the earlier entry.
+
+        :param t: point in time, see to_epoch()
+        :return: key, or None if the index is empty
+        """
+        if not self.epochs:
+            return None
+        t = to_epoch(t)
+        i = bisect_left(self.epochs, t)
+        if i == len(self.epochs):
+            return self.keys[-1]
+        if i and t - self.epochs[i - 1] <= self.epochs[i] - t:
+            return self.keys[i - 1]
+        return self.keys[i]
+
+    def between(self, start=None, end=None):
+        """
+        Finds the entries from start (inclusive) to end (exclusive).
+
+        :param start: point in time, see to_epoch(), or None for no lower bound
+        :param end: point in time, see to_epoch(), or None for no upper bound
+        :return: list of keys, in time order
+        """
+        lo = bisect_left(self.epochs, to_epoch(start)) if start is not None else 0
+        hi = bisect_left(self.epochs, to_epoch(end)) if end is not None else len(self.epochs)
+        return self.keys[lo:hi]
+
+
+class TimeIndexed(ABC):
+    """
+    Time lookups for series keyed by timestamp strings. Subclasses implement _time_index(json), returning the epoch
+    times and keys of the entries in their JSON, and _entries(), returning the mapping of key -> entry. The index is
+    built on first use from the epoch fields of the JSON in `raw`, so lazy series are not materialised by it; series
+    not retaining their JSON build it up front.
+    """
+
+    _index = None
+
+    @abstractmethod
+    def _time_index(self, json):
+        """
+        Returns the epoch times and keys of the entries in the series' JSON.
+
+        :param json: decoded JSON of the series
+        :return: tuple of (list of epoch times, list of keys)
+        """
+
+    @abstractmethod
+    def _entries(self):
+        """
+        Returns the entries of the series.
+
+        :return: mapping of key -> entry
+        """
+
+    @property
+    def index(self):
+        """
+        The series' EpochIndex.
+        """
+        if self._index is None:
+            self._index = EpochIndex(*self._time_index(self.raw))
+        return self._index
+
+    def at(self, t):
+        """
+        Returns the entry valid at a point in time: the last one at or before it.
+
+        :param t: seconds since the epoch, datetime or ISO 8601 timestamp
+        :return: entry, or None if every entry is later
+        """
+        key = self.index.at_or_before(t)
+        return self._entries()[key] if key is not None else None
+
+    def nearest(self, t):
+        """
+        Returns the entry closest to a point in time.
+
+        :param t: seconds since the epoch, datetime or ISO 8601 timestamp
+        :return: entry, or None if the series is empty
+        """
+        key = self.index.nearest(t)
+        return self._entries()[key] if key is not None else None
+
+    def between(self, start=None, end=None):
+        """
+        Returns the entries from start (inclusive) to end (exclusive).
+
+        :param start: seconds since the epoch, datetime or ISO 8601 timestamp, or None for no lower bound
+        :param end: seconds since the epoch, datetime or ISO 8601 timestamp, or None for no upper bound
+        :return: list of entries, in time order
+        """
+        entries = self._entries()
+        return [entries[key] for key in self.index.between(start, end)]
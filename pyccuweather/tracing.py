@@ -0,0 +1,250 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+tracing.py
+Spans around the phases of Connection calls, reported to pluggable hooks
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+# Span names: a whole call, and its phases - URL resolution, the HTTP round trip (including retries), decoding the
+# body, and constructing the result objects.
+SPANS = ("call", "route", "http", "decode", "parse")
+
+
+class Span(object):
+    """
+    A timed phase of a call. Child spans inherit the attributes of their parent, such as the endpoint name and the
+    location key.
+
+    :param name: span name, one of SPANS
+    :param parent: parent span, or None for a call
+    :param attributes: dict of attributes
+    """
+    __slots__ = ("name", "parent", "attributes", "children", "start", "end", "error", "context")
+
+    def __init__(self, name: str, parent=None, attributes: dict=None):
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes if attributes is not None else {}
+        self.children = []
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+        # Free for the use of hooks, e.g. to hold the span of an external tracer.
+        self.context = None
+
+    def __str__(self):
+        return u"<Span {0:s} ({1})>".format(self.name, self.attributes.get("endpoint"))
+
+    __repr__ = __str__
+
+    @property
+    def duration(self):
+        """
+        Duration of the span in seconds, or None while it is open.
+        """
+        return None if self.end is None else self.end - self.start
+
+    def breakdown(self):
+        """
+        Sums the durations of the span's children by name.
+
+        :return: dict of span name -> seconds
+        """
+        result = {}
+        for child in self.children:
+            if child.end is not None:
+                result[child.name] = result.get(child.name, 0) + child.duration
+        return result
+
+
+class Hook(object):
+    """
+    Base class of tracing hooks. start() is called when a span opens and end() when it closes, with its attributes,
+    duration and error (if any) filled in. Hooks are called on the thread or event loop making the call, so they
+    should be quick.
+
+    An OpenTelemetry bridge, for instance, would start a span of its own in start(), keep it in span.context, and set
+    its attributes and end it in end().
+    """
+
+    def start(self, span: Span):
+        pass
+
+    def end(self, span: Span):
+        pass
+
+
+def describe_response(resp):
+    """
+    Describes the response of an http span.
+
+    :param resp: response
+    :return: dict of attributes: the HTTP status and the size of the body
+    """
+    return {"status": resp.status_code, "bytes": len(resp.content)}
+
+
+def describe_model(result):
+    """
+    Describes the result of a parse span.
+
+    :param result: parsed object
+    :return: dict of attributes: the class name of the object
+    """
+    return {"model": type(result).__name__}
+
+
+class Tracer(object):
+    """
+    Opens and closes spans, reporting them to a list of hooks.
+
+    :param hooks: iterable of Hook objects
+    """
+
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+
+    def __str__(self):
+        return u"<Tracer ({0:d} hooks)>".format(len(self.hooks))
+
+    __repr__ = __str__
+
+    def start(self, name: str, parent: Span=None, **attributes):
+        """
+        Opens a span.
+
+        :param name: span name, one of SPANS
+        :param parent: parent span, or None for a call
+        :param attributes: span attributes
+        :return: Span object
+        """
+        if parent is not None:
+            attributes = dict(parent.attributes, **attributes)
+        span = Span(name, parent, attributes)
+        if parent is not None:
+            parent.children.append(span)
+        for hook in self.hooks:
+            hook.start(span)
+        return span
+
+    def end(self, span: Span, error: BaseException=None, **attributes):
+        """
+        Closes a span.
+
+        :param span: span
+        :param error: exception the phase raised, if any
+        :param attributes: attributes to add to the span
+        :return: void
+        """
+        span.end = time.perf_counter()
+        span.error = error
+        if attributes:
+            span.attributes.update(attributes)
+        for hook in reversed(self.hooks):
+            hook.end(span)
+
+    def run(self, name: str, parent: Span, fn, *args, describe=None, **attributes):
+        """
+        Calls fn(*args) in a span.
+
+        :param name: span name, one of SPANS
+        :param parent: parent span
+        :param fn: callable
+        :param describe: callable returning a dict of attributes describing the result, if any
+        :param attributes: span attributes
+        :return: result of fn
+        """
+        span = self.start(name, parent, **attributes)
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self.end(span, e)
+            raise
+        self.end(span, **(describe(result) if describe is not None else {}))
+        return result
+
+    async def run_async(self, name: str, parent: Span, coro_fn, *args, describe=None, **attributes):
+        """
+        Awaits coro_fn(*args) in a span.
+
+        :param name: span name, one of SPANS
+        :param parent: parent span
+        :param coro_fn: coroutine function
+        :param describe: callable returning a dict of attributes describing the result, if any
+        :param attributes: span attributes
+        :return: result of coro_fn
+        """
+        span = self.start(name, parent, **attributes)
+        try:
+            result = await coro_fn(*args)
+        except BaseException as e:
+            self.end(span, e)
+            raise
+        self.end(span, **(describe(result) if describe is not None else {}))
+        return result
+
+
+class Profiler(Hook):
+    """
+    An in-process profiler: sums the time spent in each phase, by endpoint, and keeps the slowest calls with their
+    breakdown into phases, to find tail latency culprits.
+
+    :param keep: number of slowest calls to keep
+    """
+
+    def __init__(self, keep: int=10):
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._totals = {}
+        self._slowest = []
+        self._order = itertools.count()
+
+    def __str__(self):
+        return u"<Profiler ({0:d} calls)>".format(sum(calls for (_, name), (calls, _) in self._totals.items()
+                                                      if name == "call"))
+
+    __repr__ = __str__
+
+    def end(self, span: Span):
+        key = (span.attributes.get("endpoint"), span.name)
+        with self._lock:
+            calls, seconds = self._totals.get(key, (0, 0))
+            self._totals[key] = (calls + 1, seconds + span.duration)
+            if span.name == "call":
+                entry = (span.duration, next(self._order), span)
+                if len(self._slowest) < self.keep:
+                    heapq.heappush(self._slowest, entry)
+                else:
+                    heapq.heappushpop(self._slowest, entry)
+
+    def totals(self):
+        """
+        Returns the number of spans and the total time spent in them, by endpoint and span name.
+
+        :return: dict of (endpoint, span name) -> (count, seconds)
+        """
+        with self._lock:
+            return dict(self._totals)
+
+    def slowest(self):
+        """
+        Returns the slowest calls, slowest first.
+
+        :return: list of dicts with the call's attributes, duration, error and breakdown into phases
+        """
+        with self._lock:
+            spans = [span for _, _, span in sorted(self._slowest, reverse=True)]
+        return [{"attributes": dict(span.attributes),
+                 "seconds": span.duration,
+                 "error": span.error,
+                 "phases": span.breakdown()} for span in spans]
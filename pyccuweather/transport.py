@@ -0,0 +1,132 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+transport.py
+HTTP transports used by Connection objects
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool(object):
+    """
+    A thread-safe pool of keep-alive HTTP sessions.
+
+    Every thread gets its own requests.Session, but all sessions are mounted on one shared HTTPAdapter, so the
+    underlying urllib3 connection pools (and their open sockets) are shared between all threads using the pool.
+
+    Prepared requests are reused: the most recent `prepared` distinct requests are kept, and so are the proxy and TLS
+    settings taken from the environment for every host, rather than being worked out again for every request.
+    Cookies are not used by the API and are not sent.
+
+    :param pool_connections: number of per-host connection pools to keep
+    :param pool_maxsize: maximum number of connections kept alive per host
+    :param pool_block: if True, no more than pool_maxsize connections are opened to a host at any one time and
+                       further requests wait for a free connection
+    :param prepared: number of prepared requests to keep for reuse
+    """
+
+    def __init__(self, pool_connections: int=10, pool_maxsize: int=10, pool_block: bool=False, prepared: int=1024):
+        self.adapter = HTTPAdapter(pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block)
+        self.max_prepared = prepared
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+        self._prepared = OrderedDict()
+        self._environment = {}
+        self.closed = False
+
+    def __str__(self):
+        return u"<Session pool ({0:d} sessions)>".format(len(self._sessions))
+
+    __repr__ = __str__
+
+    @property
+    def session(self):
+        """
+        Returns the session belonging to the calling thread, creating it if necessary.
+
+        :return: requests.Session object
+        """
+        if self.closed:
+            raise RuntimeError("Session pool is closed.")
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            with self._lock:
+                self._sessions.append(session)
+            self._local.session = session
+        return session
+
+    def prepare(self, url: str, params: dict=None):
+        """
+        Returns a prepared GET request, reusing an earlier one for the same URL and parameters.
+
+        :param url: URL
+        :param params: query parameters
+        :return: requests.PreparedRequest object, to be sent as is or copied
+        """
+        key = (url, tuple(sorted(params.items())) if params else ())
+        with self._lock:
+            prepared = self._prepared.get(key)
+            if prepared is not None:
+                self._prepared.move_to_end(key)
+                return prepared
+
+        prepared = self.session.prepare_request(requests.Request("GET", url, params=params))
+        with self._lock:
+            self._prepared[key] = prepared
+            if len(self._prepared) > self.max_prepared:
+                self._prepared.popitem(last=False)
+        return prepared
+
+    def _settings(self, session, url: str):
+        """
+        Returns the proxy and TLS settings from the environment for the host of a URL.
+        """
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.netloc)
+        settings = self._environment.get(origin)
+        if settings is None:
+            settings = self._environment[origin] = session.merge_environment_settings(url, {}, None, None, None)
+        return settings
+
+    def get(self, url: str, params: dict=None, timeout=None):
+        """
+        Performs a GET request on a pooled session.
+
+        :param url: URL
+        :param params: query parameters
+        :param timeout: timeout in seconds
+        :return: requests.Response object
+        """
+        session = self.session
+        prepared = self.prepare(url, params)
+        return session.send(prepared.copy(), timeout=timeout, allow_redirects=True, **self._settings(session, url))
+
+    def close(self):
+        """
+        Closes all sessions and the connections held by the pool.
+
+        :return: void
+        """
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            self.closed = True
+        for session in sessions:
+            session.close()
+        self.adapter.close()
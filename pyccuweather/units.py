@@ -0,0 +1,89 @@
+# coding=utf-8
+
+"""
+Pyccuweather
+The Python Accuweather API
+
+units.py
+Unit conversion, for single values and for whole arrays of values
+
+(c) Chris von Csefalvay, 2015.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+# Conversion table: unit -> (dimension, scale, zero), where value in the dimension's base unit = (value - zero) * scale.
+# Scales are exact fractions, so conversions multiply and divide by small integers rather than by rounded factors.
+UNITS = {
+    # Temperature, base unit C
+    "C": ("temperature", Fraction(1), 0),
+    "F": ("temperature", Fraction(5, 9), 32),
+    # Length, base unit mm
+    "mm": ("length", Fraction(1), 0),
+    "cm": ("length", Fraction(10), 0),
+    "m": ("length", Fraction(1000), 0),
+    "km": ("length", Fraction(1000000), 0),
+    "in": ("length", Fraction("25.4"), 0),
+    "ft": ("length", Fraction("304.8"), 0),
+    "mi": ("length", Fraction(1609344), 0),
+    # Speed, base unit km/h
+    "km/h": ("speed", Fraction(1), 0),
+    "mi/h": ("speed", Fraction("1.609344"), 0),
+    "m/s": ("speed", Fraction("3.6"), 0),
+    "kt": ("speed", Fraction("1.852"), 0),
+}
+
+
+@lru_cache(maxsize=None)
+def factor(from_units: str, to_units: str):
+    """
+    Looks up the conversion between two units, as
+    converted value = (value - from zero) * numerator / denominator + to zero.
+
+    :param from_units: unit converted from
+    :param to_units: unit converted to
+    :return: tuple of (from zero, numerator, denominator, to zero)
+    :raise ValueError: if either unit is unknown, or the units measure different dimensions
+    """
+    try:
+        from_dimension, from_scale, from_zero = UNITS[from_units]
+        to_dimension, to_scale, to_zero = UNITS[to_units]
+    except KeyError as e:
+        raise ValueError(u"Unknown unit: {0}".format(e.args[0]))
+    if from_dimension != to_dimension:
+        raise ValueError(u"Cannot convert {0:s} ({1:s}) to {2:s} ({3:s})".format(from_units, from_dimension,
+                                                                                 to_units, to_dimension))
+    ratio = from_scale / to_scale
+    return from_zero, ratio.numerator, ratio.denominator, to_zero
+
+
+def convert(values, from_units, to_units: str):
+    """
+    Converts values between units.
+
+    Values may be a single number or an array. Their units may be a single unit, or an array of units with one unit
+    per value, in which case values in mixed units are converted in one call. Values already in the target unit are
+    returned unchanged.
+
+    :param values: number or array of numbers
+    :param from_units: unit of the values, or array of units
+    :param to_units: unit to convert to
+    :return: converted number, or array of converted numbers
+    :raise ValueError: for unknown units, or units of a different dimension
+    """
+    if isinstance(from_units, str):
+        if from_units == to_units:
+            return values
+        from_zero, numerator, denominator, to_zero = factor(from_units, to_units)
+        if not isinstance(values, (int, float)):
+            values = np.asarray(values, dtype=np.float64)
+        return (values - from_zero) * numerator / denominator + to_zero
+
+    values = np.asarray(values, dtype=np.float64)
+    tags, index = np.unique(np.asarray(from_units), return_inverse=True)
+    factors = np.array([factor(str(tag), to_units) for tag in tags], dtype=np.float64)
+    from_zero, numerator, denominator, to_zero = (factors[:, i][index.reshape(values.shape)] for i in range(4))
+    return (values - from_zero) * numerator / denominator + to_zero
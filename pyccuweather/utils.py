@@ -9,19 +9,20 @@ The Python Accuweather API
 http://www.github.com/chrisvoncsefalvay/pyccuweather/
 """
 
-import json
 from time import gmtime
 from datetime import date
 
+from pyccuweather.decoding import decode
+
 
 def wloads(content):
     """
-    Decodes incoming JSON with UTF-8.
+    Decodes incoming JSON straight from the response bytes, with the fastest installed decoder.
 
-    :param content: JSON formatted content
-    :return: JSON formatted content loaded as object and decoded with UTF-8.
+    :param content: JSON formatted content, as bytes
+    :return: JSON formatted content loaded as object.
     """
-    return json.loads(content.decode('utf-8'))
+    return decode(content)
 
 
 def get_woy(epochdate):
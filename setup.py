@@ -15,7 +15,8 @@ config = {
     'url': 'http://github.com/chrisvoncsefalvay/pyccuweather',
     'author_email': 'chris@chrisvoncsefalvay.com',
     'version': '0.31',
-    'install_requires': ['nose', 'pandas', 'requests'],
+    'install_requires': ['nose', 'numpy', 'pandas', 'requests'],
+    'extras_require': {'async': ['aiohttp'], 'fast': ['orjson']},
     'packages': ['pyccuweather'],
     'scripts': [],
     'name': 'pyccuweather'
@@ -0,0 +1,108 @@
+# coding=utf-8
+
+"""
+A minimal local HTTP/1.1 server standing in for the Accuweather API in offline tests.
+"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlparse, parse_qs
+from pyccuweather.froots import froot
+
+__author__ = 'CVoncsefalvay'
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+TEST_API_KEY = "0123456789abcdef0123456789abcdef"
+
+
+def load_fixture(name):
+    """
+    Loads a recorded JSON payload from tests/fixtures.
+
+    :param name: fixture name, usually the froots.FROOTS endpoint name
+    :return: decoded JSON
+    """
+    with open(os.path.join(FIXTURES, name + ".json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def path_of(fkeyid, **kwargs):
+    """
+    Returns the URL path under which an endpoint is served.
+    """
+    return urlparse(froot(fkeyid, **kwargs)).path
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StubServer(object):
+    """
+    Serves canned JSON payloads by URL path. Records every request and every client connection it sees.
+
+    :param routes: dict of path -> payload (JSON-serialisable object, or (status, payload, headers) tuple)
+    """
+
+    def __init__(self, routes=None):
+        self.routes = routes if routes is not None else {}
+        self.requests = []
+        self.connections = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                stub.requests.append((parsed.path, parse_qs(parsed.query)))
+                stub.connections.add(self.client_address)
+                route = stub.routes.get(parsed.path)
+                if route is None:
+                    status, payload, headers = 404, {"Message": "Not found"}, {}
+                elif callable(route):
+                    status, payload, headers = route(parsed.path, parse_qs(parsed.query))
+                elif isinstance(route, tuple):
+                    status, payload, headers = route
+                else:
+                    status, payload, headers = 200, route, {}
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{0:d}".format(self.server.server_address[1])
+
+    def route(self, conn):
+        """
+        Points a connection at the stub server.
+
+        :param conn: Connection or AsyncConnection
+        :return: the connection
+        """
+        conn.API_ROOT = self.url
+        return conn
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,74 @@
+# coding=utf-8
+
+import asyncio
+from unittest import TestCase
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.objects import *
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestAsyncConnection(TestCase):
+    def setUp(self):
+        self.stub = StubServer({
+            path_of("loc_geoposition"): load_fixture("loc_geoposition"),
+            path_of("forecast_12h", location_key=330732): load_fixture("forecast_12h"),
+            path_of("forecast_5d", location_key=330732): load_fixture("forecast_5d"),
+            path_of("currentconditions", location_key=330732): load_fixture("currentconditions"),
+        }).__enter__()
+
+    def tearDown(self):
+        self.stub.__exit__(None, None, None)
+
+    def run_with(self, coro_fn, **kwargs):
+        async def main():
+            async with self.stub.route(AsyncConnection(API_KEY=TEST_API_KEY, **kwargs)) as conn:
+                return await coro_fn(conn)
+        return asyncio.run(main())
+
+    def test_methods(self):
+        async def calls(conn):
+            return await asyncio.gather(conn.loc_geoposition(lat=50.9, lon=-1.4),
+                                        conn.get_forecast("12h", 330732),
+                                        conn.get_forecast("5d", 330732),
+                                        conn.get_current_wx(330732))
+
+        loc, hourly, daily, current = self.run_with(calls)
+        self.assertIsInstance(loc, Location)
+        self.assertEqual(loc.lkey, "330732")
+        self.assertIsInstance(hourly, HourlyForecasts)
+        self.assertEqual(len(hourly.forecasts), 12)
+        self.assertIsInstance(daily, DailyForecasts)
+        self.assertEqual(len(daily.forecasts), 5)
+        self.assertIsInstance(current, CurrentObs)
+
+    def test_raw_response(self):
+        res = self.run_with(lambda conn: conn.get_alerts(330732, 1))
+        self.assertEqual(res.status_code, 404)
+        self.assertEqual(res.json(), {"Message": "Not found"})
+
+    def test_concurrency(self):
+        async def calls(conn):
+            return await asyncio.gather(*[conn.get_forecast("12h", 330732) for _ in range(200)])
+
+        res = self.run_with(calls, concurrency=8, limit_per_host=4, coalesce=False)
+        self.assertEqual(len(res), 200)
+        self.assertEqual(len(self.stub.requests), 200)
+        self.assertLessEqual(len(self.stub.connections), 4)
+
+    def test_event_loops(self):
+        conn = self.stub.route(AsyncConnection(API_KEY=TEST_API_KEY, concurrency=2, coalesce=False))
+
+        async def calls():
+            return await asyncio.gather(*[conn.get_forecast("12h", 330732) for _ in range(6)])
+
+        for _ in range(2):
+            self.assertEqual(len(asyncio.run(calls())), 6)
+        asyncio.run(conn.close())
+        self.assertEqual(len(self.stub.requests), 12)
+
+    def test_sync_context_manager(self):
+        with self.assertRaises(TypeError):
+            with AsyncConnection(API_KEY=TEST_API_KEY):
+                pass
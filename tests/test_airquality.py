@@ -0,0 +1,108 @@
+# coding=utf-8
+
+import asyncio
+import copy
+from unittest import TestCase
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.airquality import AirQualityPoller, AsyncAirQualityPoller
+from pyccuweather.connector import Connection
+from pyccuweather.errors import APIError
+from pyccuweather.objects import AirQuality, AirQualityFactor
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestAirQuality(TestCase):
+    def test_parse(self):
+        json = load_fixture("airquality_current")
+        aq = AirQuality(json)
+        self.assertIsInstance(aq.pm2_5, AirQualityFactor)
+        self.assertEqual(aq.pm2_5.name, "PM2_5")
+        self.assertEqual(aq.airquality.band, json[0]["CategoryValue"])
+        self.assertEqual(list(aq.factors), ["AirQuality", "Ozone", "PM2_5", "PM10", "NO2", "SO2", "CO"])
+        self.assertTrue(str(aq.ozone).startswith("<Air quality factor Ozone"))
+
+    def test_partial(self):
+        json = [each for each in load_fixture("airquality_current") if each["Name"] in ("AirQuality", "NO2")]
+        aq = AirQuality(json + [dict(json[0], Name="Pollen")], raw="drop")
+        self.assertIsNone(aq.co)
+        self.assertIsNone(aq.raw)
+        self.assertEqual(list(aq.factors), ["AirQuality", "NO2"])
+        self.assertIsNone(aq.bands()[2])
+
+    def test_slots(self):
+        aq = AirQuality(load_fixture("airquality_current"))
+        self.assertFalse(hasattr(aq, "__dict__"))
+        with self.assertRaises(AttributeError):
+            aq.pollen = None
+
+    def test_connection(self):
+        with StubServer({path_of("airquality_yesterday", location_key=330732): load_fixture("airquality_yesterday")}) \
+                as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY)) as conn:
+                aq = conn.get_airquality(330732, current=False)
+        self.assertIsInstance(aq, AirQuality)
+        self.assertEqual(aq.airquality.band, load_fixture("airquality_yesterday")[0]["CategoryValue"])
+
+
+class TestAirQualityPoller(TestCase):
+    def setUp(self):
+        self.responses = {lkey: load_fixture("airquality_current") for lkey in range(1, 6)}
+
+        def route(lkey):
+            return lambda path, query: self.responses[lkey] if isinstance(self.responses[lkey], tuple) \
+                else (200, self.responses[lkey], {})
+
+        self.routes = {path_of("airquality_current", location_key=lkey): route(lkey) for lkey in self.responses}
+
+    def test_changes(self):
+        with StubServer(self.routes) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, cache=False, retry=0)) as conn:
+                poller = AirQualityPoller(conn, range(1, 6), max_workers=3)
+                first = list(poller.poll())
+                self.assertEqual(len(first), 5 * 7)
+                self.assertTrue(all(each.previous is None for each in first))
+                self.assertEqual(list(poller.poll()), [])
+
+                changed = copy.deepcopy(self.responses[2])
+                changed[3]["CategoryValue"] += 1
+                changed[3]["Category"] = "Moderate"
+                del changed[6]
+                self.responses[2] = changed
+                self.responses[4] = (500, {"Message": "Unavailable"}, {})
+                changes = sorted(poller.poll(), key=lambda each: each.name)
+
+        self.assertEqual([(each.lkey, each.name) for each in changes], [(2, "CO"), (2, "PM10")])
+        self.assertIsNone(changes[0].factor)
+        self.assertEqual(changes[1].factor.category, "Moderate")
+        self.assertEqual(changes[1].previous + 1, changes[1].factor.band)
+        self.assertEqual(list(poller.errors), [4])
+        self.assertIsInstance(poller.errors[4], APIError)
+        self.assertEqual(poller.bands(4)["PM10"], self.responses[1][3]["CategoryValue"])
+
+    def test_async(self):
+        async def poll(poller):
+            return [change async for change in poller.poll()]
+
+        async def main():
+            async with stub.route(AsyncConnection(API_KEY=TEST_API_KEY, cache=False, retry=0)) as conn:
+                poller = AsyncAirQualityPoller(conn, range(1, 6), window=3)
+                first = await poll(poller)
+                self.responses[2] = (500, {"Message": "Unavailable"}, {})
+                second = await poll(poller)
+            return poller, first, second
+
+        with StubServer(self.routes) as stub:
+            poller, first, second = asyncio.run(main())
+        self.assertEqual(len(first), 5 * 7)
+        self.assertEqual(second, [])
+        self.assertEqual(list(poller.errors), [2])
+        self.assertIsInstance(poller.errors[2], APIError)
+        self.assertEqual(len(stub.requests), 10)
+
+    def test_connection_type(self):
+        with self.assertRaises(TypeError):
+            AirQualityPoller(AsyncConnection(API_KEY=TEST_API_KEY), [1])
+        with self.assertRaises(TypeError):
+            AsyncAirQualityPoller(Connection(API_KEY=TEST_API_KEY), [1])
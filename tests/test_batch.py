@@ -0,0 +1,106 @@
+# coding=utf-8
+
+import asyncio
+import threading
+import time
+from unittest import TestCase
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.batch import fan_out, async_fan_out, BatchResult
+from pyccuweather.connector import Connection
+from pyccuweather.errors import NoResultsError
+from pyccuweather.objects import HourlyForecasts, CurrentObs
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestFanOut(TestCase):
+
+    def test_dedup_and_errors(self):
+        calls = []
+
+        def fn(key):
+            calls.append(key)
+            if key == 3:
+                raise NoResultsError(str(key))
+            return key * 10
+
+        res = list(fan_out(fn, [1, 2, 3, 2, 1, 4], max_workers=2))
+
+        self.assertEqual(sorted(calls), [1, 2, 3, 4])
+        self.assertTrue(all(isinstance(each, BatchResult) for each in res))
+        by_key = {each.key: each for each in res}
+        self.assertEqual(by_key[1].result, 10)
+        self.assertTrue(by_key[1].ok)
+        self.assertFalse(by_key[3].ok)
+        self.assertIsInstance(by_key[3].error, NoResultsError)
+
+    def test_completion_order(self):
+        def fn(key):
+            time.sleep(key / 20)
+            return key
+
+        res = [each.key for each in fan_out(fn, [4, 1, 3, 2], max_workers=4)]
+        self.assertEqual(res, [1, 2, 3, 4])
+
+    def test_bounded(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def fn(key):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.005)
+            with lock:
+                state["running"] -= 1
+
+        self.assertEqual(len(list(fan_out(fn, range(50), max_workers=3))), 50)
+        self.assertLessEqual(state["peak"], 3)
+
+    def test_async_fan_out(self):
+        async def fn(key):
+            await asyncio.sleep(key * 0.03)
+            if key == 2:
+                raise ValueError(key)
+            return key
+
+        async def main():
+            return [each async for each in async_fan_out(fn, [5, 2, 1, 1], window=2)]
+
+        res = asyncio.run(main())
+        self.assertEqual([each.key for each in res], [2, 1, 5])
+        self.assertIsInstance(res[0].error, ValueError)
+
+
+class TestConnectionBatch(TestCase):
+    def setUp(self):
+        self.stub = StubServer({
+            path_of("forecast_12h", location_key=1): load_fixture("forecast_12h"),
+            path_of("forecast_12h", location_key=2): load_fixture("forecast_12h"),
+            path_of("currentconditions", location_key=1): load_fixture("currentconditions"),
+        }).__enter__()
+
+    def tearDown(self):
+        self.stub.__exit__(None, None, None)
+
+    def test_get_forecast_many(self):
+        with self.stub.route(Connection(API_KEY=TEST_API_KEY)) as conn:
+            res = {each.key: each for each in conn.get_forecast_many("12h", [1, 2, 1, 404])}
+
+        self.assertEqual(len(self.stub.requests), 3)
+        self.assertIsInstance(res[1].result, HourlyForecasts)
+        self.assertIsInstance(res[2].result, HourlyForecasts)
+        self.assertFalse(res[404].ok)
+
+        with self.assertRaises(AssertionError):
+            conn.get_forecast_many("13h", [1])
+
+    def test_get_current_wx_many_async(self):
+        async def main():
+            async with self.stub.route(AsyncConnection(API_KEY=TEST_API_KEY)) as conn:
+                return [each async for each in conn.get_current_wx_many([1, 1, 404])]
+
+        res = {each.key: each for each in asyncio.run(main())}
+        self.assertIsInstance(res[1].result, CurrentObs)
+        self.assertFalse(res[404].ok)
@@ -0,0 +1,108 @@
+# coding=utf-8
+
+from unittest import TestCase
+from pyccuweather.cache import ResponseCache, cache_key
+from pyccuweather.connector import Connection
+from pyccuweather.objects import HourlyForecasts, Location
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(TestCase):
+
+    def test_key_ignores_apikey(self):
+        k1 = cache_key("loc_lkey", {"location_key": 330732}, {"apikey": "a"})
+        k2 = cache_key("loc_lkey", {"location_key": "330732"}, {"apikey": "b"})
+        self.assertEqual(k1, k2)
+        self.assertNotEqual(k1, cache_key("loc_lkey", {"location_key": 1}, {"apikey": "a"}))
+        self.assertNotEqual(cache_key("loc_lkey", {"location_key": 1}, {}, "http://127.0.0.1:8080"),
+                            cache_key("loc_lkey", {"location_key": 1}, {}, "http://api.accuweather.com"))
+
+    def test_ttl(self):
+        cache = ResponseCache(ttls={"forecast_240h": 7200, "alarms_": 0})
+        self.assertEqual(cache.ttl("loc_postcode"), 7 * 24 * 3600)
+        self.assertEqual(cache.ttl("forecast_1h"), 600)
+        self.assertEqual(cache.ttl("forecast_12h"), 3600)
+        self.assertEqual(cache.ttl("forecast_240h"), 7200)
+        self.assertEqual(cache.ttl("alarms_1d"), 0)
+
+    def test_expiry(self):
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        key = cache_key("currentconditions", {"location_key": 1}, {})
+        cache.put(key, {"a": 1}, 10)
+        clock.now = 299
+        self.assertEqual(cache.get(key), {"a": 1})
+        clock.now = 300
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.stats(),
+                         {"entries": 0, "bytes": 0, "hits": 1, "misses": 1,
+                          "evictions": 0, "expirations": 1})
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_bytes=30)
+        keys = [cache_key("loc_lkey", {"location_key": i}, {}) for i in range(4)]
+        for key in keys[:3]:
+            cache.put(key, key, 10)
+        cache.get(keys[0])
+        cache.put(keys[3], keys[3], 10)
+
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, 30)
+
+    def test_uncached_endpoint(self):
+        cache = ResponseCache(ttls={"alarms_": 0})
+        key = cache_key("alarms_1d", {"location_key": 1}, {})
+        cache.put(key, [], 10)
+        self.assertEqual(len(cache), 0)
+
+
+class TestConnectionCache(TestCase):
+
+    def test_skips_network(self):
+        with StubServer({path_of("forecast_12h", location_key=1): load_fixture("forecast_12h"),
+                         path_of("loc_lkey", location_key=1): load_fixture("loc_geoposition")}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, cache=True)) as conn:
+                for _ in range(3):
+                    self.assertIsInstance(conn.get_forecast("12h", 1), HourlyForecasts)
+                    self.assertIsInstance(conn.loc_lkey(1), Location)
+                conn.get_forecast("12h", 1, metric=False)
+
+        self.assertEqual(len(stub.requests), 3)
+        self.assertEqual(conn.cache.hits, 4)
+
+    def test_empty_cache_instance(self):
+        cache = ResponseCache()
+        with StubServer({path_of("forecast_12h", location_key=1): load_fixture("forecast_12h")}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, cache=cache)) as conn:
+                self.assertIs(conn.cache, cache)
+                conn.get_forecast("12h", 1)
+                conn.get_forecast("12h", 1)
+
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual(cache.hits, 1)
+
+    def test_shared_between_api_roots(self):
+        cache = ResponseCache()
+        routes = {path_of("forecast_12h", location_key=1): load_fixture("forecast_12h")}
+        with StubServer(routes) as first, StubServer(routes) as second:
+            with first.route(Connection(API_KEY=TEST_API_KEY, cache=cache)) as conn:
+                conn.get_forecast("12h", 1)
+                conn.get_forecast("12h", 1)
+            with second.route(Connection(API_KEY=TEST_API_KEY, cache=cache)) as conn:
+                conn.get_forecast("12h", 1)
+
+        self.assertEqual(len(first.requests), 1)
+        self.assertEqual(len(second.requests), 1)
+        self.assertEqual(len(cache), 2)
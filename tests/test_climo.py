@@ -0,0 +1,205 @@
+# coding=utf-8
+
+import asyncio
+import datetime
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.climo import ClimoCheckpoint, windows, as_date
+from pyccuweather.connector import Connection
+from pyccuweather.objects import ClimoDay, DegreeDay, ClimoActuals, ClimoRecords, ClimoNormals
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+LKEY = 330732
+
+
+def _days(path, query):
+    """
+    Answers a climatology range request with one day of the fixture per requested date.
+    """
+    template = load_fixture("climo_actuals_date")
+    start, end = as_date(query["start"][0]), as_date(query["end"][0])
+    days = []
+    while start <= end:
+        days.append(dict(template, Date=start.strftime("%Y-%m-%dT00:00:00+01:00")))
+        start += datetime.timedelta(days=1)
+    return 200, days, {}
+
+
+class TestClimoDay(TestCase):
+    def test_kinds(self):
+        actuals = ClimoDay(load_fixture("climo_actuals_date"), "actuals")
+        self.assertLessEqual(actuals.temp_min.value, actuals.temp_mean.value)
+        self.assertLessEqual(actuals.temp_mean.value, actuals.temp_max.value)
+        self.assertIsInstance(actuals.degree_days, DegreeDay)
+        self.assertIsNone(actuals.years)
+        records = ClimoDay(load_fixture("climo_records_date"), "records")
+        self.assertIsNone(records.temp_mean)
+        self.assertIsNone(records.degree_days)
+        self.assertGreaterEqual(set(records.years), {"temp_min", "temp_max", "precipitation"})
+        normals = ClimoDay(load_fixture("climo_normals_date"), "normals")
+        self.assertIsNone(normals.snowfall)
+        self.assertIsNone(normals.snow_depth)
+
+    def test_slots(self):
+        day = ClimoDay(load_fixture("climo_actuals_date"), raw="compact")
+        self.assertFalse(hasattr(day, "__dict__"))
+        with self.assertRaises(AttributeError):
+            day.temp_median = None
+
+    def test_degree_days(self):
+        dd = DegreeDay({"Heating": {"Value": 5, "Unit": "F"}, "Cooling": {"Value": 0, "Unit": "F"}})
+        self.assertIs(dd.warming, dd.heating)
+        self.assertEqual(dd.heating.value, 5)
+
+
+class TestClimoSeries(TestCase):
+    def test_columns(self):
+        json = load_fixture("climo_actuals_range")
+        series = ClimoActuals(json, raw="drop")
+        self.assertEqual(len(series), 30)
+        self.assertIsNone(series.raw)
+        self.assertEqual(series.start_date, datetime.date(2015, 6, 1))
+        self.assertEqual(series.end_date, datetime.date(2015, 6, 30))
+        self.assertEqual(series.columns.units["temp_max"], "C")
+        day = ClimoDay(json[2])
+        self.assertEqual(series["2015-06-03"]["temp_max"], day.temp_max.value)
+        self.assertEqual(series.row(datetime.date(2015, 6, 3)), 2)
+        self.assertNotIn("2015/07/01", series)
+        self.assertEqual(series.degree_days("2015/06/03").heating.value, day.degree_days.heating.value)
+
+    def test_aggregate(self):
+        json = load_fixture("climo_actuals_range")
+        series = ClimoActuals(json)
+        highs = [each["Temperatures"]["Maximum"]["Metric"]["Value"] for each in json]
+        self.assertEqual(series.aggregate("temp_max", "max"), max(highs))
+        self.assertAlmostEqual(series.aggregate("temp_max", "mean", "2015/06/01", "2015/06/10"), sum(highs[:10]) / 10)
+        self.assertEqual(list(series.monthly("temp_max", "max").items()), [("2015-06", max(highs))])
+        self.assertEqual(len(series.between("2015/06/29", None)["temp_max"]), 2)
+
+    def test_gaps_and_kinds(self):
+        json = load_fixture("climo_normals_range")
+        series = ClimoNormals(json[10:] + json[:5])
+        self.assertEqual(series.start_date, datetime.date(2015, 6, 1))
+        self.assertEqual(len(series), 25)
+        self.assertEqual(series.row("2015/06/11"), 5)
+        self.assertNotIn("2015/06/06", series)
+        records = ClimoRecords(load_fixture("climo_records_range"))
+        self.assertGreater(records["2015-06-01"]["temp_max_year"], 1900)
+        with self.assertRaises(KeyError):
+            records.degree_days("2015-06-01")
+
+    def test_connection(self):
+        with StubServer({path_of("climo_records_date", date="2015/06/01", location_key=LKEY):
+                         load_fixture("climo_records_date"),
+                         path_of("climo_normals_range", location_key=LKEY): load_fixture("climo_normals_range")}) \
+                as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY)) as conn:
+                self.assertEqual(len(conn.get_records(LKEY, "2015-06-01")), 1)
+                normals = conn.get_normals(LKEY, datetime.date(2015, 6, 1), "2015/06/30")
+        self.assertIsInstance(normals, ClimoNormals)
+        self.assertEqual(len(normals), 30)
+        self.assertEqual(stub.requests[-1][1]["start"], ["2015/06/01"])
+
+
+    def test_raw_default(self):
+        json = load_fixture("climo_normals_range")
+        with StubServer({path_of("climo_normals_range", location_key=LKEY): json}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, cache=False, raw="keep")) as conn:
+                dropped = conn.get_normals(LKEY, "2015/06/01", "2015/06/30")
+                kept = conn.get_normals(LKEY, "2015/06/01", "2015/06/30", raw="compact")
+                days = list(conn.stream_climo("normals", LKEY, "2015/06/01", "2015/06/30"))
+        self.assertIsNone(dropped.raw)
+        self.assertIsNone(ClimoNormals(json).raw)
+        self.assertEqual(kept.raw, json)
+        self.assertEqual(len(days), 30)
+        self.assertIsNone(days[0].raw)
+
+
+class TestStreamClimo(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "checkpoint.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_windows(self):
+        self.assertEqual(windows("2015/01/01", "2015-03-01", 31),
+                         [(datetime.date(2015, 1, 1), datetime.date(2015, 1, 31)),
+                          (datetime.date(2015, 2, 1), datetime.date(2015, 3, 1))])
+        self.assertEqual(windows("2015/01/02", "2015/01/01"), [])
+
+    def test_stream(self):
+        with StubServer({path_of("climo_actuals_range", location_key=LKEY): _days}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, cache=False)) as conn:
+                days = list(conn.stream_climo("actuals", LKEY, "2015/01/01", "2015/03/31", window=31))
+        self.assertEqual(len(days), 90)
+        self.assertEqual(len(stub.requests), 3)
+        self.assertEqual([day.date[:10] for day in days],
+                         [(datetime.date(2015, 1, 1) + datetime.timedelta(days=n)).isoformat() for n in range(90)])
+
+    def test_resume(self):
+        with StubServer({path_of("climo_actuals_range", location_key=LKEY): _days}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, cache=False)) as conn:
+                days = conn.stream_climo("actuals", LKEY, "2015/01/01", "2015/03/31", window=31, max_workers=1,
+                                         checkpoint=ClimoCheckpoint(self.path))
+                for _ in range(40):
+                    next(days)
+                days.close()
+
+                checkpoint = ClimoCheckpoint(self.path)
+                self.assertEqual(checkpoint.get("actuals", LKEY, "2015/01/01", "2015/03/31"),
+                                 datetime.date(2015, 1, 31))
+                del stub.requests[:]
+                rest = list(conn.stream_climo("actuals", LKEY, "2015/01/01", "2015/03/31", window=31,
+                                              checkpoint=checkpoint))
+        self.assertTrue(rest[0].date.startswith("2015-02-01"))
+        self.assertEqual(len(rest), 59)
+        self.assertEqual(sorted(query["start"][0] for _, query in stub.requests), ["2015/02/01", "2015/03/04"])
+        self.assertEqual(ClimoCheckpoint(self.path).get("actuals", LKEY, "2015/01/01", "2015/03/31"),
+                         datetime.date(2015, 3, 31))
+
+    def test_other_range(self):
+        checkpoint = ClimoCheckpoint(self.path)
+        checkpoint.update("actuals", LKEY, "2015/01/01", "2015/03/31", "2015/03/31")
+        with StubServer({path_of("climo_actuals_range", location_key=LKEY): _days}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, cache=False)) as conn:
+                earlier = list(conn.stream_climo("actuals", LKEY, "2014/12/01", "2014/12/31", checkpoint=checkpoint))
+                again = list(conn.stream_climo("actuals", LKEY, "2015/01/01", "2015/03/31", checkpoint=checkpoint))
+        self.assertEqual(len(earlier), 31)
+        self.assertEqual(again, [])
+        self.assertEqual(checkpoint.get("actuals", LKEY, "2014/12/01", "2014/12/31"), datetime.date(2014, 12, 31))
+        self.assertIsNone(checkpoint.get("normals", LKEY, "2014/12/01", "2014/12/31"))
+        checkpoint.clear("actuals", LKEY, "2015-01-01", "2015-03-31")
+        self.assertIsNone(ClimoCheckpoint(self.path).get("actuals", LKEY, "2015/01/01", "2015/03/31"))
+
+    def test_async_stream(self):
+        async def consume(conn, checkpoint, count=None):
+            days = []
+            stream = conn.stream_climo("actuals", LKEY, "2015/01/01", "2015/03/31", max_workers=2,
+                                       checkpoint=checkpoint)
+            async for day in stream:
+                days.append(day)
+                if len(days) == count:
+                    break
+            await stream.aclose()
+            return days
+
+        async def main():
+            async with stub.route(AsyncConnection(API_KEY=TEST_API_KEY, cache=False)) as conn:
+                first = await consume(conn, ClimoCheckpoint(self.path), count=40)
+                rest = await consume(conn, ClimoCheckpoint(self.path))
+            return first, rest
+
+        with StubServer({path_of("climo_actuals_range", location_key=LKEY): _days}) as stub:
+            first, rest = asyncio.run(main())
+        self.assertEqual(len(first), 40)
+        self.assertTrue(rest[0].date.startswith("2015-02-01"))
+        self.assertEqual(len(rest), 59)
+        self.assertEqual([day.date[:10] for day in first[:31] + rest],
+                         [(datetime.date(2015, 1, 1) + datetime.timedelta(days=n)).isoformat() for n in range(90)])
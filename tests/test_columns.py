@@ -0,0 +1,57 @@
+# coding=utf-8
+
+from unittest import TestCase
+
+import numpy as np
+
+from pyccuweather.objects import HourlyForecasts, DailyForecasts
+from tests.stubserver import load_fixture
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestForecastColumns(TestCase):
+
+    def test_hourly_matches_objects(self):
+        payload = load_fixture("forecast_12h")
+        res = HourlyForecasts(payload)
+        cols = res.to_arrays()
+        self.assertEqual(cols.rows, 12)
+        self.assertEqual(cols.units["temperature"], "C")
+        self.assertEqual(cols.units["wind_speed"], "km/h")
+        self.assertEqual(cols.units["ceiling"], "m")
+        forecasts = list(res.forecasts.values())
+        np.testing.assert_array_equal(cols["epoch"], [f.epoch_datetime for f in forecasts])
+        np.testing.assert_allclose(cols["temperature"], [f.temperature.C for f in forecasts])
+        np.testing.assert_allclose(cols["rain"], [f.rain.mm for f in forecasts])
+        np.testing.assert_allclose(cols["wind_speed"], [f.wind.speed for f in forecasts])
+        np.testing.assert_allclose(cols["wind_hdg"], [f.wind.hdg for f in forecasts])
+        np.testing.assert_allclose(cols["uv_index"], [f.uv_index for f in forecasts])
+
+    def test_missing_values_are_nan(self):
+        payload = load_fixture("forecast_12h")
+        del payload[3]["WindGust"]
+        cols = HourlyForecasts(payload, lazy=True).to_arrays()
+        self.assertTrue(np.isnan(cols["wind_gust_speed"][3]))
+        self.assertFalse(np.isnan(cols["wind_gust_speed"][2]))
+
+    def test_mixed_units(self):
+        payload = load_fixture("forecast_12h")
+        payload[0]["Temperature"] = {"Value": 57.0, "Unit": "F", "UnitType": 18}
+        with self.assertRaises(ValueError):
+            HourlyForecasts(payload).to_arrays()
+
+    def test_dropped_json(self):
+        for series in (HourlyForecasts(load_fixture("forecast_12h"), raw="drop"),
+                       DailyForecasts(load_fixture("forecast_5d"), raw="drop")):
+            with self.assertRaises(ValueError):
+                series.to_arrays()
+
+    def test_daily(self):
+        res = DailyForecasts(load_fixture("forecast_5d"))
+        cols = res.to_arrays()
+        self.assertEqual(cols.rows, 5)
+        forecasts = list(res.forecasts.values())
+        np.testing.assert_allclose(cols["temp_max"], [f.temp_max.C for f in forecasts])
+        np.testing.assert_allclose(cols["night_wind_hdg"], [f.night.wind.hdg for f in forecasts])
+        self.assertEqual(cols.units["day_snow"], "cm")
@@ -0,0 +1,54 @@
+# coding=utf-8
+
+from unittest import TestCase
+from pyccuweather.connector import Connection
+from pyccuweather.objects import *
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestConnectionOffline(TestCase):
+    def setUp(self):
+        self.stub = StubServer({
+            path_of("loc_geoposition"): load_fixture("loc_geoposition"),
+            path_of("loc_lkey", location_key=330732): load_fixture("loc_geoposition"),
+            path_of("forecast_12h", location_key=330732): load_fixture("forecast_12h"),
+            path_of("forecast_5d", location_key=330732): load_fixture("forecast_5d"),
+            path_of("currentconditions", location_key=330732): load_fixture("currentconditions"),
+        }).__enter__()
+        self.conn = self.stub.route(Connection(API_KEY=TEST_API_KEY))
+
+    def tearDown(self):
+        self.conn.close()
+        self.stub.__exit__(None, None, None)
+
+    def test_loc_geoposition(self):
+        res = self.conn.loc_geoposition(lat=50.9, lon=-1.4)
+        self.assertIsInstance(res, Location)
+        self.assertEqual(res.lkey, "330732")
+        path, query = self.stub.requests[-1]
+        self.assertEqual(query["q"], ["50.9000,-1.4000"])
+        self.assertEqual(query["apikey"], [TEST_API_KEY])
+
+    def test_loc_lkey(self):
+        res = self.conn.loc_lkey(330732)
+        self.assertIsInstance(res, Location)
+
+    def test_get_forecast(self):
+        res = self.conn.get_forecast(forecast_type="12h", lkey=330732)
+        self.assertIsInstance(res, HourlyForecasts)
+        self.assertEqual(len(res.forecasts), 12)
+
+        res = self.conn.get_forecast(forecast_type="5d", lkey=330732)
+        self.assertIsInstance(res, DailyForecasts)
+        self.assertEqual(len(res.forecasts), 5)
+
+    def test_get_current_wx(self):
+        res = self.conn.get_current_wx(330732)
+        self.assertIsInstance(res, CurrentObs)
+        self.assertEqual(len(res.observations), 1)
+
+    def test_raw_response(self):
+        res = self.conn.get_alerts(330732, 1)
+        self.assertEqual(res.status_code, 404)
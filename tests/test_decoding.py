@@ -0,0 +1,44 @@
+# coding=utf-8
+
+from unittest import TestCase, skipIf
+from pyccuweather.connector import Connection
+from pyccuweather.decoding import get_decoder, orjson
+from pyccuweather.objects import HourlyForecasts
+from pyccuweather.utils import wloads
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+CONTENT = u'{"LocalizedName": "München", "Value": [1.5, 2]}'.encode("utf-8")
+
+
+class TestDecoding(TestCase):
+
+    def test_stdlib(self):
+        self.assertEqual(get_decoder("json")(CONTENT), {"LocalizedName": u"München", "Value": [1.5, 2]})
+        self.assertEqual(wloads(CONTENT), get_decoder("json")(CONTENT))
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        self.assertIs(get_decoder("auto"), orjson.loads)
+        self.assertEqual(get_decoder("orjson")(CONTENT), get_decoder("json")(CONTENT))
+
+    def test_custom_and_unknown(self):
+        custom = lambda content: {"custom": len(content)}
+        self.assertIs(get_decoder(custom), custom)
+        with self.assertRaises(ValueError):
+            get_decoder("yaml")
+
+    def test_connection_decoder(self):
+        decoded = []
+
+        def decoder(content):
+            self.assertIsInstance(content, bytes)
+            decoded.append(content)
+            return get_decoder("json")(content)
+
+        with StubServer({path_of("forecast_12h", location_key=330732): load_fixture("forecast_12h")}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, decoder=decoder)) as conn:
+                res = conn.get_forecast(forecast_type="12h", lkey=330732)
+        self.assertIsInstance(res, HourlyForecasts)
+        self.assertEqual(len(decoded), 1)
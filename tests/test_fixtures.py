@@ -0,0 +1,50 @@
+# coding=utf-8
+
+import os
+from unittest import TestCase
+from pyccuweather.connector import Connection, FORECAST_TYPES
+from pyccuweather.froots import FROOTS
+from pyccuweather.objects import Location, LocationSet, CurrentObs, HourlyForecasts, DailyForecasts
+from tests.stubserver import StubServer, FIXTURES, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+LKEY = 330732
+
+
+class TestRecordedFixtures(TestCase):
+    """
+    Every endpoint has a recorded payload, and every payload the library parses goes through the full Connection
+    code path offline.
+    """
+
+    def test_every_endpoint_recorded(self):
+        recorded = set(name[:-len(".json")] for name in os.listdir(FIXTURES) if name.endswith(".json"))
+        self.assertLessEqual(set(FROOTS), recorded, sorted(set(FROOTS) - recorded))
+        for fkeyid in FROOTS:
+            self.assertTrue(load_fixture(fkeyid))
+
+    def test_parse_through_connection(self):
+        kwargs = {"location_key": LKEY, "country_code": "GB"}
+        routes = {path_of(fkeyid, **kwargs): load_fixture(fkeyid) for fkeyid in FROOTS
+                  if fkeyid.startswith(("loc_", "currentconditions", "forecast_"))}
+        with StubServer(routes) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY)) as conn:
+                for location in (conn.loc_geoposition(50.905, -1.397), conn.loc_ip("81.2.69.142"), conn.loc_lkey(LKEY),
+                                 conn.loc_postcode("GB", "SO14")):
+                    self.assertIsInstance(location, Location)
+                for country_code in (None, "GB"):
+                    results = conn.loc_string("Southampton", country_code)
+                    self.assertIsInstance(results, LocationSet)
+                    self.assertEqual(len(results),
+                                     len(load_fixture("loc_search_country" if country_code else "loc_search")))
+
+                for current in (0, 6, 24):
+                    obs = conn.get_current_wx(LKEY, current=current)
+                    self.assertIsInstance(obs, CurrentObs)
+                    self.assertEqual(len(obs.observations), max(current, 1))
+
+                for forecast_type in FORECAST_TYPES:
+                    res = conn.get_forecast(forecast_type, LKEY)
+                    self.assertIsInstance(res, HourlyForecasts if forecast_type.endswith("h") else DailyForecasts)
+                    self.assertEqual(len(res.forecasts), int(forecast_type[:-1]))
@@ -1,6 +1,8 @@
 from unittest import TestCase
-from pyccuweather.froots import froot
+from pyccuweather.connector import Connection
+from pyccuweather.froots import froot, Router, FROOTS
 from pyccuweather import errors
+from tests.stubserver import TEST_API_KEY
 
 __author__ = 'CVoncsefalvay'
 
@@ -11,3 +13,35 @@ class TestFroot(TestCase):
         with self.assertRaises(errors.NotImplementedOrUnknownMethod):
             froot("120dforecast")
 
+
+    def test_froot_defaults(self):
+        self.assertEqual(froot("forecast_12h", location_key=330732),
+                         "http://apidev.accuweather.com/forecasts/v1/hourly/12hour/330732.json")
+        self.assertEqual(froot("loc_lkey", location_key=1, api_type="api", version=2),
+                         "http://api.accuweather.com/locations/v2/1.json")
+
+
+class TestRouter(TestCase):
+
+    def test_url(self):
+        router = Router("http://127.0.0.1:8080/", "v1")
+        self.assertEqual(router.url("loc_search"), "http://127.0.0.1:8080/locations/v1/search.json")
+        self.assertEqual(router.url("climo_month_summary", year=2015, month=6, location_key=330732),
+                         "http://127.0.0.1:8080/climo/v1/summary/2015/6/330732.json")
+        self.assertIn("forecast_45d", router)
+        with self.assertRaises(errors.NotImplementedOrUnknownMethod):
+            router.url("120dforecast")
+
+    def test_every_endpoint(self):
+        router = Router("http://api.accuweather.com", 1)
+        kwargs = {"location_key": 1, "country_code": "GB", "date": "2015/06/01", "year": 2015, "month": 6}
+        for fkeyid in FROOTS:
+            self.assertEqual(router.url(fkeyid, **kwargs), froot(fkeyid, api_type="api", **kwargs))
+
+    def test_connection_routing(self):
+        self.assertTrue(Connection(API_KEY=TEST_API_KEY, dev=False)._url("loc_search").startswith("http://api."))
+        self.assertTrue(Connection(API_KEY=TEST_API_KEY)._url("loc_search").startswith("http://apidev."))
+        conn = Connection(API_KEY=TEST_API_KEY, api_root="http://localhost:9000")
+        self.assertEqual(conn._url("loc_search"), "http://localhost:9000/locations/v1/search.json")
+        conn.API_VERSION = "v2"
+        self.assertEqual(conn._url("loc_search"), "http://localhost:9000/locations/v2/search.json")
@@ -0,0 +1,62 @@
+# coding=utf-8
+
+import gc
+from unittest import TestCase
+from pyccuweather.interning import InternTable
+from pyccuweather.objects import Location, Country, TimeZone, interned, INTERNED
+from tests.stubserver import load_fixture
+
+__author__ = 'CVoncsefalvay'
+
+
+class Thing(object):
+    __slots__ = ("name", "__weakref__")
+
+    def __init__(self, name):
+        self.name = name
+
+
+class TestInternTable(TestCase):
+
+    def test_shared(self):
+        table = InternTable()
+        a = table.get(Thing, "a", lambda: Thing("a"))
+        self.assertIs(table.get(Thing, "a", lambda: Thing("other")), a)
+        b = table.get(Thing, "b", lambda: Thing("b"))
+        self.assertIsNot(b, a)
+        self.assertEqual(table.stats(), {"instances": {"Thing": 2}, "hits": 1, "misses": 2})
+
+    def test_weak(self):
+        table = InternTable()
+        table.get(Thing, "a", lambda: Thing("a"))
+        gc.collect()
+        self.assertEqual(len(table), 0)
+
+
+class TestInternedLocations(TestCase):
+
+    def test_sub_entities_shared(self):
+        first = load_fixture("loc_geoposition")
+        second = load_fixture("loc_geoposition")
+        second["Key"] = "1"
+        a, b = Location(json=first), Location(json=second)
+        self.assertIs(a.country, b.country)
+        self.assertIs(a.region, b.region)
+        self.assertIs(a.administrative_area, b.administrative_area)
+        self.assertIs(a.timezone, b.timezone)
+
+        second["Country"]["ID"] = "XX"
+        self.assertIsNot(Location(json=second).country, a.country)
+
+    def test_timezone(self):
+        tz = interned(TimeZone, load_fixture("loc_geoposition")["TimeZone"])
+        self.assertTrue(tz.is_daylight_saving)
+        self.assertEqual(tz.next_offset_change.tm_year, 2015)
+        self.assertGreaterEqual(INTERNED.stats()["instances"]["TimeZone"], 1)
+
+    def test_objects_passed_through(self):
+        payload = load_fixture("loc_geoposition")
+        country = Country(identifier="GB", localized_name="UK", english_name="United Kingdom")
+        loc = Location(lkey="1", region=payload["Region"], country=country,
+                       administrative_area=payload["AdministrativeArea"], timezone=payload["TimeZone"])
+        self.assertIs(loc.country, country)
@@ -0,0 +1,62 @@
+# coding=utf-8
+
+import threading
+import time
+from unittest import TestCase
+from pyccuweather.connector import Connection
+from pyccuweather.objects import HourlyForecasts, DailyForecasts, HourlyForecast, LazyForecasts
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestLazyForecasts(TestCase):
+
+    def test_hourly_matches_eager(self):
+        payload = load_fixture("forecast_12h")
+        eager = HourlyForecasts(payload)
+        lazy = HourlyForecasts(payload, lazy=True)
+        self.assertIsInstance(lazy.forecasts, LazyForecasts)
+        self.assertEqual(list(lazy.forecasts), list(eager.forecasts))
+        self.assertEqual(lazy.forecasts.materialized, 0)
+        for key, each in eager.forecasts.items():
+            self.assertEqual(lazy.forecasts[key].temperature.C, each.temperature.C)
+            self.assertEqual(lazy.forecasts[key].wind.hdg, each.wind.hdg)
+        self.assertEqual(lazy.forecasts.materialized, len(payload))
+
+    def test_daily_builds_on_access(self):
+        payload = load_fixture("forecast_5d")
+        res = DailyForecasts(payload, lazy=True)
+        self.assertEqual(len(res.forecasts), 5)
+        first = next(iter(res.forecasts))
+        self.assertIn(first, res.forecasts)
+        self.assertIs(res.forecasts[first], res.forecasts[first])
+        self.assertEqual(res.forecasts.materialized, 1)
+        with self.assertRaises(KeyError):
+            res.forecasts["1900-01-01"]
+
+    def test_threads(self):
+        built = []
+
+        def factory(each, i):
+            time.sleep(0.05)
+            built.append(each)
+            return object()
+
+        forecasts = LazyForecasts(["a", "b"], [{"n": 0}, {"n": 1}], factory, release=True)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(forecasts["a"])) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(built, [{"n": 0}])
+        self.assertTrue(all(each is results[0] for each in results))
+        self.assertEqual(forecasts.materialized, 1)
+
+    def test_connection_lazy(self):
+        with StubServer({path_of("forecast_12h", location_key=330732): load_fixture("forecast_12h")}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, lazy=True)) as conn:
+                res = conn.get_forecast(forecast_type="12h", lkey=330732)
+        self.assertEqual(res.forecasts.materialized, 0)
+        self.assertIsInstance(next(iter(res.forecasts.values())), HourlyForecast)
@@ -0,0 +1,85 @@
+# coding=utf-8
+
+import asyncio
+from unittest import TestCase
+from pyccuweather import errors
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.cache import ResponseCache
+from pyccuweather.connector import Connection
+from pyccuweather.metrics import Histogram, Metrics
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestHistogram(TestCase):
+
+    def test_buckets(self):
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 2, 10, 11):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [(1, 2), (10, 4), (float("inf"), 5)])
+        self.assertEqual(histogram.sum, 24.5)
+        self.assertEqual(histogram.count, 5)
+
+
+class TestConnectionMetrics(TestCase):
+    def setUp(self):
+        self.stub = StubServer({
+            path_of("forecast_12h", location_key=330732): load_fixture("forecast_12h"),
+            path_of("loc_search"): [],
+            path_of("forecast_5d", location_key=330732): (503, {"Message": "Unavailable"}, {}),
+        }).__enter__()
+
+    def tearDown(self):
+        self.stub.__exit__(None, None, None)
+
+    def test_disabled(self):
+        conn = self.stub.route(Connection(API_KEY=TEST_API_KEY))
+        self.addCleanup(conn.close)
+        self.assertIsNone(conn.metrics)
+        self.assertEqual(len(conn.get_forecast("12h", 330732).forecasts), 12)
+
+    def test_sync(self):
+        conn = self.stub.route(Connection(API_KEY=TEST_API_KEY, retry=0, cache=ResponseCache(), metrics=True))
+        self.addCleanup(conn.close)
+        conn.get_forecast("12h", 330732)
+        conn.get_forecast("12h", 330732)
+        with self.assertRaises(errors.NoResultsError):
+            conn.loc_string("Nowhere")
+        with self.assertRaises(errors.APIError):
+            conn.get_forecast("5d", 330732)
+
+        snapshot = conn.metrics.snapshot()
+        hourly = snapshot["forecast_12h"]
+        self.assertEqual(sorted(hourly["latency"]), ["decode", "http", "parse"])
+        self.assertEqual(hourly["latency"]["http"]["count"], 1)
+        self.assertEqual(hourly["latency"]["parse"]["count"], 2)
+        self.assertEqual(hourly["payload_bytes"]["count"], 1)
+        self.assertGreater(hourly["payload_bytes"]["sum"], 10000)
+        self.assertEqual(hourly["lookups"], {"cache": 1, "miss": 1})
+        self.assertEqual(snapshot["loc_search"]["errors"], {"NoResultsError": 1})
+        self.assertEqual(snapshot["forecast_5d"]["errors"], {"APIError": 1})
+
+        text = conn.metrics.prometheus()
+        self.assertIn("# TYPE pyccuweather_phase_duration_seconds histogram", text)
+        self.assertIn('pyccuweather_phase_duration_seconds_bucket{endpoint="forecast_12h",phase="http",le="+Inf"} 1',
+                      text)
+        self.assertIn('pyccuweather_errors_total{endpoint="loc_search",error="NoResultsError"} 1', text)
+        self.assertIn('pyccuweather_lookups_total{endpoint="forecast_12h",source="cache"} 1', text)
+
+        conn.metrics.reset()
+        self.assertEqual(conn.metrics.snapshot(), {})
+
+    def test_async_coalescing(self):
+        metrics = Metrics()
+
+        async def main():
+            async with self.stub.route(AsyncConnection(API_KEY=TEST_API_KEY, metrics=metrics)) as conn:
+                return await asyncio.gather(*[conn.get_forecast("12h", 330732) for _ in range(5)])
+
+        asyncio.run(main())
+        hourly = metrics.snapshot()["forecast_12h"]
+        self.assertEqual(hourly["latency"]["http"]["count"], 1)
+        self.assertEqual(hourly["coalesced"], 4)
+        self.assertIn('pyccuweather_coalesced_total{endpoint="forecast_12h"} 4', metrics.prometheus())
@@ -0,0 +1,104 @@
+# coding=utf-8
+
+from unittest import TestCase
+from pyccuweather import errors
+from pyccuweather.connector import Connection
+from pyccuweather.ratelimit import RateLimiter, priority, INTERACTIVE, NORMAL, BACKGROUND
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def limiter(self, **kwargs):
+        return RateLimiter(clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def test_token_bucket(self):
+        limiter = self.limiter(rate=2, burst=3)
+        self.assertEqual([limiter.try_acquire() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(limiter.try_acquire(), 0.5)
+        self.clock.now += 0.5
+        self.assertEqual(limiter.try_acquire(), 0)
+
+        limiter.acquire()
+        self.assertEqual(self.clock.slept, [0.5])
+        self.assertEqual(limiter.stats()["delayed"]["normal"], 1)
+
+    def test_pre_emption(self):
+        limiter = self.limiter(rate=1, burst=1)
+        limiter.acquire(BACKGROUND)
+        # An interactive call starts waiting for the next token...
+        self.assertEqual(limiter._begin(INTERACTIVE), 1.0)
+        self.clock.now += 1.0
+        # ...and background calls are held back until it has had it.
+        self.assertGreater(limiter.try_acquire(BACKGROUND), 0)
+        self.assertEqual(limiter._retry(INTERACTIVE, 1.0), 0)
+        self.clock.now += 1.0
+        self.assertEqual(limiter.try_acquire(BACKGROUND), 0)
+        self.assertEqual(limiter.stats()["granted"], {"interactive": 1, "normal": 0, "background": 2})
+
+    def test_daily_quota(self):
+        limiter = self.limiter(rate=1000, burst=1000, daily_quota=10, quota_reserve=0.2)
+        for _ in range(8):
+            limiter.acquire(BACKGROUND)
+        with self.assertRaises(errors.QuotaExceededError):
+            limiter.acquire(BACKGROUND)
+        limiter.acquire(INTERACTIVE)
+        self.assertEqual(limiter.remaining(), 1)
+
+        self.clock.now += 24 * 3600 + RateLimiter.BUCKET
+        self.assertEqual(limiter.remaining(), 10)
+        self.assertEqual(limiter.stats()["rejected"], 1)
+
+    def test_quota_window(self):
+        limiter = self.limiter(rate=1000, burst=1000, daily_quota=10)
+        self.clock.now = 1059.0
+        limiter.acquire()
+        self.clock.now += 24 * 3600 - 1
+        self.assertEqual(limiter.remaining(), 9)
+        self.clock.now += 1 + RateLimiter.BUCKET
+        self.assertEqual(limiter.remaining(), 10)
+
+    def test_priority_of(self):
+        limiter = self.limiter(rate=1, priorities={"forecast_12h": BACKGROUND})
+        self.assertEqual(limiter.priority_of("currentconditions"), INTERACTIVE)
+        self.assertEqual(limiter.priority_of("forecast_240h"), BACKGROUND)
+        self.assertEqual(limiter.priority_of("forecast_12h"), BACKGROUND)
+        self.assertEqual(limiter.priority_of("forecast_5d"), NORMAL)
+        with priority(INTERACTIVE):
+            self.assertEqual(limiter.priority_of("forecast_240h"), INTERACTIVE)
+        self.assertEqual(limiter.priority_of("forecast_240h"), BACKGROUND)
+
+
+class TestConnectionRateLimit(TestCase):
+
+    def test_connection(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=10, burst=2, daily_quota=100, clock=clock, sleep=clock.sleep)
+        routes = {path_of("forecast_12h", location_key=k): load_fixture("forecast_12h") for k in range(5)}
+        with StubServer(routes) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, rate_limiter=limiter)) as conn:
+                with priority(BACKGROUND):
+                    res = list(conn.get_forecast_many("12h", range(5), max_workers=1))
+
+        self.assertTrue(all(each.ok for each in res))
+        stats = limiter.stats()
+        self.assertEqual(stats["granted"]["background"], 5)
+        self.assertEqual(stats["used_today"], 5)
+        self.assertEqual(len(clock.slept), 3)
@@ -0,0 +1,90 @@
+# coding=utf-8
+
+from unittest import TestCase
+from pyccuweather.connector import Connection
+from pyccuweather.objects import HourlyForecasts, DailyForecasts, HourlyForecast, DailyForecast, Hemiurnal, \
+    Observation, CurrentObs, AirQuality, ClimoDay, ClimoActuals, ClimoRecords, ClimoNormals, CompactJSON, RAW_POLICIES
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestRawRetention(TestCase):
+
+    def test_keep(self):
+        payload = load_fixture("forecast_12h")
+        res = HourlyForecasts(payload)
+        self.assertIs(res.raw, payload)
+        self.assertIs(next(iter(res.forecasts.values())).raw, payload[0])
+
+    def test_drop(self):
+        res = DailyForecasts(load_fixture("forecast_5d"), raw="drop")
+        self.assertIsNone(res.raw)
+        first = next(iter(res.forecasts.values()))
+        self.assertIsNone(first.raw)
+        self.assertIsNone(first.day.raw)
+        self.assertTrue(res.at("2015-06-03T12:00:00+01:00").date.startswith("2015-06-03"))
+        with self.assertRaises(ValueError):
+            res.to_arrays()
+
+    def test_compact(self):
+        payload = load_fixture("forecast_5d")
+        res = DailyForecasts(payload, raw="compact")
+        self.assertIsInstance(res._raw, CompactJSON)
+        self.assertEqual(res.raw, payload)
+        first = next(iter(res.forecasts.values()))
+        self.assertIs(first._raw.data, res._raw.data)
+        self.assertEqual(first.night.raw, payload["DailyForecasts"][0]["Night"])
+        self.assertEqual(res.to_arrays().rows, 5)
+
+    def test_lazy_releases_sources(self):
+        payload = load_fixture("forecast_12h")
+        res = HourlyForecasts(payload, lazy=True, raw="compact")
+        key = next(iter(res.forecasts))
+        self.assertEqual(res.forecasts[key].raw, payload[0])
+        self.assertIsNone(res.forecasts._sources[0])
+        self.assertIsNotNone(payload[0])
+
+    def test_current(self):
+        payload = load_fixture("currentconditions")
+        res = CurrentObs(payload)
+        self.assertIs(res.raw, payload)
+        with self.assertRaises(TypeError):
+            CurrentObs(payload, raw="drop")
+
+    def test_every_policy(self):
+        # Each type taking a retention policy, with the fixture and the part of it the type is parsed from.
+        types = [(HourlyForecasts, "forecast_12h", lambda json: json),
+                 (DailyForecasts, "forecast_5d", lambda json: json),
+                 (HourlyForecast, "forecast_12h", lambda json: json[0]),
+                 (DailyForecast, "forecast_5d", lambda json: json["DailyForecasts"][0]),
+                 (Hemiurnal, "forecast_5d", lambda json: json["DailyForecasts"][0]["Day"]),
+                 (Observation, "currentconditions", lambda json: json[0]),
+                 (AirQuality, "airquality_current", lambda json: json),
+                 (ClimoDay, "climo_actuals_date", lambda json: json),
+                 (ClimoActuals, "climo_actuals_range", lambda json: json),
+                 (ClimoRecords, "climo_records_range", lambda json: json),
+                 (ClimoNormals, "climo_normals_range", lambda json: json)]
+        for cls, fixture, part in types:
+            for policy in RAW_POLICIES:
+                with self.subTest(cls=cls.__name__, raw=policy):
+                    payload = part(load_fixture(fixture))
+                    res = cls(payload, raw=policy)
+                    if policy == "keep":
+                        self.assertIs(res.raw, payload)
+                    elif policy == "drop":
+                        self.assertIsNone(res.raw)
+                    else:
+                        self.assertIsInstance(res._raw, CompactJSON)
+                        self.assertEqual(res.raw, payload)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            HourlyForecasts(load_fixture("forecast_12h"), raw="zip")
+
+    def test_connection_policy(self):
+        with StubServer({path_of("forecast_12h", location_key=330732): load_fixture("forecast_12h")}) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, raw="drop", coalesce=False)) as conn:
+                self.assertIsNone(conn.get_forecast(forecast_type="12h", lkey=330732).raw)
+                compact = conn.get_forecast(forecast_type="12h", lkey=330732, raw="compact")
+                self.assertTrue(compact.raw[0]["EpochDateTime"])
@@ -0,0 +1,87 @@
+# coding=utf-8
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+from pyccuweather import errors
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.connector import Connection
+from pyccuweather.objects import Location, HourlyForecasts
+from pyccuweather.replay import Recording, RecordingTransport, ReplayTransport, recording_key
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestRecordReplay(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "recording.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def record(self):
+        with StubServer({
+            path_of("loc_geoposition"): load_fixture("loc_geoposition"),
+            path_of("forecast_12h", location_key=330732): load_fixture("forecast_12h"),
+            path_of("forecast_24h", location_key=330732): (503, {"Message": "Unavailable"}, {}),
+        }) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, retry=0,
+                                       transport=RecordingTransport(self.path))) as conn:
+                conn.loc_geoposition(50.905, -1.397)
+                conn.get_forecast("12h", 330732)
+                with self.assertRaises(errors.APIError):
+                    conn.get_forecast("24h", 330732)
+
+    def test_key(self):
+        self.assertEqual(recording_key("http://api.accuweather.com/locations/v1/search.json",
+                                       {"q": "x", "apikey": "k"}),
+                         "/locations/v1/search.json?q=x")
+        self.assertEqual(recording_key("http://127.0.0.1:8080/locations/v1/search.json", {"q": "x"}),
+                         "/locations/v1/search.json?q=x")
+
+    def test_replay(self):
+        self.record()
+        recording = Recording(self.path)
+        self.assertEqual(len(recording), 2)
+        transport = ReplayTransport(recording)
+        with Connection(API_KEY=TEST_API_KEY, transport=transport) as conn:
+            self.assertIsInstance(conn.loc_geoposition(50.905, -1.397), Location)
+            res = conn.get_forecast("12h", 330732)
+            self.assertIsInstance(res, HourlyForecasts)
+            self.assertEqual(len(res.forecasts), 12)
+            with self.assertRaises(errors.NotRecordedError):
+                conn.get_forecast("24h", 330732)
+        self.assertEqual(transport.stats(), {"responses": 2, "hits": 2, "injected": 0})
+
+    def test_latency_and_errors(self):
+        self.record()
+        with Connection(API_KEY=TEST_API_KEY, retry=0, circuit_breaker=False,
+                        transport=ReplayTransport(self.path, latency=0.05, error_rate=1.0)) as conn:
+            started = time.monotonic()
+            with self.assertRaises(errors.APIError):
+                conn.get_forecast("12h", 330732)
+            self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+        transport = ReplayTransport(self.path, error_rate=0.3, seed=1)
+        with Connection(API_KEY=TEST_API_KEY, retry=10, circuit_breaker=False, transport=transport) as conn:
+            conn.retry.delay = lambda attempt, retry_after=None: 0
+            for _ in range(20):
+                self.assertEqual(len(conn.get_forecast("12h", 330732).forecasts), 12)
+        self.assertEqual(transport.hits, 20)
+        self.assertGreater(transport.injected, 0)
+
+    def test_async_replay(self):
+        self.record()
+
+        async def main():
+            async with AsyncConnection(API_KEY=TEST_API_KEY, transport=ReplayTransport(self.path)) as conn:
+                return await asyncio.gather(*[conn.get_forecast("12h", 330732) for _ in range(3)])
+
+        self.assertTrue(all(len(res.forecasts) == 12 for res in asyncio.run(main())))
+        with self.assertRaises(TypeError):
+            AsyncConnection(API_KEY=TEST_API_KEY, transport=RecordingTransport(":memory:"))
@@ -0,0 +1,213 @@
+# coding=utf-8
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest import TestCase
+import requests
+from requests.structures import CaseInsensitiveDict
+from pyccuweather import errors
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.connector import Connection
+from pyccuweather.objects import HourlyForecasts
+from pyccuweather.retry import RetryPolicy, CircuitBreaker, CircuitBreakers, parse_retry_after, CLOSED, OPEN, \
+    HALF_OPEN
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def flaky(failures, status=503, headers=None):
+    state = {"calls": 0}
+
+    def route(path, query):
+        state["calls"] += 1
+        if state["calls"] <= failures:
+            return status, {"Message": "Service unavailable"}, headers or {}
+        return 200, load_fixture("forecast_12h"), {}
+    return route
+
+
+class ScriptedTransport(object):
+    """
+    A transport answering each request with the next outcome of a script: an HTTP status, answered with the 12h
+    forecast fixture, or an exception to raise.
+    """
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+
+    def get(self, url: str, params: dict=None, timeout=None):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        resp = requests.Response()
+        resp.status_code = outcome
+        resp.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        resp._content = json.dumps(load_fixture("forecast_12h")).encode("utf-8")
+        resp.url = url
+        return resp
+
+    async def get_async(self, url: str, params: dict=None, timeout=None):
+        return self.get(url, params, timeout)
+
+    def close(self):
+        pass
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_parse_retry_after(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertEqual(parse_retry_after("120"), 120)
+        now = datetime(2015, 10, 21, 7, 28, 0, tzinfo=timezone.utc)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=now), 30)
+        self.assertIsNone(parse_retry_after("soon"))
+
+    def test_delay(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+        self.assertEqual([policy.delay(n) for n in range(5)], [1, 2, 4, 5, 5])
+        self.assertEqual(policy.delay(0, retry_after=60), 60)
+        self.assertEqual(RetryPolicy(max_retry_after=10).delay(0, retry_after=60), 10)
+        self.assertEqual(RetryPolicy(backoff=1, random=lambda: 0.5).delay(2), 2)
+
+
+class TestCircuitBreaker(TestCase):
+
+    def test_state_machine(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("forecast_12h", failure_threshold=2, reset_timeout=10, clock=clock)
+        for _ in range(2):
+            breaker.allow()
+            breaker.failure()
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(errors.CircuitOpenError):
+            breaker.allow()
+
+        clock.now = 10
+        breaker.allow()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(errors.CircuitOpenError):
+            breaker.allow()
+        breaker.failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        clock.now = 20
+        breaker.allow()
+        breaker.success()
+        self.assertEqual(breaker.snapshot(), {"state": CLOSED, "failures": 0, "rejected": 2})
+
+
+    def test_release(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("forecast_12h", failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.allow()
+        breaker.failure()
+        clock.now = 11
+        breaker.allow()
+        breaker.release()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.allow()
+        breaker.success()
+        self.assertEqual(breaker.snapshot(), {"state": CLOSED, "failures": 0, "rejected": 0})
+
+
+class TestConnectionRetries(TestCase):
+
+    def conn(self, stub, **kwargs):
+        return stub.route(Connection(API_KEY=TEST_API_KEY, retry=RetryPolicy(retries=2, backoff=0.001), **kwargs))
+
+    def test_transient_failures(self):
+        with StubServer({path_of("forecast_12h", location_key=1): flaky(2)}) as stub:
+            with self.conn(stub) as conn:
+                self.assertIsInstance(conn.get_forecast("12h", 1), HourlyForecasts)
+        self.assertEqual(len(stub.requests), 3)
+
+    def test_retry_after(self):
+        with StubServer({path_of("forecast_12h", location_key=1): flaky(1, 429, {"Retry-After": "0"})}) as stub:
+            with self.conn(stub) as conn:
+                self.assertIsInstance(conn.get_forecast("12h", 1), HourlyForecasts)
+        self.assertEqual(len(stub.requests), 2)
+
+    def test_exhausted(self):
+        with StubServer({path_of("forecast_12h", location_key=1): flaky(10)}) as stub:
+            with self.conn(stub) as conn:
+                with self.assertRaises(errors.APIError) as ctx:
+                    conn.get_forecast("12h", 1)
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(len(stub.requests), 3)
+
+    def test_not_retried(self):
+        with StubServer({}) as stub:
+            with self.conn(stub) as conn:
+                self.assertEqual(conn.get_alerts(1, 1).status_code, 404)
+        self.assertEqual(len(stub.requests), 1)
+
+    def test_connection_error(self):
+        with StubServer({}) as stub:
+            conn = self.conn(stub)
+        with self.assertRaises(errors.APIConnectionError):
+            conn.get_forecast("12h", 1)
+
+    def test_circuit_opens(self):
+        with StubServer({path_of("forecast_12h", location_key=1): flaky(100)}) as stub:
+            with self.conn(stub) as conn:
+                with self.assertRaises(errors.APIError):
+                    conn.get_forecast("12h", 1)
+                # The fifth consecutive failure opens the circuit while the second call is still retrying.
+                for _ in range(2):
+                    with self.assertRaises(errors.CircuitOpenError):
+                        conn.get_forecast("12h", 1)
+
+        self.assertEqual(len(stub.requests), 5)
+        self.assertEqual(conn.circuit_breakers.states()["forecast_12h"]["state"], OPEN)
+
+    def test_async(self):
+        async def main(stub):
+            conn = stub.route(AsyncConnection(API_KEY=TEST_API_KEY, retry=RetryPolicy(retries=2, backoff=0.001)))
+            async with conn:
+                return await conn.get_forecast("12h", 1)
+
+        with StubServer({path_of("forecast_12h", location_key=1): flaky(2)}) as stub:
+            self.assertIsInstance(asyncio.run(main(stub)), HourlyForecasts)
+        self.assertEqual(len(stub.requests), 3)
+
+    def probe_raises(self, conn, clock, run):
+        with self.assertRaises(errors.APIError):
+            run(conn.get_forecast("12h", 1))
+        self.assertEqual(conn.circuit_breakers.states()["forecast_12h"]["state"], OPEN)
+        clock.now += 60
+        # The half-open probe raises an error that says nothing about the endpoint's health...
+        with self.assertRaises(errors.NotRecordedError):
+            run(conn.get_forecast("12h", 1))
+        self.assertEqual(conn.circuit_breakers.states()["forecast_12h"]["state"], HALF_OPEN)
+        # ...so the next call is let through as a probe, rather than rejected for good.
+        self.assertIsInstance(run(conn.get_forecast("12h", 1)), HourlyForecasts)
+        self.assertEqual(conn.circuit_breakers.states()["forecast_12h"]["state"], CLOSED)
+
+    def test_probe_error_releases_circuit(self):
+        clock = FakeClock()
+        conn = Connection(API_KEY=TEST_API_KEY, retry=0, cache=False, coalesce=False,
+                          circuit_breaker=CircuitBreakers(failure_threshold=1, reset_timeout=30, clock=clock),
+                          transport=ScriptedTransport(503, errors.NotRecordedError("forecast_12h"), 200))
+        with conn:
+            self.probe_raises(conn, clock, lambda result: result)
+
+    def test_probe_error_releases_circuit_async(self):
+        clock = FakeClock()
+        loop = asyncio.new_event_loop()
+        conn = AsyncConnection(API_KEY=TEST_API_KEY, retry=0, cache=False, coalesce=False,
+                               circuit_breaker=CircuitBreakers(failure_threshold=1, reset_timeout=30, clock=clock),
+                               transport=ScriptedTransport(503, errors.NotRecordedError("forecast_12h"), 200))
+        try:
+            self.probe_raises(conn, clock, loop.run_until_complete)
+        finally:
+            loop.run_until_complete(conn.close())
+            loop.close()
@@ -0,0 +1,144 @@
+# coding=utf-8
+
+import asyncio
+import threading
+import time
+from unittest import TestCase
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.connector import Connection
+from pyccuweather.singleflight import SingleFlight
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestSingleFlight(TestCase):
+
+    def test_threads(self):
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            release.wait()
+            return object()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(group.do("k", fn))) for _ in range(10)]
+        for t in threads:
+            t.start()
+        while group.coalesced < 9:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(group.stats(), {"in_flight": 0, "executed": 1, "coalesced": 9})
+
+        group.do("k", lambda: None)
+        self.assertEqual(group.executed, 2)
+
+    def test_error_shared(self):
+        group = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise KeyError("boom")
+
+        async def main():
+            return await asyncio.gather(*[group.do_async("k", fail) for _ in range(5)], return_exceptions=True)
+
+        res = asyncio.run(main())
+        self.assertTrue(all(isinstance(e, KeyError) for e in res))
+        self.assertEqual(group.executed, 1)
+        self.assertEqual(group.coalesced, 4)
+
+
+    def test_leader_cancelled(self):
+        group = SingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def main():
+            leader = asyncio.ensure_future(group.do_async("k", fn))
+            await asyncio.sleep(0)
+            waiters = [asyncio.ensure_future(group.do_async("k", fn)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return leader, await asyncio.gather(*waiters)
+
+        leader, res = asyncio.run(main())
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(res, [2, 2, 2])
+        self.assertEqual(group.executed, 2)
+        self.assertEqual(group.stats()["in_flight"], 0)
+
+class TestConnectionCoalescing(TestCase):
+
+    def setUp(self):
+        def slow(path, query):
+            time.sleep(0.2)
+            return 200, load_fixture("forecast_12h"), {}
+
+        self.stub = StubServer({path_of("forecast_12h", location_key=1): slow}).__enter__()
+
+    def tearDown(self):
+        self.stub.__exit__(None, None, None)
+
+    def test_threads(self):
+        with self.stub.route(Connection(API_KEY=TEST_API_KEY)) as conn:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(conn.get_forecast("12h", 1)))
+                       for _ in range(20)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(conn.single_flight.coalesced, 19)
+
+    def test_raw_policies_not_shared(self):
+        with self.stub.route(Connection(API_KEY=TEST_API_KEY, cache=False)) as conn:
+            results = {}
+            threads = [threading.Thread(target=lambda raw=raw: results.__setitem__(
+                raw, conn.get_forecast("12h", 1, raw=raw))) for raw in ("keep", "drop", "keep")]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(self.stub.requests), 2)
+        self.assertEqual(conn.single_flight.coalesced, 1)
+        self.assertIsNone(results["drop"].raw)
+        self.assertEqual(len(results["keep"].raw), 12)
+        self.assertEqual(len(results["keep"].to_arrays()["temperature"]), 12)
+
+    def test_async(self):
+        async def main():
+            async with self.stub.route(AsyncConnection(API_KEY=TEST_API_KEY)) as conn:
+                res = await asyncio.gather(*[conn.get_forecast("12h", 1) for _ in range(20)])
+                return conn, res
+
+        conn, res = asyncio.run(main())
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(conn.single_flight.coalesced, 19)
+
+    def test_disabled(self):
+        with self.stub.route(Connection(API_KEY=TEST_API_KEY, coalesce=False, pool_maxsize=5)) as conn:
+            threads = [threading.Thread(target=lambda: conn.get_forecast("12h", 1)) for _ in range(5)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(self.stub.requests), 5)
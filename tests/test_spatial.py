@@ -0,0 +1,73 @@
+# coding=utf-8
+
+from unittest import TestCase
+from pyccuweather.connector import Connection
+from pyccuweather.spatial import GeoIndex, haversine
+from pyccuweather.store import LocationStore
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestGeoIndex(TestCase):
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine(51.5074, -0.1278, 48.8566, 2.3522), 343.5, delta=1)
+        self.assertEqual(haversine(10.0, 20.0, 10.0, 20.0), 0)
+
+    def test_nearest(self):
+        index = GeoIndex(radius_km=1.0)
+        index.add(50.0, 0.0, {"Key": "a"})
+        index.add(50.0, 0.02, {"Key": "b"})
+
+        self.assertEqual(index.nearest(50.0, 0.004)["Key"], "a")
+        self.assertEqual(index.nearest(50.0, 0.016)["Key"], "b")
+        self.assertIsNone(index.nearest(50.0, 0.05))
+        self.assertEqual(index.nearest(50.008, 0.0)["Key"], "a")
+        self.assertEqual(index.stats(), {"points": 2, "hits": 3, "misses": 1})
+
+    def test_high_latitude(self):
+        index = GeoIndex(radius_km=5.0)
+        index.add(78.22, 15.65, {"Key": "longyearbyen"})
+        # 0.15 degrees of longitude is less than 4 km here, but spans several grid cells.
+        self.assertEqual(index.nearest(78.22, 15.80)["Key"], "longyearbyen")
+
+    def test_cell_boundary(self):
+        index = GeoIndex(radius_km=1.0)
+        index.add(0.0, 0.0, {"Key": "a"})
+        self.assertEqual(index.nearest(-0.005, -0.005)["Key"], "a")
+
+
+class TestConnectionGeoIndex(TestCase):
+
+    def test_antimeridian(self):
+        index = GeoIndex(radius_km=5.0)
+        index.add(-16.5, -179.99, {"Key": "east"})
+        index.add(-16.5, 179.995, {"Key": "west"})
+        self.assertEqual(index.nearest(-16.5, 179.99)["Key"], "west")
+        self.assertEqual(index.nearest(-16.5, -179.995)["Key"], "east")
+        self.assertEqual(index.nearest(-16.5, 179.97)["Key"], "west")
+        self.assertEqual(index.nearest(-16.5, 180.0)["Key"], "west")
+
+        index = GeoIndex(radius_km=1.0)
+        index.add(-16.5, -179.996, {"Key": "east"})
+        self.assertEqual(index.nearest(-16.5, 179.996)["Key"], "east")
+
+    def test_snap(self):
+        location = load_fixture("loc_geoposition")
+        with StubServer({path_of("loc_geoposition"): location}) as stub:
+            store = LocationStore(":memory:")
+            with stub.route(Connection(API_KEY=TEST_API_KEY, geo_index=0.5, location_store=store)) as conn:
+                fixes = [(50.9100 + i * 0.0004, -1.4000) for i in range(10)]
+                res = list(conn.loc_geoposition_many(fixes[:1]))
+                res += list(conn.loc_geoposition_many(fixes[1:]))
+                self.assertTrue(all(each.ok and each.result.lkey == "330732" for each in res))
+                self.assertEqual(conn.loc_geoposition(50.905, -1.397).lkey, "330732")
+
+            self.assertEqual(len(stub.requests), 1)
+
+            with stub.route(Connection(API_KEY=TEST_API_KEY, geo_index=0.5, location_store=store)) as conn:
+                self.assertEqual(len(conn.geo_index), 2)
+                conn.loc_geoposition(50.9102, -1.4003)
+
+            self.assertEqual(len(stub.requests), 1)
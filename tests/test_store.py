@@ -0,0 +1,75 @@
+# coding=utf-8
+
+import asyncio
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.connector import Connection
+from pyccuweather.objects import Location
+from pyccuweather.store import LocationStore
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestLocationStore(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "locations.db")
+        self.location = load_fixture("loc_geoposition")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_persistence(self):
+        store = LocationStore(self.path)
+        store.record("loc_postcode", {"country_code": "gb"}, {"q": "SO14", "apikey": "x"}, [self.location])
+        store.record("loc_geoposition", {}, {"q": "50.9051,-1.3971"}, self.location)
+        store.close()
+
+        for warm in (True, False):
+            store = LocationStore(self.path, warm=warm)
+            self.assertEqual(len(store), 1)
+            self.assertEqual(store.lookup("loc_postcode", {"country_code": "GB"}, {"q": "SO14"}), self.location)
+            self.assertEqual(store.lookup("loc_geoposition", {}, {"q": "50.9049,-1.3968"}), self.location)
+            self.assertIsNone(store.lookup("loc_geoposition", {}, {"q": "50.9100,-1.3968"}))
+            self.assertEqual(store.lookup("loc_lkey", {"location_key": 330732}, {}), self.location)
+            self.assertIsNone(store.lookup("loc_ip_address", {}, {"q": "127.0.0.1"}))
+            self.assertEqual(store.stats(), {"locations": 1, "hits": 3, "misses": 2})
+            store.close()
+
+    def test_wal_mode(self):
+        store = LocationStore(self.path)
+        self.assertEqual(store._db.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        store.close()
+
+    def test_connection(self):
+        routes = {path_of("loc_postcode", country_code="GB"): [self.location]}
+        with StubServer(routes) as stub:
+            with stub.route(Connection(API_KEY=TEST_API_KEY, location_store=self.path)) as conn:
+                self.assertIsInstance(conn.loc_postcode("GB", "SO14"), Location)
+            with stub.route(Connection(API_KEY=TEST_API_KEY, location_store=self.path)) as conn:
+                res = conn.loc_postcode("GB", "SO14")
+                self.assertEqual(res.lkey, "330732")
+                self.assertIsInstance(conn.loc_lkey(330732), Location)
+
+        self.assertEqual(len(stub.requests), 1)
+
+    def test_async_connection(self):
+        async def lookup(conn):
+            return await conn.loc_postcode("GB", "SO14"), await conn.loc_postcode("GB", "SO14")
+
+        async def main():
+            async with stub.route(AsyncConnection(API_KEY=TEST_API_KEY, location_store=self.path)) as conn:
+                return await lookup(conn)
+
+        with StubServer({path_of("loc_postcode", country_code="GB"): [self.location]}) as stub:
+            first, second = asyncio.run(main())
+        self.assertEqual(first.lkey, "330732")
+        self.assertEqual(second.lkey, "330732")
+        self.assertEqual(len(stub.requests), 1)
+        store = LocationStore(self.path)
+        self.assertEqual(len(store), 1)
+        store.close()
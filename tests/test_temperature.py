@@ -24,3 +24,9 @@ class TestTemperature(TestCase):
         self.assertAlmostEqual(t_u_f.C, 110, delta=2)
         self.assertEqual(t_u_c.C, -123)
 
+
+    def test_slots(self):
+        t = Temperature(value=12.5)
+        self.assertFalse(hasattr(t, "__dict__"))
+        with self.assertRaises(AttributeError):
+            t.kelvin = 285.65
@@ -0,0 +1,85 @@
+# coding=utf-8
+
+from datetime import datetime, timezone
+from unittest import TestCase
+from pyccuweather.objects import HourlyForecasts, DailyForecasts, CurrentObs
+from pyccuweather.timeindex import EpochIndex, TimeIndexed, parse_iso, to_epoch
+from tests.stubserver import load_fixture
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestParsing(TestCase):
+
+    def test_parse_iso(self):
+        t = parse_iso("2015-06-01T09:00:00+01:00")
+        self.assertEqual(t, datetime(2015, 6, 1, 8, tzinfo=timezone.utc))
+        self.assertIs(parse_iso("2015-06-01T09:00:00+01:00"), t)
+        self.assertEqual(parse_iso("2015-10-25T01:00:00Z"), datetime(2015, 10, 25, 1, tzinfo=timezone.utc))
+
+    def test_to_epoch(self):
+        self.assertEqual(to_epoch(1433145600), 1433145600)
+        self.assertEqual(to_epoch("2015-06-01T09:00:00+01:00"), 1433145600)
+        self.assertEqual(to_epoch(datetime(2015, 6, 1, 8)), 1433145600)
+        with self.assertRaises(TypeError):
+            to_epoch([])
+
+
+class TestEpochIndex(TestCase):
+
+    def setUp(self):
+        self.index = EpochIndex([30, 10, 20], ["c", "a", "b"])
+
+    def test_sorted(self):
+        self.assertEqual(self.index.keys, ["a", "b", "c"])
+
+    def test_at_or_before(self):
+        self.assertIsNone(self.index.at_or_before(5))
+        self.assertEqual(self.index.at_or_before(10), "a")
+        self.assertEqual(self.index.at_or_before(29), "b")
+        self.assertEqual(self.index.at_or_before(100), "c")
+
+    def test_nearest(self):
+        self.assertEqual(self.index.nearest(0), "a")
+        self.assertEqual(self.index.nearest(15), "a")
+        self.assertEqual(self.index.nearest(16), "b")
+        self.assertEqual(self.index.nearest(100), "c")
+        self.assertIsNone(EpochIndex([], []).nearest(0))
+
+    def test_between(self):
+        self.assertEqual(self.index.between(10, 30), ["a", "b"])
+        self.assertEqual(self.index.between(11), ["b", "c"])
+        self.assertEqual(self.index.between(end=20), ["a"])
+
+
+class TestSeriesLookups(TestCase):
+
+    def test_hourly(self):
+        res = HourlyForecasts(load_fixture("forecast_12h"), lazy=True)
+        # 14:37 BST falls within the 14:00 forecast
+        forecast = res.at("2015-06-01T13:37:00Z")
+        self.assertEqual(forecast.datetime, "2015-06-01T14:00:00+01:00")
+        self.assertEqual(res.nearest("2015-06-01T13:37:00Z").datetime, "2015-06-01T15:00:00+01:00")
+        self.assertEqual([f.datetime[11:13] for f in res.between("2015-06-01T10:00:00+01:00",
+                                                                "2015-06-01T13:00:00+01:00")],
+                         ["10", "11", "12"])
+        self.assertEqual(res.forecasts.materialized, 5)
+        self.assertIsNone(res.at(0))
+
+    def test_daily(self):
+        res = DailyForecasts(load_fixture("forecast_5d"))
+        self.assertTrue(res.at("2015-06-03T12:00:00+01:00").date.startswith("2015-06-03"))
+        self.assertEqual(len(res.between(end="2015-06-03T00:00:00+01:00")), 2)
+
+    def test_current(self):
+        res = CurrentObs(load_fixture("currentconditions"))
+        self.assertEqual(res.nearest(0)["EpochTime"], 1433159700)
+        self.assertIn("2015-06-01T12:55:00+01:00", str(res))
+
+    def test_incomplete_subclass(self):
+        class Entries(TimeIndexed):
+            def _entries(self):
+                return {}
+
+        with self.assertRaises(TypeError):
+            Entries()
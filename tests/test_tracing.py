@@ -0,0 +1,101 @@
+# coding=utf-8
+
+import asyncio
+from unittest import TestCase
+from pyccuweather import errors
+from pyccuweather.aio import AsyncConnection
+from pyccuweather.connector import Connection
+from pyccuweather.tracing import Hook, Profiler
+from tests.stubserver import StubServer, load_fixture, path_of, TEST_API_KEY
+
+__author__ = 'CVoncsefalvay'
+
+
+class Recorder(Hook):
+    def __init__(self):
+        self.events = []
+
+    def start(self, span):
+        self.events.append(("start", span.name))
+
+    def end(self, span):
+        self.events.append(("end", span.name))
+        span.context = dict(span.attributes, error=span.error, seconds=span.duration)
+
+
+class TestTracing(TestCase):
+    def setUp(self):
+        self.stub = StubServer({
+            path_of("forecast_12h", location_key=330732): load_fixture("forecast_12h"),
+            path_of("loc_search"): [],
+        }).__enter__()
+
+    def tearDown(self):
+        self.stub.__exit__(None, None, None)
+
+    def test_no_hooks(self):
+        conn = self.stub.route(Connection(API_KEY=TEST_API_KEY))
+        self.addCleanup(conn.close)
+        self.assertIsNone(conn.tracer)
+        hook = Recorder()
+        conn.add_hook(hook)
+        conn.remove_hook(hook)
+        self.assertIsNone(conn.tracer)
+
+    def test_spans(self):
+        hook = Recorder()
+        spans = []
+        conn = self.stub.route(Connection(API_KEY=TEST_API_KEY, hooks=[hook]))
+        self.addCleanup(conn.close)
+        conn.add_hook(type("Collector", (Hook,), {"end": lambda self, span: spans.append(span)})())
+        conn.get_forecast("12h", 330732)
+
+        self.assertEqual(hook.events,
+                         [("start", "call"), ("start", "route"), ("end", "route"), ("start", "http"),
+                          ("end", "http"), ("start", "decode"), ("end", "decode"), ("start", "parse"),
+                          ("end", "parse"), ("end", "call")])
+        call = spans[-1]
+        self.assertEqual(call.name, "call")
+        self.assertIsNone(call.parent)
+        self.assertEqual(call.context["endpoint"], "forecast_12h")
+        self.assertEqual(call.context["lkey"], 330732)
+        self.assertEqual(call.context["source"], "miss")
+        self.assertEqual([child.name for child in call.children], ["route", "http", "decode", "parse"])
+        route, http, decode, parse = call.children
+        self.assertTrue(route.context["url"].endswith("/forecasts/v1/hourly/12hour/330732.json"))
+        self.assertEqual(http.context["status"], 200)
+        self.assertGreater(http.context["bytes"], 10000)
+        self.assertEqual(parse.context["model"], "HourlyForecasts")
+        self.assertEqual(parse.context["endpoint"], "forecast_12h")
+        self.assertGreater(sum(call.breakdown().values()), 0)
+        self.assertLessEqual(sum(call.breakdown().values()), call.duration)
+
+    def test_error(self):
+        hook = Recorder()
+        conn = self.stub.route(Connection(API_KEY=TEST_API_KEY, hooks=[hook]))
+        self.addCleanup(conn.close)
+        spans = []
+        conn.add_hook(type("Collector", (Hook,), {"end": lambda self, span: spans.append(span)})())
+        with self.assertRaises(errors.NoResultsError):
+            conn.loc_string("Nowhere")
+        parse, call = spans[-2:]
+        self.assertIsInstance(parse.error, errors.NoResultsError)
+        self.assertIs(call.error, parse.error)
+
+    def test_profiler_async(self):
+        profiler = Profiler(keep=2)
+
+        async def main():
+            async with self.stub.route(AsyncConnection(API_KEY=TEST_API_KEY, hooks=[profiler],
+                                                       coalesce=False)) as conn:
+                for _ in range(3):
+                    await conn.get_forecast("12h", 330732)
+
+        asyncio.run(main())
+        totals = profiler.totals()
+        self.assertEqual(totals[("forecast_12h", "call")][0], 3)
+        self.assertEqual(totals[("forecast_12h", "http")][0], 3)
+        slowest = profiler.slowest()
+        self.assertEqual(len(slowest), 2)
+        self.assertGreaterEqual(slowest[0]["seconds"], slowest[1]["seconds"])
+        self.assertEqual(sorted(slowest[0]["phases"]), ["decode", "http", "parse", "route"])
@@ -0,0 +1,67 @@
+# coding=utf-8
+
+from threading import Thread
+from unittest import TestCase
+from pyccuweather.connector import Connection
+from pyccuweather.transport import SessionPool
+from tests.stubserver import StubServer
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestSessionPool(TestCase):
+
+    def test_keep_alive(self):
+        with StubServer({"/ping.json": {"ok": True}}) as stub:
+            pool = SessionPool()
+            for _ in range(5):
+                self.assertEqual(pool.get(stub.url + "/ping.json").json(), {"ok": True})
+            pool.close()
+
+        self.assertEqual(len(stub.requests), 5)
+        self.assertEqual(len(stub.connections), 1)
+
+    def test_threads_share_connections(self):
+        with StubServer({"/ping.json": {"ok": True}}) as stub:
+            pool = SessionPool(pool_maxsize=2, pool_block=True)
+
+            def worker():
+                for _ in range(10):
+                    pool.get(stub.url + "/ping.json")
+
+            threads = [Thread(target=worker) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            pool.close()
+
+        self.assertEqual(len(stub.requests), 40)
+        self.assertLessEqual(len(stub.connections), 2)
+
+    def test_prepared_reused(self):
+        with StubServer({"/ping.json": {"ok": True}}) as stub:
+            pool = SessionPool(prepared=2)
+            first = pool.prepare(stub.url + "/ping.json", {"q": "a", "apikey": "k"})
+            self.assertIs(pool.prepare(stub.url + "/ping.json", {"apikey": "k", "q": "a"}), first)
+            self.assertIsNot(pool.prepare(stub.url + "/ping.json", {"q": "b"}), first)
+            pool.prepare(stub.url + "/ping.json", {"q": "c"})
+            self.assertIsNot(pool.prepare(stub.url + "/ping.json", {"q": "a", "apikey": "k"}), first)
+            self.assertEqual(pool.get(stub.url + "/ping.json", {"q": "a"}).json(), {"ok": True})
+            pool.close()
+
+        self.assertEqual(stub.requests[-1], ("/ping.json", {"q": ["a"]}))
+
+    def test_close(self):
+        pool = SessionPool()
+        pool.close()
+        with self.assertRaises(RuntimeError):
+            pool.get("http://127.0.0.1:1/")
+
+
+class TestConnectionLifecycle(TestCase):
+
+    def test_context_manager(self):
+        with Connection(API_KEY="0" * 32) as conn:
+            self.assertFalse(conn.session_pool.closed)
+        self.assertTrue(conn.session_pool.closed)
@@ -0,0 +1,74 @@
+# coding=utf-8
+
+from unittest import TestCase
+
+import numpy as np
+
+from pyccuweather.objects import HourlyForecasts, Temperature, Precipitation, Snow, Wind, Ceiling
+from pyccuweather.units import convert
+from tests.stubserver import load_fixture
+
+__author__ = 'CVoncsefalvay'
+
+
+class TestConvert(TestCase):
+
+    def test_scalar(self):
+        self.assertEqual(convert(100, "C", "F"), 212)
+        self.assertEqual(convert(212, "F", "C"), 100)
+        self.assertEqual(convert(1, "in", "mm"), 25.4)
+        self.assertEqual(convert(9144, "m", "ft"), 30000)
+        self.assertAlmostEqual(convert(100, "km/h", "mi/h"), 62.137, places=3)
+
+    def test_same_unit_unchanged(self):
+        values = [1, 2, 3]
+        self.assertIs(convert(values, "mm", "mm"), values)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            convert(1, "C", "mm")
+        with self.assertRaises(ValueError):
+            convert(1, "furlong", "mm")
+
+    def test_mixed_units(self):
+        res = convert(np.array([1.0, 2.0, 3.0]), np.array(["in", "mm", "cm"]), "mm")
+        np.testing.assert_allclose(res, [25.4, 2.0, 30.0])
+
+    def test_matches_objects(self):
+        values = np.array([-40.0, 0.0, 12.3, 37.5])
+        np.testing.assert_array_equal(convert(values, "C", "F"), [Temperature(v).F for v in values])
+        np.testing.assert_array_equal(convert(values, "mm", "in"), [Precipitation(v).inch for v in values])
+        np.testing.assert_array_equal(convert(values, "cm", "in"), [Snow(v).inch for v in values])
+
+
+class TestValueProperties(TestCase):
+
+    def test_snow(self):
+        self.assertAlmostEqual(Snow(2.54).inch, 1.0)
+        self.assertAlmostEqual(Snow(1, units="in").mm, 25.4)
+
+    def test_wind(self):
+        wind = Wind({"Speed": {"Value": 10.0, "Unit": "mi/h"}, "Direction": {"Degrees": 90}})
+        self.assertEqual(wind.mph, 10.0)
+        self.assertAlmostEqual(wind.kmh, 16.09344)
+        self.assertIn("mph", str(wind))
+
+    def test_ceiling(self):
+        ceiling = Ceiling({"Value": 9144.0, "Unit": "m"})
+        self.assertAlmostEqual(ceiling.km, 9.144)
+        self.assertAlmostEqual(ceiling.ft, 30000.0)
+        self.assertEqual(str(ceiling), "<Ceiling at 9144m (approximately FL 300)>")
+        self.assertAlmostEqual(Ceiling({"Value": 30000.0, "Unit": "ft"}).m, 9144.0)
+
+    def test_columns(self):
+        res = HourlyForecasts(load_fixture("forecast_12h"))
+        cols = res.to_arrays().convert({"temperature": "F", "speed": "mi/h", "ceiling": "ft"})
+        self.assertEqual(cols.units["temperature"], "F")
+        self.assertEqual(cols.units["dewpoint"], "F")
+        self.assertEqual(cols.units["wind_gust_speed"], "mi/h")
+        self.assertEqual(cols.units["ceiling"], "ft")
+        self.assertEqual(cols.units["rain"], "mm")
+        forecasts = list(res.forecasts.values())
+        np.testing.assert_array_equal(cols["temperature"], [f.temperature.F for f in forecasts])
+        np.testing.assert_array_equal(cols["wind_speed"], [f.wind.mph for f in forecasts])
+        np.testing.assert_array_equal(cols["ceiling"], [f.ceiling.ft for f in forecasts])